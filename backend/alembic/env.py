@@ -4,7 +4,17 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from app.database import Base
-from app.models import book, book_list
+from app.models import (  # noqa: F401
+    book,
+    book_isbn,
+    book_list,
+    data_version,
+    enrichment_job,
+    open_library_work,
+    reading_event,
+    reading_stat,
+    related_book,
+)
 
 from logging.config import fileConfig
 
@@ -33,6 +43,14 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Skip the hand-managed full-text search objects (see app.models.book)"""
+    if type_ == "table" and name.startswith("books_fts"):
+        return False
+    return not (type_ == "index" and name == "ix_books_search")
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -55,6 +73,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -77,7 +96,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,69 @@
+"""Add case-folded book title key
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-21 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4c5d6e7f8a9"
+down_revision: Union[str, Sequence[str], None] = "a3b4c5d6e7f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _title_match_key(title: str) -> str:
+    # Copy of app.schemas.book.title_match_key as of this revision
+    return " ".join(title.casefold().split())[:255]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("books", sa.Column("title_key", sa.String(length=255), nullable=True))
+
+    # Backfill by id range; case folding has to happen in Python (SQLite's
+    # lower() only handles ASCII)
+    books = sa.table(
+        "books", sa.column("id"), sa.column("title"), sa.column("title_key")
+    )
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(books.c.id, books.c.title)
+            .where(books.c.id > last_id)
+            .order_by(books.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        connection.execute(
+            books.update()
+            .where(books.c.id == sa.bindparam("book_id"))
+            .values(title_key=sa.bindparam("key")),
+            [
+                {"book_id": book_id, "key": _title_match_key(title)}
+                for book_id, title in rows
+            ],
+        )
+
+    op.create_index(op.f("ix_books_title_key"), "books", ["title_key"], unique=False)
+    # Replaced by title_key
+    op.drop_index("ix_books_title_lower", table_name="books")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_books_title_lower", "books", [sa.text("lower(title)")])
+    op.drop_index(op.f("ix_books_title_key"), table_name="books")
+    op.drop_column("books", "title_key")
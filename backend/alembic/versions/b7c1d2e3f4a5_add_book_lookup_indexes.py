@@ -0,0 +1,33 @@
+"""Add book lookup indexes
+
+Revision ID: b7c1d2e3f4a5
+Revises: 037e1bd86d28
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7c1d2e3f4a5"
+down_revision: Union[str, Sequence[str], None] = "037e1bd86d28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_books_title_lower", "books", [sa.text("lower(title)")])
+    op.create_index(
+        "ix_book_list_items_book_id", "book_list_items", ["book_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_book_list_items_book_id", table_name="book_list_items")
+    op.drop_index("ix_books_title_lower", table_name="books")
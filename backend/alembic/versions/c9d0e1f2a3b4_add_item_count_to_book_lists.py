@@ -0,0 +1,37 @@
+"""Add denormalized item_count to book_lists
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, Sequence[str], None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "book_lists",
+        sa.Column("item_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        "UPDATE book_lists SET item_count = ("
+        "SELECT COUNT(*) FROM book_list_items "
+        "WHERE book_list_items.book_list_id = book_lists.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("book_lists", "item_count")
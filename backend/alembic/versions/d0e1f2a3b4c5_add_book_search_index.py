@@ -0,0 +1,84 @@
+"""Add full-text book search index and list item indexes
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d0e1f2a3b4c5"
+down_revision: Union[str, Sequence[str], None] = "c9d0e1f2a3b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_book_list_items_list_book",
+        "book_list_items",
+        ["book_list_id", "book_id"],
+        unique=False,
+    )
+    # Covers lookups by book_id alone, replacing the single-column index
+    op.create_index(
+        "ix_book_list_items_book_list",
+        "book_list_items",
+        ["book_id", "book_list_id"],
+        unique=False,
+    )
+    op.drop_index("ix_book_list_items_book_id", table_name="book_list_items")
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX ix_books_search ON books USING gin "
+            "(to_tsvector('simple', books.title || ' ' || books.author))"
+        )
+        return
+
+    # SQLite: FTS5 table over books, kept in step by triggers
+    op.execute(
+        "CREATE VIRTUAL TABLE books_fts USING fts5(title, author, content='books', "
+        "content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute(
+        "CREATE TRIGGER books_fts_ai AFTER INSERT ON books BEGIN "
+        "INSERT INTO books_fts(rowid, title, author) "
+        "VALUES (new.id, new.title, new.author); END"
+    )
+    op.execute(
+        "CREATE TRIGGER books_fts_ad AFTER DELETE ON books BEGIN "
+        "INSERT INTO books_fts(books_fts, rowid, title, author) "
+        "VALUES ('delete', old.id, old.title, old.author); END"
+    )
+    op.execute(
+        "CREATE TRIGGER books_fts_au AFTER UPDATE OF title, author ON books BEGIN "
+        "INSERT INTO books_fts(books_fts, rowid, title, author) "
+        "VALUES ('delete', old.id, old.title, old.author); "
+        "INSERT INTO books_fts(rowid, title, author) "
+        "VALUES (new.id, new.title, new.author); END"
+    )
+    # Index the books that already exist
+    op.execute("INSERT INTO books_fts(books_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_books_search")
+    else:
+        for trigger in ("books_fts_ai", "books_fts_ad", "books_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS books_fts")
+
+    op.create_index(
+        "ix_book_list_items_book_id", "book_list_items", ["book_id"], unique=False
+    )
+    op.drop_index("ix_book_list_items_book_list", table_name="book_list_items")
+    op.drop_index("ix_book_list_items_list_book", table_name="book_list_items")
@@ -0,0 +1,82 @@
+"""Make default list names unique
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, Sequence[str], None] = "c3d4e5f6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Oldest default list with the same name as book_lists row "d"
+KEEPER = (
+    "SELECT MIN(k.id) FROM book_lists k WHERE k.is_default = 1 AND k.name = d.name"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Concurrent startups may already have seeded duplicate default lists:
+    # move their items onto the oldest list of each name, then drop them.
+    # A book on several of them keeps only its item on the oldest one
+    op.execute(
+        """
+        DELETE FROM book_list_items
+        WHERE id IN (
+            SELECT i.id FROM book_list_items i
+            JOIN book_lists d ON d.id = i.book_list_id
+            WHERE d.is_default = 1 AND EXISTS (
+                SELECT 1 FROM book_list_items o
+                JOIN book_lists e ON e.id = o.book_list_id
+                WHERE o.book_id = i.book_id
+                AND e.is_default = 1 AND e.name = d.name AND e.id < d.id
+            )
+        )
+        """
+    )
+    op.execute(
+        f"""
+        UPDATE book_list_items
+        SET book_list_id = (
+            SELECT ({KEEPER}) FROM book_lists d
+            WHERE d.id = book_list_items.book_list_id
+        )
+        WHERE book_list_id IN (
+            SELECT d.id FROM book_lists d
+            WHERE d.is_default = 1 AND d.id > ({KEEPER})
+        )
+        """
+    )
+    op.execute(
+        f"""
+        DELETE FROM book_lists
+        WHERE id IN (
+            SELECT d.id FROM book_lists d
+            WHERE d.is_default = 1 AND d.id > ({KEEPER})
+        )
+        """
+    )
+    op.create_index(
+        "uq_book_lists_default_name",
+        "book_lists",
+        ["name"],
+        unique=True,
+        sqlite_where=sa.text("is_default = 1"),
+        postgresql_where=sa.text("is_default = 1"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_book_lists_default_name", table_name="book_lists")
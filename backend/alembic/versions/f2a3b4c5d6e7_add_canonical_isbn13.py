@@ -0,0 +1,109 @@
+"""Add canonical ISBN-13 column and alternate ISBNs
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+
+import re
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a3b4c5d6e7"
+down_revision: Union[str, Sequence[str], None] = "e1f2a3b4c5d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+# Copy of app.schemas.book.isbn13 as of this revision
+def _isbn13_check_digit(body: str) -> str:
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(body))
+    return str(-total % 10)
+
+
+def _isbn13(v: Optional[str]) -> Optional[str]:
+    digits = re.sub(r"[\s-]", "", v or "").upper()
+    if re.fullmatch(r"97[89]\d{10}", digits):
+        return digits if _isbn13_check_digit(digits[:12]) == digits[12] else None
+    if not re.fullmatch(r"\d{9}[\dX]", digits):
+        return None
+    values = [10 if d == "X" else int(d) for d in digits]
+    if sum((10 - i) * value for i, value in enumerate(values)) % 11:
+        return None
+    body = "978" + digits[:9]
+    return body + _isbn13_check_digit(body)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("books", sa.Column("isbn13", sa.String(length=13), nullable=True))
+
+    # Backfill by id range. Where two books are forms of one ISBN (the
+    # duplicates this column exists to stop), the older one gets it; the
+    # other is left NULL for dedupe_books.py to merge
+    books = sa.table(
+        "books", sa.column("id"), sa.column("isbn"), sa.column("isbn13")
+    )
+    connection = op.get_bind()
+    claimed = set()
+    unclaimed = 0
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(books.c.id, books.c.isbn)
+            .where(books.c.id > last_id, books.c.isbn.isnot(None))
+            .order_by(books.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        updates = []
+        for book_id, isbn in rows:
+            canonical = _isbn13(isbn)
+            if canonical is None:
+                continue
+            if canonical in claimed:
+                unclaimed += 1
+                continue
+            claimed.add(canonical)
+            updates.append({"book_id": book_id, "canonical": canonical})
+        if updates:
+            connection.execute(
+                books.update()
+                .where(books.c.id == sa.bindparam("book_id"))
+                .values(isbn13=sa.bindparam("canonical")),
+                updates,
+            )
+    if unclaimed:
+        print(
+            f"{unclaimed} books share an ISBN-13 with an older book; "
+            "run dedupe_books.py to merge them"
+        )
+    op.create_index(op.f("ix_books_isbn13"), "books", ["isbn13"], unique=True)
+
+    op.create_table(
+        "book_isbns",
+        sa.Column("isbn13", sa.String(length=13), nullable=False),
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("isbn13"),
+    )
+    op.create_index(
+        op.f("ix_book_isbns_book_id"), "book_isbns", ["book_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_book_isbns_book_id"), table_name="book_isbns")
+    op.drop_table("book_isbns")
+    op.drop_index(op.f("ix_books_isbn13"), table_name="books")
+    op.drop_column("books", "isbn13")
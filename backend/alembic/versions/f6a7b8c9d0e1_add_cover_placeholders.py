@@ -0,0 +1,38 @@
+"""Add cover placeholder and dominant color to books
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, Sequence[str], None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("books", sa.Column("cover_color", sa.String(length=7), nullable=True))
+    op.add_column(
+        "books", sa.Column("cover_placeholder", sa.String(length=255), nullable=True)
+    )
+    op.add_column(
+        "books",
+        sa.Column("cover_placeholder_source", sa.String(length=500), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("books", "cover_placeholder_source")
+    op.drop_column("books", "cover_placeholder")
+    op.drop_column("books", "cover_color")
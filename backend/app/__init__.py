@@ -0,0 +1,7 @@
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Load .env from the backend directory once, before any module reads its
+# settings (database URLs, API keys)
+load_dotenv(Path(__file__).parent.parent / ".env")
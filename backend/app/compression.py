@@ -0,0 +1,93 @@
+"""
+Negotiated response compression (brotli or gzip) above a size threshold.
+
+Reuses Starlette's GZip responders, which already handle the buffered vs.
+streaming cases, and adds a brotli responder alongside them.
+"""
+
+import os
+
+import brotli
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = 6
+# Quality 4-5 is the usual sweet spot for on-the-fly brotli
+BROTLI_QUALITY = 5
+
+# Already-compressed or streaming-event payloads gain nothing
+EXCLUDED_CONTENT_TYPES = ("text/event-stream", "image/")
+
+
+def _accepted_encodings(header: str) -> set:
+    """Parse Accept-Encoding, dropping anything explicitly refused with q=0"""
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(token)
+    return accepted
+
+
+class _ExcludeContentTypes:
+    """Extend Starlette's content-type exclusion to images"""
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith(EXCLUDED_CONTENT_TYPES):
+                self.content_type_is_excluded = True
+        await super().send_with_compression(message)
+
+
+class _GZipResponder(_ExcludeContentTypes, GZipResponder):
+    pass
+
+
+class _BrotliResponder(_ExcludeContentTypes, IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        compressed = self.compressor.process(body)
+        if more_body:
+            return compressed + self.compressor.flush()
+        return compressed + self.compressor.finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted_encodings(Headers(scope=scope).get("Accept-Encoding", ""))
+        if "br" in accepted:
+            responder = _BrotliResponder(self.app, self.minimum_size, BROTLI_QUALITY)
+        elif "gzip" in accepted:
+            responder = _GZipResponder(
+                self.app, self.minimum_size, compresslevel=GZIP_LEVEL
+            )
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
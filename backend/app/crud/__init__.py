@@ -1,3 +1,3 @@
-from app.crud import book, book_list
+from app.crud import book, book_list, data_version
 
-__all__ = ["book", "book_list"]
+__all__ = ["book", "book_list", "data_version"]
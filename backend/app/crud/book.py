@@ -1,7 +1,20 @@
 from sqlalchemy.orm import Session
 from app.models.book import Book as BookModel
-from app.schemas.book import BookCreate, BookUpdate
-from typing import List, Optional
+from app.models.book_isbn import BookIsbn
+from app.models.book_list import BookList, BookListItem
+from app.schemas.book import (
+    BookCreate,
+    BookUpdate,
+    BookCheckQuery,
+    isbn13,
+    title_match_key,
+)
+from app.crud.data_version import bump_versions
+from app.crud.book_list import get_list_ids_for_book
+from app.crud import related as crud_related
+from app.crud import stats as crud_stats
+from app.crud.item_count import adjust_item_counts, book_item_counts
+from typing import Dict, Iterable, List, Optional
 
 
 def get_book(db: Session, book_id: int) -> Optional[BookModel]:
@@ -14,14 +27,85 @@ def get_books(db: Session, skip: int = 0, limit: int = 100) -> List[BookModel]:
     return db.query(BookModel).offset(skip).limit(limit).all()
 
 
+def get_books_by_isbn(db: Session, isbns: Iterable[str]) -> Dict[str, BookModel]:
+    """
+    Books for a batch of ISBNs, keyed by the ISBN as given. Valid ISBN-10s
+    and ISBN-13s match on the canonical books.isbn13, then on alternate
+    ISBNs; anything else only matches books.isbn exactly.
+    """
+    canonical = {isbn: isbn13(isbn) for isbn in isbns}
+    wanted = set(canonical.values()) - {None}
+    by_canonical: Dict[str, BookModel] = {}
+    if wanted:
+        by_canonical = {
+            book.isbn13: book
+            for book in db.query(BookModel).filter(BookModel.isbn13.in_(wanted))
+        }
+        alternates = wanted - by_canonical.keys()
+        if alternates:
+            by_canonical.update(
+                db.query(BookIsbn.isbn13, BookModel)
+                .join(BookModel, BookModel.id == BookIsbn.book_id)
+                .filter(BookIsbn.isbn13.in_(alternates))
+            )
+    invalid = [isbn for isbn, value in canonical.items() if value is None]
+    by_isbn: Dict[str, BookModel] = {}
+    if invalid:
+        by_isbn = {
+            book.isbn: book
+            for book in db.query(BookModel).filter(BookModel.isbn.in_(invalid))
+        }
+
+    books = {}
+    for isbn, value in canonical.items():
+        book = by_canonical.get(value) if value else by_isbn.get(isbn)
+        if book:
+            books[isbn] = book
+    return books
+
+
 def get_book_by_isbn(db: Session, isbn: str) -> Optional[BookModel]:
-    """Get a book by ISBN"""
-    return db.query(BookModel).filter(BookModel.isbn == isbn).first()
+    """Get a book by ISBN (either form, or one of its alternate ISBNs)"""
+    return get_books_by_isbn(db, [isbn]).get(isbn)
+
+
+def add_alternate_isbns(db: Session, book: BookModel, isbns: Iterable[str]) -> None:
+    """
+    Record other ISBNs that identify a book. Invalid ones, the book's own
+    and ones already recorded (for any book) are skipped. Does not commit.
+    """
+    canonical = {isbn13(isbn) for isbn in isbns} - {None, book.isbn13}
+    if not canonical:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+    db.execute(
+        upsert(BookIsbn)
+        .values([{"isbn13": value, "book_id": book.id} for value in sorted(canonical)])
+        .on_conflict_do_nothing()
+    )
+
+
+def find_book(
+    db: Session,
+    isbn: Optional[str] = None,
+    title: Optional[str] = None,
+    author: Optional[str] = None,
+) -> Optional[BookModel]:
+    """
+    Find a book by ISBN, falling back to a title/author match (the same
+    rules as check_books_in_library, see match_books)
+    """
+    query = BookCheckQuery(isbn=isbn, title=title, author=author)
+    return match_books(db, [query])[0]
 
 
 def create_book(db: Session, book: BookCreate) -> BookModel:
     """Create a new book"""
-    book_data = book.model_dump()
+    book_data = book.model_dump(exclude={"alternate_isbns"})
 
     # Convert genres list to comma-separated string
     if book_data.get("genres"):
@@ -31,6 +115,10 @@ def create_book(db: Session, book: BookCreate) -> BookModel:
 
     db_book = BookModel(**book_data)
     db.add(db_book)
+    if book.alternate_isbns:
+        db.flush()
+        add_alternate_isbns(db, db_book, book.alternate_isbns)
+    bump_versions(db)
     db.commit()
     db.refresh(db_book)
 
@@ -41,7 +129,10 @@ def create_book(db: Session, book: BookCreate) -> BookModel:
 def update_book(
     db: Session, book_id: int, book_update: BookUpdate
 ) -> Optional[BookModel]:
-    """Update an existing book"""
+    """
+    Update an existing book. A new ISBN must not belong to another book
+    (check with get_book_by_isbn first; books.isbn13 is unique).
+    """
     db_book = get_book(db, book_id)
     if not db_book:
         return None
@@ -56,9 +147,23 @@ def update_book(
         else:
             update_data["genres"] = None
 
-    for field, value in update_data.items():
-        setattr(db_book, field, value)
+    previous_isbn = db_book.isbn13
+    with crud_stats.tracking(db, [book_id]):
+        for field, value in update_data.items():
+            setattr(db_book, field, value)
+        if "isbn" in update_data:
+            db_book.isbn13 = isbn13(db_book.isbn)
+    if db_book.isbn13 and db_book.isbn13 != previous_isbn:
+        # Promoted from one of the book's own alternates
+        db.query(BookIsbn).filter(
+            BookIsbn.isbn13 == db_book.isbn13, BookIsbn.book_id == book_id
+        ).delete(synchronize_session=False)
+    if previous_isbn and previous_isbn != db_book.isbn13:
+        # Links and search results carrying the old ISBN still find it
+        db.flush()
+        add_alternate_isbns(db, db_book, [previous_isbn])
 
+    bump_versions(db, get_list_ids_for_book(db, book_id))
     db.commit()
     db.refresh(db_book)
 
@@ -77,11 +182,51 @@ def delete_book(db: Session, book_id: int) -> bool:
     if not db_book:
         return False
 
-    db.delete(db_book)
+    item_counts = book_item_counts(db, book_id)
+    bump_versions(db, item_counts.keys())
+    crud_related.queue_list_books(db, item_counts.keys())
+    with crud_stats.tracking(db, [book_id]):
+        db.delete(db_book)
+    # Its list items go with it (ON DELETE CASCADE)
+    adjust_item_counts(db, {list_id: -count for list_id, count in item_counts.items()})
     db.commit()
     return True
 
 
+def upsert_external_book(db: Session, book: BookCreate) -> BookModel:
+    """
+    Add a book from external search results.
+    If a book with the same ISBN exists (in either form, or as one of its
+    alternate ISBNs), refresh its data instead.
+    """
+    existing = get_book_by_isbn(db, isbn=book.isbn) if book.isbn else None
+    if not existing:
+        return create_book(db, book=book)
+
+    with crud_stats.tracking(db, [existing.id]):
+        # Update existing book with new data
+        existing.title = book.title
+        existing.author = book.author
+        existing.cover_url = book.cover_url
+        existing.description = book.description
+        existing.published_year = book.published_year
+        existing.page_count = book.page_count
+        existing.format = book.format
+        existing.edition = book.edition
+
+        # Handle genres - convert list to comma-separated string
+        if book.genres:
+            existing.genres = ",".join(book.genres)
+        else:
+            existing.genres = None
+
+    add_alternate_isbns(db, existing, [book.isbn] + (book.alternate_isbns or []))
+    bump_versions(db, get_list_ids_for_book(db, existing.id))
+    db.commit()
+    db.refresh(existing)
+    return existing
+
+
 def search_books(
     db: Session, query: str, skip: int = 0, limit: int = 20
 ) -> List[BookModel]:
@@ -97,3 +242,89 @@ def search_books(
         .limit(limit)
         .all()
     )
+
+
+def get_list_memberships(db: Session, book_ids: List[int]) -> Dict[int, List[dict]]:
+    """Get the lists each book is in (with status), keyed by book ID"""
+    memberships: Dict[int, List[dict]] = {}
+    if not book_ids:
+        return memberships
+
+    rows = (
+        db.query(BookListItem, BookList.name)
+        .join(BookList, BookList.id == BookListItem.book_list_id)
+        .filter(BookListItem.book_id.in_(book_ids))
+        .all()
+    )
+    for item, list_name in rows:
+        memberships.setdefault(item.book_id, []).append(
+            {
+                "id": item.book_list_id,
+                "name": list_name,
+                "status": item.status.value,  # to_read, reading, finished
+                "item_id": item.id,  # Need this for updating
+                "rating": item.rating,
+                "is_favorite": item.is_favorite,
+            }
+        )
+    return memberships
+
+
+def match_books(
+    db: Session, queries: List[BookCheckQuery]
+) -> List[Optional[BookModel]]:
+    """
+    The library book for each (isbn, title, author) lookup, or None: by
+    ISBN (see get_books_by_isbn), else by the same title ignoring case (the
+    indexed title_key) with the author containing the given one, both
+    compared through title_match_key. Two queries however many lookups.
+    """
+    isbns = {q.isbn for q in queries if q.isbn}
+    titles = {title_match_key(q.title) for q in queries if q.title and q.author}
+
+    books_by_isbn = get_books_by_isbn(db, isbns)
+
+    books_by_title: Dict[str, List[BookModel]] = {}
+    if titles:
+        candidates = (
+            db.query(BookModel)
+            .filter(BookModel.title_key.in_(titles))
+            .order_by(BookModel.id)
+            .all()
+        )
+        for book in candidates:
+            books_by_title.setdefault(book.title_key, []).append(book)
+
+    # Match each query: ISBN first (most accurate), then title + author
+    matches: List[Optional[BookModel]] = []
+    for q in queries:
+        book = books_by_isbn.get(q.isbn) if q.isbn else None
+        if not book and q.title and q.author:
+            author = title_match_key(q.author)
+            book = next(
+                (
+                    b
+                    for b in books_by_title.get(title_match_key(q.title), [])
+                    if author in title_match_key(b.author)
+                ),
+                None,
+            )
+        matches.append(book)
+    return matches
+
+
+def check_books_in_library(db: Session, queries: List[BookCheckQuery]) -> List[dict]:
+    """
+    Resolve library membership for a batch of (isbn, title, author) lookups
+    (matched as in match_books). Uses a fixed number of queries regardless
+    of batch size: the matches, then list memberships.
+    """
+    matches = match_books(db, queries)
+    memberships = get_list_memberships(db, list({b.id for b in matches if b}))
+
+    return [
+        {"exists": True, "book": book, "lists": memberships.get(book.id, [])}
+        if book
+        else {"exists": False, "book": None, "lists": []}
+        for book in matches
+    ]
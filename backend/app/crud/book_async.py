@@ -0,0 +1,72 @@
+"""
+Async versions of app.crud.book for AsyncSession-based request handlers.
+
+Each function runs the sync implementation on the AsyncSession's own
+Session via run_sync, so query logic and version bumps live in one place
+while the driver I/O (aiosqlite / asyncpg) stays on the event loop.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import book as crud_book
+from app.models.book import Book as BookModel
+from app.schemas.book import BookCreate, BookUpdate, BookCheckQuery
+from typing import Dict, List, Optional
+
+
+async def get_book(db: AsyncSession, book_id: int) -> Optional[BookModel]:
+    return await db.run_sync(crud_book.get_book, book_id)
+
+
+async def get_books(
+    db: AsyncSession, skip: int = 0, limit: int = 100
+) -> List[BookModel]:
+    return await db.run_sync(crud_book.get_books, skip, limit)
+
+
+async def get_book_by_isbn(db: AsyncSession, isbn: str) -> Optional[BookModel]:
+    return await db.run_sync(crud_book.get_book_by_isbn, isbn)
+
+
+async def find_book(
+    db: AsyncSession,
+    isbn: Optional[str] = None,
+    title: Optional[str] = None,
+    author: Optional[str] = None,
+) -> Optional[BookModel]:
+    return await db.run_sync(crud_book.find_book, isbn, title, author)
+
+
+async def create_book(db: AsyncSession, book: BookCreate) -> BookModel:
+    return await db.run_sync(crud_book.create_book, book)
+
+
+async def update_book(
+    db: AsyncSession, book_id: int, book_update: BookUpdate
+) -> Optional[BookModel]:
+    return await db.run_sync(crud_book.update_book, book_id, book_update)
+
+
+async def delete_book(db: AsyncSession, book_id: int) -> bool:
+    return await db.run_sync(crud_book.delete_book, book_id)
+
+
+async def search_books(
+    db: AsyncSession, query: str, skip: int = 0, limit: int = 20
+) -> List[BookModel]:
+    return await db.run_sync(crud_book.search_books, query, skip, limit)
+
+
+async def upsert_external_book(db: AsyncSession, book: BookCreate) -> BookModel:
+    return await db.run_sync(crud_book.upsert_external_book, book)
+
+
+async def get_list_memberships(
+    db: AsyncSession, book_ids: List[int]
+) -> Dict[int, List[dict]]:
+    return await db.run_sync(crud_book.get_list_memberships, book_ids)
+
+
+async def check_books_in_library(
+    db: AsyncSession, queries: List[BookCheckQuery]
+) -> List[dict]:
+    return await db.run_sync(crud_book.check_books_in_library, queries)
@@ -1,18 +1,40 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy import Float, Integer, func, literal_column, select, text
 from app.models.book_list import BookList, BookListItem, ReadingStatus
-from app.models.book import Book as Book
+from app.models.book import BOOK_SEARCH_VECTOR, Book as Book
+from app.models.data_version import DataVersion
+from app.crud.data_version import bump_versions, list_key
+from app.crud.item_count import adjust_item_counts, items_per_list
+from app.crud import progress as crud_progress
+from app.crud import related as crud_related
+from app.crud import stats as crud_stats
 from app.schemas.book_list import (
     BookListCreate,
     BookListUpdate,
     BookListItemCreate,
     BookListItemUpdate,
 )
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import random
+import re
+
+# Best matching books shown per list in public list search
+SEARCH_BOOKS_PER_LIST = 3
 
 
 # BookList operations
+def get_list_version(db: Session, list_id: int) -> Optional[int]:
+    """A list's data version (0 if never bumped), or None if it doesn't exist"""
+    row = (
+        db.query(func.coalesce(DataVersion.version, 0))
+        .select_from(BookList)
+        .outerjoin(DataVersion, DataVersion.key == list_key(list_id))
+        .filter(BookList.id == list_id)
+        .first()
+    )
+    return row[0] if row else None
+
+
 def get_book_list(
     db: Session, list_id: int, sort_order: str = "desc"
 ) -> Optional[BookList]:
@@ -64,9 +86,7 @@ def get_book_list(
 def get_book_lists_summary(db: Session, skip: int = 0, limit: int = 100):
     """Get all lists with item counts (without loading all books)"""
     lists = (
-        db.query(BookList, func.count(BookListItem.id).label("item_count"))
-        .outerjoin(BookListItem)
-        .group_by(BookList.id)
+        db.query(BookList)
         .order_by(BookList.is_default.desc(), BookList.created_at.desc())
         .offset(skip)
         .limit(limit)
@@ -74,7 +94,7 @@ def get_book_lists_summary(db: Session, skip: int = 0, limit: int = 100):
     )
 
     result = []
-    for book_list, item_count in lists:
+    for book_list in lists:
         list_dict = {
             "id": book_list.id,
             "name": book_list.name,
@@ -83,7 +103,7 @@ def get_book_lists_summary(db: Session, skip: int = 0, limit: int = 100):
             "is_public": book_list.is_public,
             "created_at": book_list.created_at,
             "updated_at": book_list.updated_at,
-            "item_count": item_count,
+            "item_count": book_list.item_count,
         }
         result.append(list_dict)
     return result
@@ -95,6 +115,8 @@ def create_book_list(
     """Create a new list"""
     db_list = BookList(**book_list.model_dump(), is_default=is_default)
     db.add(db_list)
+    db.flush()
+    bump_versions(db, [db_list.id])
     db.commit()
     db.refresh(db_list)
     return db_list
@@ -109,9 +131,14 @@ def update_book_list(
         return None
 
     update_data = list_update.model_dump(exclude_unset=True)
+    was_public = db_list.is_public
     for field, value in update_data.items():
         setattr(db_list, field, value)
 
+    if db_list.is_public != was_public:
+        # Its books gain or lose its co-occurrences either way
+        crud_related.queue_list_books(db, [list_id], include_private=True)
+    bump_versions(db, [list_id])
     db.commit()
     db.refresh(db_list)
     return db_list
@@ -127,7 +154,10 @@ def delete_book_list(db: Session, list_id: int) -> bool:
     if db_list.is_default == 1:
         return False
 
-    db.delete(db_list)
+    crud_related.queue_list_books(db, [list_id])
+    with crud_stats.tracking(db, crud_stats.list_book_ids(db, list_id)):
+        db.delete(db_list)
+    bump_versions(db, [list_id])
     db.commit()
     return True
 
@@ -156,7 +186,13 @@ def add_book_to_list(
         return existing
 
     db_item = BookListItem(book_list_id=list_id, **item.model_dump())
-    db.add(db_item)
+    with crud_stats.tracking(db, [item.book_id]):
+        db.add(db_item)
+    if item.current_page:
+        crud_progress.record_progress(db, item.book_id, item.current_page, 0)
+    adjust_item_counts(db, {list_id: 1})
+    crud_related.queue_list_books(db, [list_id])
+    bump_versions(db, [list_id])
     db.commit()
     db.refresh(db_item)
     return db_item
@@ -176,9 +212,14 @@ def update_book_list_item(
         return None
 
     update_data = item_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_item, field, value)
-
+    previous_page = db_item.current_page
+    with crud_stats.tracking(db, [book_id]):
+        for field, value in update_data.items():
+            setattr(db_item, field, value)
+    if "current_page" in update_data and db_item.current_page != previous_page:
+        crud_progress.record_progress(db, book_id, db_item.current_page, previous_page)
+
+    bump_versions(db, [list_id])
     db.commit()
     db.refresh(db_item)
     return db_item
@@ -202,18 +243,36 @@ def create_default_lists(db: Session):
         {"name": "Favorites", "description": "Your favorite books", "is_default": 1},
     ]
 
-    for list_data in default_lists:
-        # Check if list already exists
-        existing = (
-            db.query(BookList)
-            .filter(BookList.name == list_data["name"], BookList.is_default == 1)
-            .first()
+    # One query for all existing defaults instead of one per list
+    existing = {
+        name
+        for (name,) in db.query(BookList.name).filter(
+            BookList.is_default == 1,
+            BookList.name.in_([list_data["name"] for list_data in default_lists]),
         )
+    }
+    missing = [
+        list_data for list_data in default_lists if list_data["name"] not in existing
+    ]
+    if not missing:
+        return
 
-        if not existing:
-            db_list = BookList(**list_data)
-            db.add(db_list)
+    # Another worker may be seeding at the same time: let the unique index on
+    # default list names drop duplicates instead of failing
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
 
+    stmt = (
+        insert(BookList)
+        .values(missing)
+        .on_conflict_do_nothing(
+            index_elements=[BookList.name], index_where=BookList.is_default == 1
+        )
+    )
+    if db.execute(stmt).rowcount:
+        bump_versions(db)
     db.commit()
 
 
@@ -265,63 +324,71 @@ def move_book_to_status_list(
         .all()
     )
 
-    # Remove from all DEFAULT STATUS LISTS (except target)
-    for item in all_items:
-        if (
-            item.book_list.name in default_status_list_names
-            and item.book_list.is_default == 1
-            and item.book_list.name != target_list_name
-        ):
-            db.delete(item)
-
-    # Update status in ALL NON-STATUS LISTS (Favorites, custom lists)
-    for item in all_items:
-        if (
-            item.book_list.name not in default_status_list_names
-            or item.book_list.is_default == 0
-        ):
-            item.status = new_status
-            # Sync rating, notes, and current_page
-            if old_item.rating:
-                item.rating = old_item.rating
-            if old_item.notes and not item.notes:
-                item.notes = old_item.notes
-            item.current_page = old_item.current_page
-
-    # Check if already in target status list
-    existing_in_target = (
-        db.query(BookListItem)
-        .filter(
-            BookListItem.book_list_id == target_list.id, BookListItem.book_id == book_id
+    # Every list touched by this move gets a new version
+    bump_versions(db, [item.book_list_id for item in all_items] + [target_list.id])
+
+    with crud_stats.tracking(db, [book_id]):
+        # Remove from all DEFAULT STATUS LISTS (except target)
+        removed_from = []
+        for item in all_items:
+            if (
+                item.book_list.name in default_status_list_names
+                and item.book_list.is_default == 1
+                and item.book_list.name != target_list_name
+            ):
+                removed_from.append(item.book_list_id)
+                db.delete(item)
+        item_deltas = items_per_list(removed_from, -1)
+
+        # Update status in ALL NON-STATUS LISTS (Favorites, custom lists)
+        for item in all_items:
+            if (
+                item.book_list.name not in default_status_list_names
+                or item.book_list.is_default == 0
+            ):
+                item.status = new_status
+                # Sync rating, notes, and current_page
+                if old_item.rating:
+                    item.rating = old_item.rating
+                if old_item.notes and not item.notes:
+                    item.notes = old_item.notes
+                item.current_page = old_item.current_page
+
+        # Check if already in target status list
+        target_item = (
+            db.query(BookListItem)
+            .filter(
+                BookListItem.book_list_id == target_list.id,
+                BookListItem.book_id == book_id,
+            )
+            .first()
         )
-        .first()
-    )
 
-    if existing_in_target:
-        # Update status
-        existing_in_target.status = new_status
-        existing_in_target.notes = old_item.notes
-        existing_in_target.rating = old_item.rating
-        existing_in_target.is_favorite = old_item.is_favorite
-        existing_in_target.current_page = old_item.current_page
-        db.commit()
-        db.refresh(existing_in_target)
-        return existing_in_target
-    else:
-        # Create new item in target status list
-        new_item = BookListItem(
-            book_list_id=target_list.id,
-            book_id=book_id,
-            status=new_status,
-            notes=old_item.notes,
-            rating=old_item.rating,
-            is_favorite=old_item.is_favorite,
-            current_page=old_item.current_page,
-        )
-        db.add(new_item)
-        db.commit()
-        db.refresh(new_item)
-        return new_item
+        if target_item:
+            # Update status
+            target_item.status = new_status
+            target_item.notes = old_item.notes
+            target_item.rating = old_item.rating
+            target_item.is_favorite = old_item.is_favorite
+            target_item.current_page = old_item.current_page
+        else:
+            # Create new item in target status list
+            target_item = BookListItem(
+                book_list_id=target_list.id,
+                book_id=book_id,
+                status=new_status,
+                notes=old_item.notes,
+                rating=old_item.rating,
+                is_favorite=old_item.is_favorite,
+                current_page=old_item.current_page,
+            )
+            db.add(target_item)
+            item_deltas[target_list.id] = item_deltas.get(target_list.id, 0) + 1
+
+    adjust_item_counts(db, item_deltas)
+    db.commit()
+    db.refresh(target_item)
+    return target_item
 
 
 def get_random_book_from_list(
@@ -364,6 +431,20 @@ def get_random_book_from_list(
     return random.choice(items)
 
 
+def get_currently_reading_items(
+    db: Session, skip: int = 0, limit: int = 100
+) -> List[BookListItem]:
+    """Get all list items currently being read, with their books"""
+    return (
+        db.query(BookListItem)
+        .options(joinedload(BookListItem.book))
+        .filter(BookListItem.status == ReadingStatus.READING)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
 def get_public_lists(db: Session, skip: int = 0, limit: int = 50) -> List[BookList]:
     """Get all public lists with their items and books"""
     return (
@@ -377,52 +458,160 @@ def get_public_lists(db: Session, skip: int = 0, limit: int = 50) -> List[BookLi
     )
 
 
-def search_public_lists_by_book(
-    db: Session, query: str, skip: int = 0, limit: int = 50
-):
-    """Search public lists by book title or author"""
-    search_term = f"%{query}%"
-
-    # Subquery for item counts per list
-    item_count_sq = (
-        db.query(
-            BookListItem.book_list_id,
-            func.count(BookListItem.id).label("item_count"),
+def _book_matches(db: Session, query: str, scored: bool = False):
+    """
+    Subquery of the ids (book_id) of books whose title or author contains
+    every word of the query as a word prefix, plus a relevance `score`
+    (lower is better) when scored. None when the query has no words.
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    if db.get_bind().dialect.name == "postgresql":
+        # Same expression as the ix_books_search GIN index
+        vector = literal_column(BOOK_SEARCH_VECTOR)
+        tsquery = func.to_tsquery(
+            literal_column("'simple'"), " & ".join(f"{term}:*" for term in terms)
         )
-        .group_by(BookListItem.book_list_id)
-        .subquery()
+        columns = [Book.id.label("book_id")]
+        if scored:
+            columns.append((-func.ts_rank(vector, tsquery)).label("score"))
+        return select(*columns).where(vector.op("@@")(tsquery)).subquery("matches")
+
+    columns = {"book_id": Integer}
+    if scored:
+        columns["score"] = Float
+    return (
+        text(
+            "SELECT rowid AS book_id"
+            + (", bm25(books_fts) AS score" if scored else "")
+            + " FROM books_fts WHERE books_fts MATCH :match"
+        )
+        .bindparams(match=" ".join(f'"{term}"*' for term in terms))
+        .columns(**columns)
+        .subquery("matches")
     )
 
-    results = (
-        db.query(BookList, Book, item_count_sq.c.item_count)
-        .join(BookListItem, BookList.id == BookListItem.book_list_id)
-        .join(Book, BookListItem.book_id == Book.id)
-        .outerjoin(item_count_sq, BookList.id == item_count_sq.c.book_list_id)
-        .filter(
-            BookList.is_public == 1,
-            Book.title.ilike(search_term) | Book.author.ilike(search_term),
-        )
+
+def search_public_lists_by_book(
+    db: Session,
+    query: str,
+    skip: int = 0,
+    limit: int = 50,
+    books_per_list: int = SEARCH_BOOKS_PER_LIST,
+) -> Tuple[List[dict], int]:
+    """
+    Search public lists by the titles and authors of their books, using the
+    full-text index. Returns one entry per list (most matching books first,
+    then by list id, so pages are stable) with its best matching books, and
+    the total number of matching lists.
+    """
+    matches = _book_matches(db, query)
+    if matches is None:
+        return [], 0
+
+    match_count = func.count(BookListItem.id)
+    matched_lists = (
+        db.query(BookList)
+        .join(BookListItem, BookListItem.book_list_id == BookList.id)
+        .join(matches, matches.c.book_id == BookListItem.book_id)
+        .filter(BookList.is_public == 1)
+        .group_by(BookList.id)
+    )
+    # count() OVER () counts the groups, so the total comes with the page
+    lists = (
+        matched_lists.add_columns(match_count, func.count().over())
+        .order_by(match_count.desc(), BookList.id)
         .offset(skip)
         .limit(limit)
         .all()
     )
+    if not lists:
+        # Past the last page: count the matching lists on their own
+        return [], matched_lists.count() if skip else 0
+
+    # Best matches per list, ranked here rather than in SQL: probing the
+    # full-text index once per list item is far slower than reading every
+    # match's score once and the page's items by list
+    scored = _book_matches(db, query, scored=True)
+    scores = dict(db.execute(select(scored.c.book_id, scored.c.score)).all())
+    items = db.query(BookListItem.book_list_id, BookListItem.book_id).filter(
+        BookListItem.book_list_id.in_([book_list.id for book_list, _, _ in lists])
+    )
+    candidates: Dict[int, List[Tuple[float, int]]] = {}
+    for list_id, book_id in items:
+        if book_id in scores:
+            candidates.setdefault(list_id, []).append((scores[book_id], book_id))
+    top_ids = {
+        list_id: [book_id for _, book_id in sorted(ranked)[:books_per_list]]
+        for list_id, ranked in candidates.items()
+    }
+    books = {
+        book.id: book
+        for book in db.query(Book).filter(
+            Book.id.in_({book_id for ids in top_ids.values() for book_id in ids})
+        )
+    }
 
     output = []
-    for book_list, book, item_count in results:
+    for book_list, count, _ in lists:
         output.append(
             {
                 "list_id": book_list.id,
                 "list_name": book_list.name,
                 "list_description": book_list.description,
-                "item_count": item_count or 0,
-                "matching_book": book,
+                "item_count": book_list.item_count,
+                "match_count": count,
+                "matching_books": [
+                    books[book_id] for book_id in top_ids.get(book_list.id, [])
+                ],
             }
         )
-    return output
+    return output, lists[0][2]
+
+
+def remove_book_from_list(db: Session, list_id: int, item_id: int) -> bool:
+    """Remove an item from a list"""
+    item = (
+        db.query(BookListItem)
+        .filter(BookListItem.id == item_id, BookListItem.book_list_id == list_id)
+        .first()
+    )
+
+    if not item:
+        return False
+
+    crud_related.queue_list_books(db, [list_id])
+    with crud_stats.tracking(db, [item.book_id]):
+        db.delete(item)
+    adjust_item_counts(db, {list_id: -1})
+    bump_versions(db, [list_id])
+    db.commit()
+    return True
+
+
+def get_list_ids_for_book(db: Session, book_id: int) -> List[int]:
+    """Get the IDs of every list containing a book"""
+    rows = (
+        db.query(BookListItem.book_list_id)
+        .filter(BookListItem.book_id == book_id)
+        .distinct()
+        .all()
+    )
+    return [list_id for (list_id,) in rows]
 
 
 def reset_book_progress(db: Session, book_id: int) -> int:
     """Reset current_page to 0 for all instances of a book across all lists"""
+    bump_versions(db, get_list_ids_for_book(db, book_id))
+    previous_page = (
+        db.query(func.max(BookListItem.current_page))
+        .filter(BookListItem.book_id == book_id)
+        .scalar()
+    )
+    if previous_page:
+        # Keep the history: the log records the reset instead of losing it
+        crud_progress.record_progress(db, book_id, 0, previous_page)
     result = (
         db.query(BookListItem)
         .filter(BookListItem.book_id == book_id)
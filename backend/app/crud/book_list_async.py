@@ -0,0 +1,128 @@
+"""
+Async versions of app.crud.book_list for AsyncSession-based request handlers.
+
+Like app.crud.book_async, these delegate to the sync implementations via
+run_sync. Functions whose results are serialized with their items reload
+the list inside the same run_sync call, since relationships cannot be
+lazy-loaded once control is back on the event loop.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import book_list as crud_list
+from app.crud import data_version as crud_version
+from app.models.book_list import BookList, BookListItem, ReadingStatus
+from app.schemas.book_list import (
+    BookListCreate,
+    BookListUpdate,
+    BookListItemCreate,
+    BookListItemUpdate,
+)
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+async def get_versions(db: AsyncSession, keys: Iterable[str]) -> Dict[str, int]:
+    return await db.run_sync(crud_version.get_versions, list(keys))
+
+
+async def get_list_version(db: AsyncSession, list_id: int) -> Optional[int]:
+    return await db.run_sync(crud_list.get_list_version, list_id)
+
+
+async def get_book_list(
+    db: AsyncSession, list_id: int, sort_order: str = "desc"
+) -> Optional[BookList]:
+    return await db.run_sync(crud_list.get_book_list, list_id, sort_order)
+
+
+async def get_book_lists_summary(db: AsyncSession, skip: int = 0, limit: int = 100):
+    return await db.run_sync(crud_list.get_book_lists_summary, skip, limit)
+
+
+async def create_book_list(db: AsyncSession, book_list: BookListCreate) -> BookList:
+    def _create(session: Session) -> BookList:
+        db_list = crud_list.create_book_list(session, book_list)
+        return crud_list.get_book_list(session, db_list.id)
+
+    return await db.run_sync(_create)
+
+
+async def update_book_list(
+    db: AsyncSession, list_id: int, list_update: BookListUpdate
+) -> Optional[BookList]:
+    def _update(session: Session) -> Optional[BookList]:
+        if not crud_list.update_book_list(session, list_id, list_update):
+            return None
+        return crud_list.get_book_list(session, list_id)
+
+    return await db.run_sync(_update)
+
+
+async def delete_book_list(db: AsyncSession, list_id: int) -> bool:
+    return await db.run_sync(crud_list.delete_book_list, list_id)
+
+
+async def add_book_to_list(
+    db: AsyncSession, list_id: int, item: BookListItemCreate
+) -> Optional[BookListItem]:
+    return await db.run_sync(crud_list.add_book_to_list, list_id, item)
+
+
+async def update_book_list_item(
+    db: AsyncSession, list_id: int, book_id: int, item_update: BookListItemUpdate
+) -> Optional[BookListItem]:
+    return await db.run_sync(
+        crud_list.update_book_list_item, list_id, book_id, item_update
+    )
+
+
+async def remove_book_from_list(db: AsyncSession, list_id: int, item_id: int) -> bool:
+    return await db.run_sync(crud_list.remove_book_from_list, list_id, item_id)
+
+
+async def move_book_to_status_list(
+    db: AsyncSession, book_id: int, old_list_id: int, new_status: ReadingStatus
+) -> Optional[BookListItem]:
+    return await db.run_sync(
+        crud_list.move_book_to_status_list, book_id, old_list_id, new_status
+    )
+
+
+async def get_random_book_from_list(
+    db: AsyncSession,
+    list_id: int,
+    status: Optional[ReadingStatus] = None,
+    max_pages: Optional[int] = None,
+    min_pages: Optional[int] = None,
+    genre: Optional[str] = None,
+) -> Optional[BookListItem]:
+    return await db.run_sync(
+        crud_list.get_random_book_from_list,
+        list_id,
+        status,
+        max_pages,
+        min_pages,
+        genre,
+    )
+
+
+async def get_currently_reading_items(
+    db: AsyncSession, skip: int = 0, limit: int = 100
+) -> List[BookListItem]:
+    return await db.run_sync(crud_list.get_currently_reading_items, skip, limit)
+
+
+async def get_public_lists(
+    db: AsyncSession, skip: int = 0, limit: int = 50
+) -> List[BookList]:
+    return await db.run_sync(crud_list.get_public_lists, skip, limit)
+
+
+async def search_public_lists_by_book(
+    db: AsyncSession, query: str, skip: int = 0, limit: int = 50
+) -> Tuple[List[dict], int]:
+    return await db.run_sync(crud_list.search_public_lists_by_book, query, skip, limit)
+
+
+async def reset_book_progress(db: AsyncSession, book_id: int) -> int:
+    return await db.run_sync(crud_list.reset_book_progress, book_id)
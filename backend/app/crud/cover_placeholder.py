@@ -0,0 +1,45 @@
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from app.models.book import Book
+from app.models.book_list import BookListItem
+from app.crud.data_version import bump_versions
+from typing import List, Tuple
+
+
+def pending_placeholders(db: Session, after_id: int, limit: int) -> List[Tuple[int, str]]:
+    """
+    (id, cover_url) of books whose cover has no placeholder yet or changed
+    since it was computed, in id order after `after_id`
+    """
+    rows = db.execute(
+        select(Book.id, Book.cover_url)
+        .where(
+            Book.id > after_id,
+            Book.cover_url.is_not(None),
+            Book.cover_url != "",
+            or_(
+                Book.cover_placeholder_source.is_(None),
+                Book.cover_placeholder_source != Book.cover_url,
+            ),
+        )
+        .order_by(Book.id)
+        .limit(limit)
+    )
+    return [tuple(row) for row in rows]
+
+
+def save_placeholders(db: Session, rows: List[dict]) -> None:
+    """
+    Bulk-store computed placeholders. Each row has id, cover_color,
+    cover_placeholder and cover_placeholder_source (the cover_url processed;
+    color and placeholder are None when the cover could not be fetched).
+    """
+    if not rows:
+        return
+    db.bulk_update_mappings(Book, rows)
+    # Placeholders are part of list payloads, so their ETags must change
+    list_ids = db.query(BookListItem.book_list_id).filter(
+        BookListItem.book_id.in_([row["id"] for row in rows])
+    )
+    bump_versions(db, {list_id for (list_id,) in list_ids})
+    db.commit()
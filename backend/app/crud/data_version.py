@@ -0,0 +1,42 @@
+from sqlalchemy.orm import Session
+from app.models.data_version import DataVersion
+from typing import Dict, Iterable
+
+GLOBAL_KEY = "global"
+
+
+def list_key(list_id: int) -> str:
+    return f"list:{list_id}"
+
+
+def get_versions(db: Session, keys: Iterable[str]) -> Dict[str, int]:
+    """Get current versions for the given keys (missing keys are version 0)"""
+    keys = list(keys)
+    rows = db.query(DataVersion.key, DataVersion.version).filter(
+        DataVersion.key.in_(keys)
+    )
+    versions = {key: 0 for key in keys}
+    versions.update({key: version for key, version in rows})
+    return versions
+
+
+def bump_versions(db: Session, list_ids: Iterable[int] = ()) -> None:
+    """
+    Increment the global version and each given list's version.
+    Runs inside the caller's transaction, so call it before db.commit().
+    """
+    keys = [GLOBAL_KEY] + [list_key(list_id) for list_id in sorted(set(list_ids))]
+
+    # Dialect modules are imported on first use; loading the PostgreSQL
+    # dialect package is slow and unneeded on SQLite
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(DataVersion).values([{"key": key, "version": 1} for key in keys])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DataVersion.key],
+        set_={"version": DataVersion.version + 1},
+    )
+    db.execute(stmt)
@@ -0,0 +1,388 @@
+"""
+Duplicate book detection and merging.
+
+Duplicates creep in as ISBN-10 vs ISBN-13 forms of one edition, NULL-ISBN
+rows from manual adds, and Google vs Open Library title variations. Books
+are blocked into candidate groups in one pass: same normalized title and
+author (the search merge's `_normalize_title`, with author words in any
+order), or same ISBN once both are in ISBN-13 form. Only pairs inside a
+group are scored, so the job stays near-linear in the size of the table.
+
+Each group keeps one book (canonical ISBN first, then most list items, most
+filled fields, lowest id) and merges in every other member scoring at
+least MERGE_THRESHOLD against it. A merge fills the kept book's empty
+fields, moves list items (folding two items on one list into one),
+reading history and alternate ISBNs across, then deletes the duplicate. Merges commit
+MERGE_BATCH_SIZE groups at a time, keeping the stats, item counts, list
+versions and related-books queue in step like any other write.
+"""
+
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from sqlalchemy import delete, func, literal, select, update
+from sqlalchemy.orm import Session
+from app.crud import related as crud_related
+from app.crud import stats as crud_stats
+from app.crud.data_version import bump_versions
+from app.crud.item_count import adjust_item_counts
+from app.models.book import Book
+from app.models.book_isbn import BookIsbn
+from app.models.book_list import BookListItem, ReadingStatus
+from app.models.reading_event import ReadingDay, ReadingEvent
+from app.schemas.book import isbn13
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MERGE_THRESHOLD = 0.85
+MERGE_BATCH_SIZE = 200
+# Larger groups are generic titles ("Poems", "Untitled" by "Unknown"), not
+# one book entered many times; they are reported but never merged
+MAX_GROUP_SIZE = 20
+LOAD_CHUNK_SIZE = 500
+
+# Book fields a merge copies onto the kept book when it has none
+MERGED_FIELDS = (
+    "cover_url",
+    "description",
+    "published_year",
+    "page_count",
+    "genres",
+    "format",
+    "edition",
+    "ol_work_key",
+)
+STATUS_ORDER = [ReadingStatus.TO_READ, ReadingStatus.READING, ReadingStatus.FINISHED]
+
+
+def _author_key(author: str) -> str:
+    # "Herbert, Frank" and "J.R.R. Tolkien" vs "J. R. R. Tolkien" agree
+    return " ".join(sorted(re.findall(r"[a-z0-9]+", author.lower())))
+
+
+def _title_parts(title: str) -> Tuple[str, str]:
+    """(main title, subtitle) as lowercase words, leading article dropped"""
+    main, _, subtitle = title.lower().partition(":")
+    main = re.sub(r"^\s*(the|a|an)\s+", "", main)
+    return (
+        " ".join(re.findall(r"[a-z0-9]+", main)),
+        " ".join(re.findall(r"[a-z0-9]+", subtitle)),
+    )
+
+
+def _candidate_groups(db: Session) -> List[List[int]]:
+    """Ids of books sharing a title/author key or an ISBN-13, in groups"""
+    from app.services.google_books import _normalize_title
+
+    parent: Dict[int, int] = {}
+
+    def find(book_id: int) -> int:
+        while parent[book_id] != book_id:
+            parent[book_id] = parent[parent[book_id]]
+            book_id = parent[book_id]
+        return book_id
+
+    # First id seen per key; later ids are joined to it (union-find)
+    by_key: Dict[tuple, int] = {}
+    by_isbn: Dict[str, int] = {}
+    rows = db.connection().execute(select(Book.id, Book.title, Book.author, Book.isbn))
+    for book_id, title, author, isbn in rows:
+        keys = []
+        title_key = _normalize_title(title)
+        if title_key:
+            keys.append((by_key, (title_key, _author_key(author))))
+        canonical = isbn13(isbn)
+        if canonical:
+            keys.append((by_isbn, canonical))
+        for seen, key in keys:
+            first = seen.setdefault(key, book_id)
+            if first != book_id:
+                parent.setdefault(first, first)
+                parent.setdefault(book_id, book_id)
+                root, other = find(first), find(book_id)
+                if root != other:
+                    parent[other] = root
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for book_id in parent:
+        groups[find(book_id)].append(book_id)
+    return [sorted(ids) for ids in groups.values() if len(ids) > 1]
+
+
+def similarity(a, b) -> float:
+    """How likely two candidate books are one edition, 0 to 1"""
+    isbn_a, isbn_b = isbn13(a.isbn), isbn13(b.isbn)
+    if isbn_a and isbn_b:
+        # Same ISBN is the same edition; different ISBNs are different ones
+        return 1.0 if isbn_a == isbn_b else 0.0
+    for field in ("format", "edition"):
+        first, second = getattr(a, field), getattr(b, field)
+        if first and second and first.strip().lower() != second.strip().lower():
+            return 0.0
+
+    main_a, subtitle_a = _title_parts(a.title)
+    main_b, subtitle_b = _title_parts(b.title)
+    # "Book 2" is not "Book 3", however alike the rest reads
+    if set(re.findall(r"\d+", a.title)) != set(re.findall(r"\d+", b.title)):
+        return 0.0
+    score = SequenceMatcher(None, main_a, main_b).ratio()
+    if subtitle_a and subtitle_b:
+        score = (score + SequenceMatcher(None, subtitle_a, subtitle_b).ratio()) / 2
+    elif subtitle_a or subtitle_b:
+        # One source often drops the subtitle the other has
+        score *= 0.9
+    if _author_key(a.author) != _author_key(b.author):
+        score *= 0.8
+    if a.published_year and b.published_year:
+        if abs(a.published_year - b.published_year) > 1:
+            score *= 0.8
+    if a.page_count and b.page_count:
+        if abs(a.page_count - b.page_count) > 0.15 * max(a.page_count, b.page_count):
+            score *= 0.8
+    return round(score, 3)
+
+
+def _keep_order(book, items: int):
+    # The holder of the group's canonical ISBN, so that no ISBN needs to move
+    # over: any other ISBN in the group is the same one or a different edition
+    filled = sum(1 for field in MERGED_FIELDS if getattr(book, field))
+    return (book.isbn13 is None, book.isbn is None, -items, -filled, book.id)
+
+
+def _load_books(db: Session, book_ids: List[int]) -> Dict[int, Book]:
+    books = {}
+    for start in range(0, len(book_ids), LOAD_CHUNK_SIZE):
+        chunk = book_ids[start : start + LOAD_CHUNK_SIZE]
+        books.update(
+            (book.id, book) for book in db.query(Book).filter(Book.id.in_(chunk))
+        )
+    return books
+
+
+def _item_counts(db: Session, book_ids: List[int]) -> Dict[int, int]:
+    counts = {}
+    for start in range(0, len(book_ids), LOAD_CHUNK_SIZE):
+        chunk = book_ids[start : start + LOAD_CHUNK_SIZE]
+        counts.update(
+            db.query(BookListItem.book_id, func.count())
+            .filter(BookListItem.book_id.in_(chunk))
+            .group_by(BookListItem.book_id)
+        )
+    return counts
+
+
+def find_duplicates(db: Session) -> dict:
+    """
+    Score the candidate groups. Returns {"groups": [{keep, merge, skipped}],
+    "candidates": books in candidate groups, "oversized": groups too big to
+    merge}, where merge and skipped list {id, title, author, isbn, score}.
+    """
+    candidate_groups = _candidate_groups(db)
+    oversized = [ids for ids in candidate_groups if len(ids) > MAX_GROUP_SIZE]
+    candidate_groups = [ids for ids in candidate_groups if len(ids) <= MAX_GROUP_SIZE]
+    book_ids = [book_id for ids in candidate_groups for book_id in ids]
+    books = _load_books(db, book_ids)
+    items = _item_counts(db, book_ids)
+
+    def describe(book, score: Optional[float] = None) -> dict:
+        entry = {
+            "id": book.id,
+            "title": book.title,
+            "author": book.author,
+            "isbn": book.isbn,
+            "items": items.get(book.id, 0),
+        }
+        if score is not None:
+            entry["score"] = score
+        return entry
+
+    groups = []
+    for ids in candidate_groups:
+        members = sorted(
+            (books[book_id] for book_id in ids),
+            key=lambda book: _keep_order(book, items.get(book.id, 0)),
+        )
+        keep, merge, skipped = members[0], [], []
+        for book in members[1:]:
+            score = similarity(keep, book)
+            target = merge if score >= MERGE_THRESHOLD else skipped
+            target.append(describe(book, score))
+        groups.append({"keep": describe(keep), "merge": merge, "skipped": skipped})
+    return {
+        "groups": groups,
+        "candidates": len(book_ids),
+        "oversized": [{"size": len(ids), "ids": ids[:5]} for ids in oversized],
+    }
+
+
+def _merge_item(keep: BookListItem, other: BookListItem) -> None:
+    """Fold a second item for the same book on one list into the first"""
+    if STATUS_ORDER.index(other.status) > STATUS_ORDER.index(keep.status):
+        keep.status = other.status
+    keep.rating = keep.rating or other.rating
+    keep.notes = keep.notes or other.notes
+    keep.is_favorite = max(keep.is_favorite or 0, other.is_favorite or 0)
+    keep.current_page = max(keep.current_page or 0, other.current_page or 0)
+    keep.award_year = keep.award_year or other.award_year
+    keep.rank = keep.rank or other.rank
+    if other.added_at and (keep.added_at is None or other.added_at < keep.added_at):
+        keep.added_at = other.added_at
+
+
+def _merge_reading_days(db: Session, keep_id: int, duplicate_ids: List[int]) -> None:
+    """Add the duplicates' daily rollups onto the kept book's"""
+    # Most duplicates were never read; skip the upsert for them
+    has_days = (
+        db.query(ReadingDay.book_id)
+        .filter(ReadingDay.book_id.in_(duplicate_ids))
+        .first()
+    )
+    if has_days is None:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+
+        greatest = func.greatest
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+        # SQLite's max() with several arguments is the scalar maximum
+        greatest = func.max
+
+    rows = (
+        select(
+            literal(keep_id),
+            ReadingDay.day,
+            func.sum(ReadingDay.pages_read),
+            func.max(ReadingDay.end_page),
+            func.sum(ReadingDay.updates),
+        )
+        .where(ReadingDay.book_id.in_(duplicate_ids))
+        .group_by(ReadingDay.day)
+    )
+    stmt = upsert(ReadingDay).from_select(
+        ["book_id", "day", "pages_read", "end_page", "updates"], rows
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ReadingDay.book_id, ReadingDay.day],
+            set_={
+                "pages_read": ReadingDay.pages_read + stmt.excluded.pages_read,
+                "updates": ReadingDay.updates + stmt.excluded.updates,
+                "end_page": greatest(ReadingDay.end_page, stmt.excluded.end_page),
+            },
+        )
+    )
+    db.execute(
+        delete(ReadingDay)
+        .where(ReadingDay.book_id.in_(duplicate_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _merge_group(db: Session, keep: Book, duplicates: List[Book]) -> Dict[int, int]:
+    """Merge duplicates into keep. Returns item count deltas per list."""
+    duplicate_ids = [book.id for book in duplicates]
+    for book in duplicates:
+        for field in MERGED_FIELDS:
+            if not getattr(keep, field) and getattr(book, field):
+                setattr(keep, field, getattr(book, field))
+
+    deltas: Dict[int, int] = defaultdict(int)
+    by_list: Dict[int, BookListItem] = {}
+    items = (
+        db.query(BookListItem)
+        .filter(BookListItem.book_id.in_([keep.id] + duplicate_ids))
+        .order_by(BookListItem.book_id != keep.id, BookListItem.id)
+    )
+    for item in items:
+        first = by_list.get(item.book_list_id)
+        if first is None:
+            item.book_id = keep.id
+            by_list[item.book_list_id] = item
+        else:
+            _merge_item(first, item)
+            db.delete(item)
+            deltas[item.book_list_id] -= 1
+
+    db.execute(
+        update(ReadingEvent)
+        .where(ReadingEvent.book_id.in_(duplicate_ids))
+        .values(book_id=keep.id)
+        .execution_options(synchronize_session=False)
+    )
+    _merge_reading_days(db, keep.id, duplicate_ids)
+    db.execute(
+        update(BookIsbn)
+        .where(BookIsbn.book_id.in_(duplicate_ids))
+        .values(book_id=keep.id)
+        .execution_options(synchronize_session=False)
+    )
+    db.flush()
+    # Related rows, refresh queue entries and enrichment jobs cascade. Nothing
+    # in the session is synchronized: events and days are never loaded, and
+    # the deleted books are not touched again (the session's identity map
+    # holds the whole batch, and evaluating against it per group adds up)
+    db.execute(
+        delete(Book)
+        .where(Book.id.in_(duplicate_ids))
+        .execution_options(synchronize_session=False)
+    )
+    return deltas
+
+
+def merge_duplicates(db: Session, groups: Iterable[dict]) -> dict:
+    """Merge the groups find_duplicates proposed, MERGE_BATCH_SIZE per commit"""
+    groups = [group for group in groups if group["merge"]]
+    merged = 0
+    for start in range(0, len(groups), MERGE_BATCH_SIZE):
+        batch = groups[start : start + MERGE_BATCH_SIZE]
+        book_ids = [
+            entry["id"] for group in batch for entry in [group["keep"]] + group["merge"]
+        ]
+        books = _load_books(db, book_ids)
+        # Books deleted since the report was made drop out of their group
+        batch = [
+            (
+                books[group["keep"]["id"]],
+                [
+                    books[entry["id"]]
+                    for entry in group["merge"]
+                    if entry["id"] in books
+                ],
+            )
+            for group in batch
+            if group["keep"]["id"] in books
+        ]
+        list_ids = set()
+        for start_ids in range(0, len(book_ids), LOAD_CHUNK_SIZE):
+            chunk = book_ids[start_ids : start_ids + LOAD_CHUNK_SIZE]
+            list_ids.update(
+                list_id
+                for (list_id,) in db.query(BookListItem.book_list_id)
+                .filter(BookListItem.book_id.in_(chunk))
+                .distinct()
+            )
+
+        bump_versions(db, list_ids)
+        deltas: Dict[int, int] = defaultdict(int)
+        with crud_stats.tracking(db, books.keys()):
+            for keep, duplicates in batch:
+                if not duplicates:
+                    continue
+                for list_id, delta in _merge_group(db, keep, duplicates).items():
+                    deltas[list_id] += delta
+                merged += len(duplicates)
+        adjust_item_counts(db, deltas)
+        # After the merge, so the kept books are queued on their new lists
+        crud_related.queue_list_books(db, list_ids)
+        db.commit()
+    return {"merged": merged}
+
+
+def dedupe(db: Session, dry_run: bool = False) -> dict:
+    """Find duplicates and, unless dry_run, merge them"""
+    report = find_duplicates(db)
+    report["merged"] = 0
+    if not dry_run:
+        report.update(merge_duplicates(db, report["groups"]))
+    return report
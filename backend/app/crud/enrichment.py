@@ -0,0 +1,192 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, literal, or_, select, update
+from sqlalchemy.orm import Session
+from app.models.book import Book
+from app.models.book_list import BookListItem
+from app.models.enrichment_job import EnrichmentJob
+from app.crud.data_version import bump_versions
+from app.crud import stats as crud_stats
+from app.schemas.book import split_genres
+from typing import Dict, List
+
+# Book fields enrichment may fill in (never overwrites a value)
+ENRICHABLE_FIELDS = (
+    "cover_url",
+    "description",
+    "published_year",
+    "page_count",
+    "genres",
+)
+# A book missing any of these is incomplete and gets queued
+INCOMPLETE_FIELDS = ("cover_url", "published_year", "page_count", "genres")
+MAX_ATTEMPTS = 5
+# Retry delay doubles per failed attempt: 1, 2, 4, 8 minutes
+RETRY_BASE_DELAY = timedelta(minutes=1)
+MAX_GENRES = 10
+
+
+def _dialect_insert(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def incomplete_books_filter():
+    return or_(
+        Book.page_count.is_(None),
+        Book.published_year.is_(None),
+        Book.cover_url.is_(None),
+        Book.cover_url == "",
+        Book.genres.is_(None),
+        Book.genres == "",
+    )
+
+
+def enqueue_incomplete(db: Session) -> int:
+    """Queue every incomplete book that has never had a job, in one statement"""
+    insert = _dialect_insert(db)
+    candidates = select(Book.id, literal("pending"), literal(0)).where(
+        incomplete_books_filter(),
+        ~select(EnrichmentJob.book_id)
+        .where(EnrichmentJob.book_id == Book.id)
+        .exists(),
+    )
+    stmt = (
+        insert(EnrichmentJob)
+        .from_select(["book_id", "status", "attempts"], candidates)
+        .on_conflict_do_nothing(index_elements=[EnrichmentJob.book_id])
+    )
+    queued = db.execute(stmt).rowcount
+    db.commit()
+    return max(queued, 0)
+
+
+def release_stale_jobs(db: Session, lock_timeout: timedelta) -> int:
+    """Return jobs left running by a worker that died back to the queue"""
+    result = db.execute(
+        update(EnrichmentJob)
+        .where(
+            EnrichmentJob.status == "running",
+            EnrichmentJob.locked_at < _now() - lock_timeout,
+        )
+        .values(status="pending", locked_at=None)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def claim_jobs(db: Session, limit: int) -> List[dict]:
+    """
+    Atomically mark up to `limit` due jobs as running and return their books.
+    On PostgreSQL, rows another worker is claiming are skipped, not waited on.
+    """
+    due = (
+        select(EnrichmentJob.book_id)
+        .where(
+            EnrichmentJob.status == "pending",
+            EnrichmentJob.next_attempt_at <= func.now(),
+        )
+        .order_by(EnrichmentJob.next_attempt_at, EnrichmentJob.book_id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = db.execute(
+        update(EnrichmentJob)
+        .where(EnrichmentJob.book_id.in_(due.scalar_subquery()))
+        .values(status="running", locked_at=_now())
+        .returning(EnrichmentJob.book_id)
+    ).scalars().all()
+    db.commit()
+    if not claimed:
+        return []
+
+    columns = [Book.id, Book.title, Book.author, Book.isbn] + [
+        getattr(Book, field) for field in ENRICHABLE_FIELDS
+    ]
+    rows = db.execute(select(*columns).where(Book.id.in_(claimed))).mappings()
+    return [dict(row) for row in rows]
+
+
+def _clean_genres(genres) -> str:
+    cleaned = [genre for genre in split_genres(genres) if len(genre) <= 50]
+    return ",".join(cleaned[:MAX_GENRES])
+
+
+def complete_jobs(
+    db: Session, results: Dict[int, dict], errors: Dict[int, str]
+) -> int:
+    """
+    Write lookup results back in bulk and settle the claimed jobs.
+    `results` maps book id -> found metadata (possibly empty); `errors` maps
+    book id -> error for lookups that failed and should be retried.
+    Returns the number of fields filled.
+    """
+    fills = []
+    if results:
+        books = db.query(Book).filter(Book.id.in_(results.keys()))
+        for book in books:
+            found = results[book.id]
+            if found.get("genres"):
+                found = {**found, "genres": _clean_genres(found["genres"])}
+            missing = {
+                field: found[field]
+                for field in ENRICHABLE_FIELDS
+                if found.get(field) and not getattr(book, field)
+            }
+            if missing:
+                fills.append({"id": book.id, **missing})
+
+    if fills:
+        with crud_stats.tracking(db, [fill["id"] for fill in fills]):
+            db.bulk_update_mappings(Book, fills)
+        list_ids = db.query(BookListItem.book_list_id).filter(
+            BookListItem.book_id.in_([fill["id"] for fill in fills])
+        )
+        bump_versions(db, {list_id for (list_id,) in list_ids})
+
+    if results:
+        db.execute(
+            update(EnrichmentJob)
+            .where(EnrichmentJob.book_id.in_(results.keys()))
+            .values(status="done", locked_at=None, last_error=None)
+        )
+
+    if errors:
+        jobs = db.query(EnrichmentJob).filter(EnrichmentJob.book_id.in_(errors.keys()))
+        retries = []
+        for job in jobs:
+            attempts = job.attempts + 1
+            retries.append(
+                {
+                    "book_id": job.book_id,
+                    "attempts": attempts,
+                    "status": "failed" if attempts >= MAX_ATTEMPTS else "pending",
+                    "last_error": errors[job.book_id][:1000],
+                    "next_attempt_at": _now()
+                    + RETRY_BASE_DELAY * 2 ** (attempts - 1),
+                    "locked_at": None,
+                }
+            )
+        db.bulk_update_mappings(EnrichmentJob, retries)
+
+    db.commit()
+    return sum(len(fill) - 1 for fill in fills)
+
+
+def queue_depth(db: Session) -> Dict[str, int]:
+    """Job counts by status"""
+    counts = dict(
+        db.query(EnrichmentJob.status, func.count(EnrichmentJob.book_id)).group_by(
+            EnrichmentJob.status
+        )
+    )
+    return {
+        status: counts.get(status, 0)
+        for status in ("pending", "running", "done", "failed")
+    }
@@ -0,0 +1,80 @@
+"""
+Denormalized book_lists.item_count, kept in step by the write paths.
+
+Anything that adds or removes book_list_items calls `adjust_item_counts`
+in the same transaction, so list summaries and public list search read the
+count straight off the list row instead of aggregating items.
+`repair_item_counts` recounts every list and fixes any that drifted.
+"""
+
+from collections import Counter
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+from app.models.book_list import BookList, BookListItem
+from typing import Dict, Iterable, List
+
+
+def adjust_item_counts(db: Session, deltas: Dict[int, int]) -> None:
+    """
+    Add each delta to its list's item_count. Runs inside the caller's
+    transaction, so call it before db.commit().
+    """
+    params = [
+        {"list_id": list_id, "delta": delta}
+        for list_id, delta in sorted(deltas.items())
+        if delta
+    ]
+    if not params:
+        return
+    table = BookList.__table__
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("list_id"))
+        # Relative update, so concurrent writers can't lose a count; keeping
+        # updated_at as-is stops its onupdate from firing on every add/remove
+        .values(
+            item_count=table.c.item_count + bindparam("delta"),
+            updated_at=table.c.updated_at,
+        ),
+        params,
+    )
+
+
+def items_per_list(list_ids: Iterable[int], sign: int = 1) -> Dict[int, int]:
+    """Deltas for adding (sign=1) or removing (sign=-1) one item per list id"""
+    return {list_id: count * sign for list_id, count in Counter(list_ids).items()}
+
+
+def book_item_counts(db: Session, book_id: int) -> Dict[int, int]:
+    """How many items each list holds for a book"""
+    rows = (
+        db.query(BookListItem.book_list_id, func.count())
+        .filter(BookListItem.book_id == book_id)
+        .group_by(BookListItem.book_list_id)
+    )
+    return dict(rows.all())
+
+
+def repair_item_counts(db: Session, dry_run: bool = False) -> List[dict]:
+    """
+    Recount every list's items and correct stored counts that differ.
+    Returns the lists that had drifted ({list_id, name, stored, actual}).
+    """
+    actual = (
+        select(func.count(BookListItem.id))
+        .where(BookListItem.book_list_id == BookList.id)
+        .scalar_subquery()
+    )
+    drift = [
+        {"list_id": list_id, "name": name, "stored": stored, "actual": counted}
+        for list_id, name, stored, counted in db.query(
+            BookList.id, BookList.name, BookList.item_count, actual
+        ).order_by(BookList.id)
+        if stored != counted
+    ]
+    if not dry_run and drift:
+        adjust_item_counts(
+            db, {entry["list_id"]: entry["actual"] - entry["stored"] for entry in drift}
+        )
+        db.commit()
+    return drift
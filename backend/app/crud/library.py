@@ -0,0 +1,233 @@
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from app.models.book import Book
+from app.models.book_list import BookList, BookListItem, ReadingStatus
+from app.crud.book import get_books_by_isbn
+from app.crud.data_version import bump_versions
+from app.crud.item_count import adjust_item_counts, items_per_list
+from app.crud import stats as crud_stats
+from app.schemas.book import isbn13, title_match_key
+from typing import Dict, List, Optional, Tuple
+
+IMPORT_BATCH_SIZE = 1000
+
+# Default list each status goes to
+STATUS_LISTS = {
+    ReadingStatus.TO_READ: "Want to Read",
+    ReadingStatus.READING: "Currently Reading",
+    ReadingStatus.FINISHED: "Finished",
+}
+
+# Book fields an import may fill in on an existing book (never overwrites)
+FILLABLE_FIELDS = (
+    "cover_url",
+    "description",
+    "published_year",
+    "page_count",
+    "genres",
+    "format",
+)
+
+
+def export_lists_query():
+    return select(BookList.__table__).order_by(BookList.id)
+
+
+def export_books_query():
+    return select(Book.__table__).order_by(Book.id)
+
+
+def export_items_query():
+    return select(BookListItem.__table__).order_by(BookListItem.id)
+
+
+def export_shelves_query():
+    """Books with their list memberships, grouped by book (one row per item)"""
+    return (
+        select(
+            Book.__table__,
+            BookList.name.label("list_name"),
+            BookList.is_default.label("list_is_default"),
+            BookListItem.status,
+            BookListItem.rating,
+            BookListItem.notes,
+            BookListItem.added_at,
+        )
+        .outerjoin(BookListItem, BookListItem.book_id == Book.id)
+        .outerjoin(BookList, BookList.id == BookListItem.book_list_id)
+        .order_by(Book.id, BookListItem.id)
+    )
+
+
+def _book_key(row: dict) -> Tuple[str, str]:
+    return (title_match_key(row["title"]), title_match_key(row["author"]))
+
+
+def _isbn_key(isbn: Optional[str]) -> Optional[str]:
+    # ISBN-10 and ISBN-13 rows for one edition are one new book
+    return isbn13(isbn) or isbn
+
+
+def _resolve_books(
+    db: Session, rows: List[dict]
+) -> Tuple[Dict[int, int], List[dict]]:
+    """
+    Map each row index to a book id, inserting books that don't exist yet.
+    Matches by ISBN (either form), then by case-insensitive title + author.
+    Also returns the updates that fill empty fields on matched books (not
+    yet applied).
+    """
+    isbns = {row["isbn"] for row in rows if row.get("isbn")}
+    titles = {title_match_key(row["title"]) for row in rows}
+
+    by_isbn = get_books_by_isbn(db, isbns)
+    by_title = {}
+    if titles:
+        for book in db.query(Book).filter(Book.title_key.in_(titles)):
+            by_title.setdefault((book.title_key, title_match_key(book.author)), book)
+
+    resolved: Dict[int, int] = {}
+    # Row indexes per new book, and the ISBN and title + author keys that
+    # lead to each one
+    new_books: List[List[int]] = []
+    new_book_of: Dict[object, int] = {}
+    fills = {}
+    for index, row in enumerate(rows):
+        book = by_isbn.get(row.get("isbn")) or by_title.get(_book_key(row))
+        if book is None:
+            # Several rows for the same new book (e.g. one per shelf), with
+            # or without the ISBN: matched as existing books are
+            keys = [key for key in (_isbn_key(row.get("isbn")), _book_key(row)) if key]
+            new = next((new_book_of[key] for key in keys if key in new_book_of), None)
+            if new is None:
+                new = len(new_books)
+                new_books.append([])
+            for key in keys:
+                new_book_of.setdefault(key, new)
+            new_books[new].append(index)
+            continue
+        resolved[index] = book.id
+        missing = {
+            field: row[field]
+            for field in FILLABLE_FIELDS
+            if row.get(field) and not getattr(book, field)
+        }
+        if missing:
+            fills.setdefault(book.id, {}).update(missing)
+
+    if new_books:
+        # isbn13 and title_key are left to their column defaults
+        book_columns = {column.name for column in Book.__table__.columns} - {
+            "id",
+            "isbn13",
+            "title_key",
+        }
+        # Each field from the book's first row that has it
+        values = [
+            {
+                column: next(
+                    (rows[i][column] for i in indexes if rows[i].get(column)), None
+                )
+                for column in book_columns
+            }
+            for indexes in new_books
+        ]
+        # RETURNING order is not guaranteed for batched inserts, so map the
+        # new ids back through the keys the rows were grouped by
+        table = Book.__table__
+        inserted = db.execute(
+            insert(table).returning(
+                table.c.id, table.c.isbn, table.c.title, table.c.author
+            ),
+            values,
+        )
+        for book_id, isbn, title, author in inserted:
+            key = _isbn_key(isbn) or _book_key({"title": title, "author": author})
+            for index in new_books[new_book_of[key]]:
+                resolved[index] = book_id
+
+    return resolved, [{"id": book_id, **values} for book_id, values in fills.items()]
+
+
+def _new_items(
+    db: Session, rows: List[dict], book_ids: Dict[int, int], lists: Dict[str, int]
+) -> List[dict]:
+    """
+    Items putting each imported book on its status list (unless it is already
+    on one) and on Favorites when shelved there.
+    """
+    status_list_ids = [lists[name] for name in STATUS_LISTS.values()]
+    batch_book_ids = set(book_ids.values())
+    existing = set(
+        db.query(BookListItem.book_list_id, BookListItem.book_id).filter(
+            BookListItem.book_id.in_(batch_book_ids),
+            BookListItem.book_list_id.in_(status_list_ids + [lists["Favorites"]]),
+        )
+    )
+    on_status_list = {
+        book_id for list_id, book_id in existing if list_id in status_list_ids
+    }
+
+    new_items = []
+    for index, row in enumerate(rows):
+        book_id = book_ids[index]
+        item = {
+            "book_id": book_id,
+            "status": row["status"],
+            "rating": row.get("rating"),
+            "is_favorite": 1 if row.get("favorite") else 0,
+            "current_page": 0,
+            "notes": row.get("notes"),
+        }
+        if book_id not in on_status_list:
+            on_status_list.add(book_id)
+            status_list = lists[STATUS_LISTS[row["status"]]]
+            new_items.append({**item, "book_list_id": status_list})
+        if row.get("favorite") and (lists["Favorites"], book_id) not in existing:
+            existing.add((lists["Favorites"], book_id))
+            new_items.append({**item, "book_list_id": lists["Favorites"]})
+    return new_items
+
+
+def import_books(db: Session, rows: List[dict]) -> dict:
+    """
+    Bulk-import parsed rows (see app.library_io.parse_goodreads_csv) in
+    batches: books are matched or inserted, then added to the default list
+    for their status. Each batch commits on its own.
+    """
+    lists = {
+        name: list_id
+        for list_id, name in db.query(BookList.id, BookList.name).filter(
+            BookList.is_default == 1
+        )
+    }
+    required = list(STATUS_LISTS.values()) + ["Favorites"]
+    missing = [name for name in required if name not in lists]
+    if missing:
+        raise ValueError(f"Default lists missing: {', '.join(missing)}")
+
+    books_before = db.query(func.count(Book.id)).scalar()
+    items_added = 0
+    for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[start : start + IMPORT_BATCH_SIZE]
+        book_ids, fills = _resolve_books(db, batch)
+        new_items = _new_items(db, batch, book_ids, lists)
+        # Only books gaining an item or a filled field change the stats
+        changed = {fill["id"] for fill in fills}
+        changed.update(item["book_id"] for item in new_items)
+        with crud_stats.tracking(db, changed):
+            if fills:
+                db.bulk_update_mappings(Book, fills)
+            if new_items:
+                db.execute(insert(BookListItem.__table__), new_items)
+        items_added += len(new_items)
+        list_ids = [item["book_list_id"] for item in new_items]
+        adjust_item_counts(db, items_per_list(list_ids))
+        bump_versions(db, list_ids)
+        db.commit()
+
+    return {
+        "rows": len(rows),
+        "books_created": db.query(func.count(Book.id)).scalar() - books_before,
+        "items_added": items_added,
+    }
@@ -0,0 +1,74 @@
+"""
+Persisted Open Library work keys.
+
+Listing a book's editions needs its Open Library work key, which takes a
+search (or an ISBN lookup) to find. Once resolved the key is kept on the
+book rows it belongs to and in a title/author lookup table, so later loads
+go straight to the work's editions.json, even after the editions cache
+expires or the server restarts.
+"""
+
+from datetime import datetime, timezone
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from app.crud.book import get_books_by_isbn
+from app.models.book import Book
+from app.models.open_library_work import OpenLibraryWork
+from app.schemas.book import title_match_key
+from typing import Optional, Tuple
+
+
+def _key(title: str, author: str) -> Tuple[str, str]:
+    return (" ".join(title.lower().split()), " ".join(author.lower().split()))
+
+
+def get_work_key(
+    db: Session, title: str, author: str, isbn: Optional[str] = None
+) -> Optional[str]:
+    """The stored work key: the book with this ISBN's, else the title/author's"""
+    if isbn:
+        book = get_books_by_isbn(db, [isbn]).get(isbn)
+        if book and book.ol_work_key:
+            return book.ol_work_key
+    work = db.get(OpenLibraryWork, _key(title, author))
+    return work.work_key if work else None
+
+
+def save_work_key(
+    db: Session, title: str, author: str, work_key: str, isbn: Optional[str] = None
+) -> None:
+    """
+    Remember a resolved work key for the title/author and set it on the
+    matching books: the one with this ISBN, and same-titled books by the
+    same author that have none yet (an ISBN-resolved key is the better one)
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+    title_key, author_key = _key(title, author)
+    stmt = upsert(OpenLibraryWork).values(
+        title=title_key, author=author_key, work_key=work_key
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[OpenLibraryWork.title, OpenLibraryWork.author],
+            set_={"work_key": work_key, "resolved_at": datetime.now(timezone.utc)},
+        )
+    )
+
+    book = get_books_by_isbn(db, [isbn]).get(isbn) if isbn else None
+    if book:
+        book.ol_work_key = work_key
+    db.execute(
+        update(Book)
+        .where(
+            Book.title_key == title_match_key(title),
+            func.lower(Book.author) == author_key,
+            Book.ol_work_key.is_(None),
+        )
+        .values(ol_work_key=work_key)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
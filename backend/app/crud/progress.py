@@ -0,0 +1,234 @@
+"""
+Reading progress history for pace, ETA and pages-read charts.
+
+Every current_page change appends a ReadingEvent (one INSERT in the write's
+transaction, nothing read back). `rollup` compacts the events of finished
+(UTC) days into one ReadingDay row per book and day, then deletes them, so
+the log stays a few days long however many years of history there are.
+Queries read the rollups plus whatever events are not compacted yet.
+"""
+
+import math
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import Date, and_, cast, func, insert, select, text, true
+from sqlalchemy.orm import Session
+from app.models.book import Book
+from app.models.book_list import BookListItem
+from app.models.reading_event import ReadingDay, ReadingEvent
+from typing import Dict, List, Optional, Tuple
+
+ROLLUP_BATCH_SIZE = 50000
+# Pace is pages per calendar day over this many days, today included
+PACE_WINDOW_DAYS = 14
+# Chart range when the client doesn't pass one
+DEFAULT_RANGE_DAYS = 90
+# Arbitrary application-wide key for pg_try_advisory_xact_lock
+ROLLUP_LOCK_KEY = 7_214_003_118
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def default_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    """Fill in a missing chart range: the DEFAULT_RANGE_DAYS ending today"""
+    end = end or _utc_today()
+    return start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1), end
+
+
+def _event_day(db: Session):
+    """SQL expression for the (UTC) day an event was recorded on"""
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(ReadingEvent.created_at, Date)
+    return func.date(ReadingEvent.created_at, type_=Date)
+
+
+def record_progress(
+    db: Session, book_id: int, page: int, previous_page: Optional[int]
+) -> None:
+    """Append a progress event. Runs in the caller's transaction."""
+    db.execute(
+        insert(ReadingEvent.__table__),
+        {
+            "book_id": book_id,
+            "page": page,
+            "pages_read": max(page - (previous_page or 0), 0),
+        },
+    )
+
+
+def rollup(db: Session, today: date = None) -> int:
+    """
+    Compact events from days before `today` into reading_days, committing
+    every ROLLUP_BATCH_SIZE events. Returns how many events were compacted.
+
+    Two workers must not fold the same events: under READ COMMITTED both
+    could aggregate a batch before either deletes it. On PostgreSQL each
+    batch runs under a transaction-scoped advisory lock, and a worker that
+    can't take it stops (another one is compacting); SQLite already lets
+    only one writer commit a batch and fails the others.
+    """
+    day = _event_day(db)
+    closed = day < (today or _utc_today())
+    low, high = db.query(func.min(ReadingEvent.id), func.max(ReadingEvent.id)).filter(
+        closed
+    ).one()
+    if low is None:
+        return 0
+
+    postgresql = db.get_bind().dialect.name == "postgresql"
+    if postgresql:
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+    compacted = 0
+    for start in range(low, high + 1, ROLLUP_BATCH_SIZE):
+        if postgresql and not db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": ROLLUP_LOCK_KEY},
+        ).scalar():
+            db.rollback()
+            break
+        # Id ranges rather than OFFSET keep each batch a primary key range
+        # scan; ids grow with time, so the highest id is the day's last page
+        batch = and_(
+            closed,
+            ReadingEvent.id >= start,
+            ReadingEvent.id < start + ROLLUP_BATCH_SIZE,
+        )
+        grouped = (
+            select(
+                ReadingEvent.book_id,
+                day.label("day"),
+                func.sum(ReadingEvent.pages_read).label("pages_read"),
+                func.count().label("updates"),
+                func.max(ReadingEvent.id).label("last_id"),
+            )
+            .where(batch)
+            .group_by(ReadingEvent.book_id, day)
+            .subquery()
+        )
+        last = ReadingEvent.__table__.alias("last")
+        rows = (
+            select(
+                grouped.c.book_id,
+                grouped.c.day,
+                grouped.c.pages_read,
+                last.c.page,
+                grouped.c.updates,
+            )
+            .join(last, last.c.id == grouped.c.last_id)
+            # SQLite needs a WHERE before ON CONFLICT in INSERT ... SELECT
+            .where(true())
+        )
+        stmt = upsert(ReadingDay).from_select(
+            ["book_id", "day", "pages_read", "end_page", "updates"], rows
+        )
+        # A batch boundary can split a day: add to what an earlier batch wrote
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ReadingDay.book_id, ReadingDay.day],
+                set_={
+                    "pages_read": ReadingDay.pages_read + stmt.excluded.pages_read,
+                    "updates": ReadingDay.updates + stmt.excluded.updates,
+                    "end_page": stmt.excluded.end_page,
+                },
+            )
+        )
+        result = db.execute(ReadingEvent.__table__.delete().where(batch))
+        compacted += result.rowcount
+        db.commit()
+    return compacted
+
+
+def _pace(db: Session, book_id: int, today: date) -> float:
+    since = today - timedelta(days=PACE_WINDOW_DAYS - 1)
+    day = _event_day(db)
+    rolled = db.query(func.coalesce(func.sum(ReadingDay.pages_read), 0)).filter(
+        ReadingDay.book_id == book_id, ReadingDay.day >= since
+    )
+    raw = db.query(func.coalesce(func.sum(ReadingEvent.pages_read), 0)).filter(
+        ReadingEvent.book_id == book_id, day >= since
+    )
+    return (rolled.scalar() + raw.scalar()) / PACE_WINDOW_DAYS
+
+
+def get_book_progress(
+    db: Session, book_id: int, start: date, end: date, today: date = None
+) -> Optional[dict]:
+    """
+    Daily pages read between start and end (inclusive) for one book, plus
+    its current page, recent pace and estimated days to finish
+    """
+    today = today or _utc_today()
+    book = db.query(Book.id, Book.page_count).filter(Book.id == book_id).first()
+    if not book:
+        return None
+
+    days: Dict[date, dict] = {}
+    for row in db.query(
+        ReadingDay.day, ReadingDay.pages_read, ReadingDay.end_page, ReadingDay.updates
+    ).filter(ReadingDay.book_id == book_id, ReadingDay.day.between(start, end)):
+        days[row.day] = dict(row._mapping)
+    day = _event_day(db)
+    events = (
+        db.query(day, ReadingEvent.page, ReadingEvent.pages_read)
+        .filter(ReadingEvent.book_id == book_id, day.between(start, end))
+        .order_by(ReadingEvent.id)
+    )
+    for event_day, page, pages_read in events:
+        entry = days.setdefault(
+            event_day,
+            {"day": event_day, "pages_read": 0, "end_page": page, "updates": 0},
+        )
+        entry["pages_read"] += pages_read
+        entry["end_page"] = page
+        entry["updates"] += 1
+
+    current_page = (
+        db.query(func.max(BookListItem.current_page))
+        .filter(BookListItem.book_id == book_id)
+        .scalar()
+        or 0
+    )
+    pace = _pace(db, book_id, today)
+    remaining = max((book.page_count or 0) - current_page, 0)
+    return {
+        "book_id": book_id,
+        "current_page": current_page,
+        "page_count": book.page_count,
+        "pages_per_day": round(pace, 1),
+        "eta_days": (
+            math.ceil(remaining / pace) if book.page_count and pace > 0 else None
+        ),
+        "days": [days[key] for key in sorted(days)],
+    }
+
+
+def get_daily_pages(db: Session, start: date, end: date) -> List[dict]:
+    """Pages read and books read per day across the library, start..end"""
+    days: Dict[date, dict] = {}
+    rolled = (
+        db.query(ReadingDay.day, func.sum(ReadingDay.pages_read), func.count())
+        .filter(ReadingDay.day.between(start, end))
+        .group_by(ReadingDay.day)
+    )
+    day = _event_day(db)
+    raw = (
+        db.query(
+            day,
+            func.sum(ReadingEvent.pages_read),
+            func.count(ReadingEvent.book_id.distinct()),
+        )
+        .filter(day.between(start, end))
+        .group_by(day)
+    )
+    for rows in (rolled, raw):
+        for row_day, pages_read, books in rows:
+            entry = days.setdefault(
+                row_day, {"day": row_day, "pages_read": 0, "books": 0}
+            )
+            entry["pages_read"] += pages_read or 0
+            entry["books"] += books
+    return [days[key] for key in sorted(days)]
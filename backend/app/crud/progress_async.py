@@ -0,0 +1,23 @@
+"""
+Async versions of app.crud.progress for AsyncSession-based request handlers
+(run_sync delegation, as in app.crud.book_async).
+"""
+
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import progress as crud_progress
+from typing import List, Optional
+
+
+async def get_book_progress(
+    db: AsyncSession, book_id: int, start: date, end: date
+) -> Optional[dict]:
+    return await db.run_sync(crud_progress.get_book_progress, book_id, start, end)
+
+
+async def get_daily_pages(db: AsyncSession, start: date, end: date) -> List[dict]:
+    return await db.run_sync(crud_progress.get_daily_pages, start, end)
+
+
+async def rollup(db: AsyncSession) -> int:
+    return await db.run_sync(crud_progress.rollup)
@@ -0,0 +1,255 @@
+"""
+"Readers also listed" recommendations from public list co-occurrence.
+
+Two books co-occur once per public list holding both. A book's related
+books are the RELATED_TOP_K with the highest co-occurrence count divided
+by the geometric mean of both books' popularity (public lists holding
+each), so a book on every list doesn't top every recommendation. Lists
+longer than MAX_LIST_SIZE are skipped: they cost quadratically and say
+little about any one pair.
+
+The top-K rows live in related_books, so serving is one indexed read.
+`rebuild` recomputes every book from the public list items held in memory.
+Writes to public lists queue the affected books in related_refresh, and
+`refresh` recomputes just those books, reading only their lists, those
+lists' members and the members' popularity through the item indexes. A
+change also shifts the popularity term in other books' scores slightly;
+that is picked up by the next rebuild.
+"""
+
+import math
+from collections import Counter, defaultdict
+from itertools import chain, compress
+from operator import mul
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from app.models.book import Book
+from app.models.book_list import BookList, BookListItem
+from app.models.related_book import RelatedBook, RelatedRefresh
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+RELATED_TOP_K = 10
+MAX_LIST_SIZE = 500
+# Queued books recomputed per refresh transaction
+REFRESH_BATCH_SIZE = 500
+# Books replaced per rebuild transaction (about ten rows each)
+REBUILD_BATCH_SIZE = 5000
+
+
+def _public_items(db: Session):
+    """(list_id, book_id) rows of the public lists that count"""
+    return (
+        select(BookListItem.book_list_id, BookListItem.book_id)
+        .join(BookList, BookList.id == BookListItem.book_list_id)
+        .where(BookList.is_public == 1, BookList.item_count <= MAX_LIST_SIZE)
+    )
+
+
+def _top_related(
+    book_ids: Iterable[int],
+    lists_of: Dict[int, List[int]],
+    members: Dict[int, List[int]],
+    popularity: Dict[int, int],
+) -> Iterator[dict]:
+    """Score each book's co-occurring books; yield rows for the best RELATED_TOP_K"""
+    # Indexed by book id: a list lookup is cheaper than hashing into a dict
+    inverse_root = [0.0] * (max(popularity, default=0) + 1)
+    for book_id, count in popularity.items():
+        inverse_root[book_id] = 1 / math.sqrt(count)
+    for book_id in book_ids:
+        counts = Counter(
+            chain.from_iterable(map(members.__getitem__, lists_of.get(book_id, ())))
+        )
+        counts.pop(book_id, None)
+        if not counts:
+            continue
+        # map/zip/sorted keep the per-candidate work in C; a Python-level
+        # loop or heap over every candidate pair costs several times more
+        others = list(counts)
+        shared = list(counts.values())
+        scores = list(map(mul, shared, map(inverse_root.__getitem__, others)))
+        candidates = zip(scores, shared, others)
+        if len(scores) > RELATED_TOP_K:
+            # Sorting bare floats is far cheaper than sorting tuples: find
+            # the K-th best score, then sort only what reaches it
+            cutoff = sorted(scores)[-RELATED_TOP_K]
+            candidates = compress(candidates, map(cutoff.__le__, scores))
+        own = inverse_root[book_id]
+        for score, lists, other in sorted(candidates, reverse=True)[:RELATED_TOP_K]:
+            yield {
+                "book_id": book_id,
+                "related_id": other,
+                "score": round(score * own, 6),
+                "lists": lists,
+            }
+
+
+def _load(db: Session) -> Tuple[Dict[int, List[int]], Dict[int, List[int]]]:
+    """Every counted list item as (book -> its lists, list -> its books)"""
+    lists_of: Dict[int, List[int]] = defaultdict(list)
+    members: Dict[int, List[int]] = defaultdict(list)
+    # Through the Core connection: plain tuples, none of the Session's
+    # per-row result processing (a third of the time at 1M items)
+    for list_id, book_id in db.connection().execute(_public_items(db)):
+        lists_of[book_id].append(list_id)
+        members[list_id].append(book_id)
+    return lists_of, members
+
+
+def _load_books(
+    db: Session, book_ids: List[int]
+) -> Tuple[Dict[int, List[int]], Dict[int, List[int]], Dict[int, int]]:
+    """
+    What scoring `book_ids` needs, and no more: their lists, those lists'
+    members, and how many counted lists each of those members is on
+    """
+    wanted = set(book_ids)
+    public = _public_items(db).subquery()
+    lists = select(public.c.book_list_id).where(public.c.book_id.in_(book_ids))
+    lists_of: Dict[int, List[int]] = defaultdict(list)
+    members: Dict[int, List[int]] = defaultdict(list)
+    connection = db.connection()
+    for list_id, book_id in connection.execute(
+        select(public.c.book_list_id, public.c.book_id).where(
+            public.c.book_list_id.in_(lists)
+        )
+    ):
+        members[list_id].append(book_id)
+        if book_id in wanted:
+            lists_of[book_id].append(list_id)
+    candidates = select(public.c.book_id).where(public.c.book_list_id.in_(lists))
+    popularity = dict(
+        connection.execute(
+            select(public.c.book_id, func.count())
+            .where(public.c.book_id.in_(candidates))
+            .group_by(public.c.book_id)
+        ).all()
+    )
+    return lists_of, members, popularity
+
+
+def rebuild(db: Session) -> dict:
+    """
+    Recompute every book's recommendations, replacing them REBUILD_BATCH_SIZE
+    books at a time: scoring runs outside any write transaction and each
+    batch commits on its own, so writers never wait on the whole build
+    (readers see each book's old or new rows, never a mix)
+    """
+    # Clear the queue first: books queued while this runs are refreshed later
+    db.execute(delete(RelatedRefresh))
+    db.commit()
+    lists_of, members = _load(db)
+    db.commit()
+    popularity = {book_id: len(lists) for book_id, lists in lists_of.items()}
+
+    book_ids = sorted(lists_of)
+    rows = 0
+    low = None
+    for start in range(0, len(book_ids), REBUILD_BATCH_SIZE):
+        batch = book_ids[start : start + REBUILD_BATCH_SIZE]
+        related = list(_top_related(batch, lists_of, members, popularity))
+        # Books between batches (no public lists now) lose their rows too
+        replaced = RelatedBook.book_id <= batch[-1]
+        if low is not None:
+            replaced &= RelatedBook.book_id > low
+        db.execute(delete(RelatedBook).where(replaced))
+        if related:
+            db.execute(insert(RelatedBook.__table__), related)
+        db.commit()
+        rows += len(related)
+        low = batch[-1]
+    stale = delete(RelatedBook)
+    if low is not None:
+        stale = stale.where(RelatedBook.book_id > low)
+    db.execute(stale)
+    db.commit()
+    return {
+        "lists": len(members),
+        "items": sum(popularity.values()),
+        "books": len(book_ids),
+        "rows": rows,
+    }
+
+
+def refresh(db: Session, limit: int = REFRESH_BATCH_SIZE) -> int:
+    """
+    Recompute recommendations for up to `limit` queued books. Returns how
+    many books were refreshed.
+    """
+    book_ids = sorted(
+        book_id
+        for (book_id,) in db.query(RelatedRefresh.book_id)
+        .order_by(RelatedRefresh.queued_at, RelatedRefresh.book_id)
+        .limit(limit)
+    )
+    if not book_ids:
+        return 0
+
+    lists_of, members, popularity = _load_books(db, book_ids)
+    related = list(_top_related(book_ids, lists_of, members, popularity))
+    db.execute(delete(RelatedBook).where(RelatedBook.book_id.in_(book_ids)))
+    db.execute(delete(RelatedRefresh).where(RelatedRefresh.book_id.in_(book_ids)))
+    if related:
+        db.execute(insert(RelatedBook.__table__), related)
+    db.commit()
+    return len(book_ids)
+
+
+def queue_list_books(
+    db: Session, list_ids: Iterable[int], include_private: bool = False
+) -> None:
+    """
+    Queue the books on these lists for a refresh. Only lists that count
+    (public, at most MAX_LIST_SIZE items) are queued, unless include_private,
+    for a list that was just made private. Runs in the caller's transaction:
+    call it before db.commit(), and before removing items so their books are
+    queued too.
+    """
+    list_ids = sorted(set(list_ids))
+    if not list_ids:
+        return
+    books = (
+        select(BookListItem.book_id)
+        .join(BookList, BookList.id == BookListItem.book_list_id)
+        .where(BookList.id.in_(list_ids), BookList.item_count <= MAX_LIST_SIZE)
+        .distinct()
+    )
+    if not include_private:
+        books = books.where(BookList.is_public == 1)
+
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+
+    db.execute(
+        upsert(RelatedRefresh)
+        .from_select(["book_id"], books)
+        .on_conflict_do_nothing(index_elements=[RelatedRefresh.book_id])
+    )
+
+
+def needs_rebuild(db: Session) -> bool:
+    """Public list items exist but no recommendations do (e.g. a new table)"""
+    if db.query(select(RelatedBook.book_id).exists()).scalar():
+        return False
+    return db.query(_public_items(db).exists()).scalar()
+
+
+def get_related(
+    db: Session, book_id: int, limit: int = RELATED_TOP_K
+) -> Optional[List[dict]]:
+    """A book's precomputed related books, best first (None if no such book)"""
+    rows = (
+        db.query(Book, RelatedBook.score, RelatedBook.lists)
+        .join(RelatedBook, RelatedBook.related_id == Book.id)
+        .filter(RelatedBook.book_id == book_id)
+        .order_by(RelatedBook.score.desc(), RelatedBook.related_id)
+        .limit(limit)
+        .all()
+    )
+    if not rows and db.get(Book, book_id) is None:
+        return None
+    return [
+        {"book": book, "score": score, "lists": lists} for book, score, lists in rows
+    ]
@@ -0,0 +1,14 @@
+"""
+Async versions of app.crud.related for AsyncSession-based request handlers
+(run_sync delegation, as in app.crud.book_async).
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import related as crud_related
+from typing import List, Optional
+
+
+async def get_related(
+    db: AsyncSession, book_id: int, limit: int
+) -> Optional[List[dict]]:
+    return await db.run_sync(crud_related.get_related, book_id, limit)
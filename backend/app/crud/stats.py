@@ -0,0 +1,284 @@
+"""
+Reading statistics kept in the reading_stats summary table.
+
+Every book in the library contributes a few counter rows: one to the
+library total and, once finished, to its year, month, genres and author,
+plus one to the rating histogram if rated. Write paths wrap their changes
+in `tracking(db, book_ids)`, which computes the touched books'
+contributions before and after and applies only the difference, so
+reading the stats never scans book_list_items. `rebuild` recomputes
+everything from scratch and reports any counter that had drifted.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date
+from sqlalchemy import bindparam, delete, select
+from sqlalchemy.orm import Session
+from app.models.book import Book
+from app.models.book_list import BookListItem, ReadingStatus
+from app.models.reading_stat import ReadingStat
+from app.schemas.book import split_genres
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# (kind, key) -> [books, pages]
+Counters = Dict[Tuple[str, str], List[int]]
+
+TOP_LIMIT = 10
+CONTRIBUTION_BATCH_SIZE = 500
+
+
+def _contribute(counters: Counters, book, items) -> None:
+    """Add one book's counter rows, given its list items"""
+
+    def add(kind: str, key: str, pages: int = 0) -> None:
+        counter = counters.setdefault((kind, key), [0, 0])
+        counter[0] += 1
+        counter[1] += pages
+
+    add("total", "books")
+    ratings = [item.rating for item in items if item.rating]
+    if ratings:
+        add("rating", str(max(ratings)))
+
+    finished = [
+        item.added_at for item in items if item.status == ReadingStatus.FINISHED
+    ]
+    if not finished:
+        return
+    # When the book reached a Finished list (moves create a new item)
+    finished_at = min((at for at in finished if at), default=None)
+    pages = book.page_count or 0
+    add("total", "finished", pages)
+    if finished_at:
+        add("year", f"{finished_at.year:04d}", pages)
+        add("month", f"{finished_at.year:04d}-{finished_at.month:02d}", pages)
+    for genre in dict.fromkeys(split_genres(book.genres)):
+        add("genre", genre[:255])
+    add("author", book.author[:255])
+
+
+def _contributions(db: Session, book_ids: Iterable[int]) -> Counters:
+    counters: Counters = {}
+    book_ids = sorted(set(book_ids))
+    for start in range(0, len(book_ids), CONTRIBUTION_BATCH_SIZE):
+        batch = book_ids[start : start + CONTRIBUTION_BATCH_SIZE]
+        items = defaultdict(list)
+        for item in db.execute(
+            select(
+                BookListItem.book_id,
+                BookListItem.status,
+                BookListItem.rating,
+                BookListItem.added_at,
+            ).where(BookListItem.book_id.in_(batch))
+        ):
+            items[item.book_id].append(item)
+        if not items:
+            continue
+        books = db.execute(
+            select(Book.id, Book.author, Book.page_count, Book.genres).where(
+                Book.id.in_(items.keys())
+            )
+        )
+        for book in books:
+            _contribute(counters, book, items[book.id])
+    return counters
+
+
+def _lock_books(db: Session, book_ids: List[int]) -> None:
+    """
+    On PostgreSQL, lock the books' rows (in id order, so writers can't
+    deadlock) until commit: a concurrent write to the same books waits
+    instead of reading the same "before" and applying it twice. SQLite
+    lets only one writer commit anyway.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for start in range(0, len(book_ids), CONTRIBUTION_BATCH_SIZE):
+        batch = book_ids[start : start + CONTRIBUTION_BATCH_SIZE]
+        db.execute(
+            select(Book.id)
+            .where(Book.id.in_(batch))
+            .order_by(Book.id)
+            .with_for_update()
+        )
+
+
+def _apply(db: Session, delta: Counters) -> None:
+    delta = {key: value for key, value in delta.items() if value != [0, 0]}
+    if not delta:
+        return
+
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    # executemany with bound parameters: compiling one multi-row VALUES
+    # clause per batch costs more than running the upserts
+    stmt = insert(ReadingStat)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ReadingStat.kind, ReadingStat.key],
+            set_={
+                "books": ReadingStat.books + stmt.excluded.books,
+                "pages": ReadingStat.pages + stmt.excluded.pages,
+            },
+        ),
+        [
+            {"kind": kind, "key": key, "books": books, "pages": pages}
+            for (kind, key), (books, pages) in sorted(delta.items())
+        ],
+    )
+    # Drop counters that fell to zero so top-N and histograms stay small
+    decremented = [
+        {"drop_kind": kind, "drop_key": key}
+        for (kind, key), (books, _) in delta.items()
+        if books < 0
+    ]
+    if decremented:
+        # Core statement: the ORM has no executemany form of DELETE
+        table = ReadingStat.__table__
+        db.execute(
+            table.delete().where(
+                table.c.kind == bindparam("drop_kind"),
+                table.c.key == bindparam("drop_key"),
+                table.c.books <= 0,
+            ),
+            decremented,
+        )
+
+
+@contextmanager
+def tracking(db: Session, book_ids: Iterable[int]) -> Iterator[None]:
+    """
+    Keep the summary counters in step with a write touching these books.
+    Use inside the write's transaction, before db.commit().
+    """
+    book_ids = sorted(set(book_ids))
+    _lock_books(db, book_ids)
+    before = _contributions(db, book_ids)
+    yield
+    db.flush()
+    delta = _contributions(db, book_ids)
+    for key, (books, pages) in before.items():
+        counter = delta.setdefault(key, [0, 0])
+        counter[0] -= books
+        counter[1] -= pages
+    _apply(db, delta)
+
+
+def list_book_ids(db: Session, list_id: int) -> List[int]:
+    rows = db.query(BookListItem.book_id).filter(BookListItem.book_list_id == list_id)
+    return [book_id for (book_id,) in rows.distinct()]
+
+
+def _streak(months: List[str], today: date) -> Tuple[int, int]:
+    """(current, longest) run of consecutive months with a finished book"""
+
+    def index(month: str) -> int:
+        year, month_number = month.split("-")
+        return int(year) * 12 + int(month_number) - 1
+
+    indexes = sorted({index(month) for month in months})
+    longest = run = 0
+    previous = None
+    for value in indexes:
+        run = run + 1 if previous is not None and value == previous + 1 else 1
+        longest = max(longest, run)
+        previous = value
+    # A streak is still current until a whole month passes without a book
+    this_month = today.year * 12 + today.month - 1
+    current = run if previous is not None and this_month - previous <= 1 else 0
+    return current, longest
+
+
+def get_stats(db: Session, today: date = None) -> dict:
+    """Reading statistics, read from the summary table only"""
+    rows = db.query(
+        ReadingStat.kind, ReadingStat.key, ReadingStat.books, ReadingStat.pages
+    ).filter(ReadingStat.kind.in_(("total", "year", "month", "rating")))
+    by_kind = defaultdict(dict)
+    for kind, key, books, pages in rows:
+        by_kind[kind][key] = (books, pages)
+
+    def top(kind: str) -> List[dict]:
+        rows = (
+            db.query(ReadingStat.key, ReadingStat.books)
+            .filter(ReadingStat.kind == kind)
+            .order_by(ReadingStat.books.desc(), ReadingStat.key)
+            .limit(TOP_LIMIT)
+        )
+        return [{"name": key, "books": books} for key, books in rows]
+
+    ratings = {int(key): books for key, (books, _) in by_kind["rating"].items()}
+    rated = sum(ratings.values())
+    finished_books, pages_read = by_kind["total"].get("finished", (0, 0))
+    current_streak, longest_streak = _streak(
+        list(by_kind["month"].keys()), today or date.today()
+    )
+    return {
+        "books": by_kind["total"].get("books", (0, 0))[0],
+        "finished": finished_books,
+        "pages_read": pages_read,
+        "by_year": [
+            {"year": int(key), "books": books, "pages": pages}
+            for key, (books, pages) in sorted(by_kind["year"].items())
+        ],
+        "by_month": [
+            {"month": key, "books": books, "pages": pages}
+            for key, (books, pages) in sorted(by_kind["month"].items())
+        ],
+        "rating_histogram": {str(r): ratings.get(r, 0) for r in range(1, 6)},
+        "average_rating": (
+            round(sum(r * n for r, n in ratings.items()) / rated, 2) if rated else None
+        ),
+        "top_genres": top("genre"),
+        "top_authors": top("author"),
+        "current_streak_months": current_streak,
+        "longest_streak_months": longest_streak,
+    }
+
+
+def rebuild(db: Session, dry_run: bool = False) -> List[dict]:
+    """
+    Recompute every counter from book_list_items and replace the table.
+    Returns the counters that differed ({kind, key, stored, expected}).
+    """
+    book_ids = [book_id for (book_id,) in db.query(BookListItem.book_id).distinct()]
+    expected = _contributions(db, book_ids)
+    expected = {key: value for key, value in expected.items() if value != [0, 0]}
+    stored = {
+        (kind, key): [books, pages]
+        for kind, key, books, pages in db.query(
+            ReadingStat.kind, ReadingStat.key, ReadingStat.books, ReadingStat.pages
+        )
+    }
+    drift = [
+        {
+            "kind": kind,
+            "key": key,
+            "stored": stored.get((kind, key), [0, 0]),
+            "expected": expected.get((kind, key), [0, 0]),
+        }
+        for kind, key in sorted(set(stored) | set(expected))
+        if stored.get((kind, key)) != expected.get((kind, key))
+    ]
+    if not dry_run and drift:
+        db.execute(delete(ReadingStat))
+        if expected:
+            db.execute(
+                ReadingStat.__table__.insert(),
+                [
+                    {"kind": kind, "key": key, "books": books, "pages": pages}
+                    for (kind, key), (books, pages) in sorted(expected.items())
+                ],
+            )
+        db.commit()
+    return drift
+
+
+def needs_bootstrap(db: Session) -> bool:
+    """Items exist but no counters do (e.g. right after the table was added)"""
+    has_stats = db.query(select(ReadingStat.kind).exists()).scalar()
+    return not has_stats and db.query(select(BookListItem.id).exists()).scalar()
@@ -0,0 +1,11 @@
+"""
+Async versions of app.crud.stats for AsyncSession-based request handlers
+(run_sync delegation, as in app.crud.book_async).
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import stats as crud_stats
+
+
+async def get_stats(db: AsyncSession) -> dict:
+    return await db.run_sync(crud_stats.get_stats)
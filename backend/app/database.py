@@ -1,23 +1,173 @@
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 
+from app.pool_stats import TimedAsyncQueuePool, TimedQueuePool, register_pool
+from app.read_routing import reads_from_primary
+
 # SQLite for development (switch to PostgreSQL later if needed)
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./books.db")
 
-# Create engine
+# Async drivers for each backend
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def _async_url(url: str) -> str:
+    """Map a sync database URL onto its async driver (aiosqlite / asyncpg)"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if not driver:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Async engine used by request handlers; same database, non-blocking driver.
+# ASYNC_DATABASE_URL overrides the URL derived from DATABASE_URL.
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", _async_url(SQLALCHEMY_DATABASE_URL)
+)
+
+# SQLite tuning profile: "tuned" applies the PRAGMAs below on every new
+# connection and gives readers their own pool; "default" uses SQLite defaults
+# with a single shared pool. Only applies to file-backed SQLite databases.
+def _is_sqlite_file(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+_url = make_url(SQLALCHEMY_DATABASE_URL)
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "tuned")
+SQLITE_TUNED = _is_sqlite_file(_url) and SQLITE_PROFILE == "tuned"
+
+# Optional read replica for safe GET routes. Writes always go to
+# DATABASE_URL; a client that just wrote is pinned to the primary for
+# READ_YOUR_WRITES_SECONDS (see app.read_routing) to hide replica lag.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    # Negative cache_size is in KiB (64 MiB)
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+SQLITE_WRITE_POOL_SIZE = int(os.getenv("SQLITE_WRITE_POOL_SIZE", "4"))
+
+# General connection pool settings (PostgreSQL, and SQLite outside the tuned
+# profile). Size pool_size + max_overflow per worker so that
+# workers * (size + overflow) stays under the server's max_connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle connections before server/proxy idle timeouts drop them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+def _apply_sqlite_pragmas(engine, read_only: bool = False) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def _pool_options(
+    read_only: bool = False, is_async: bool = False, url=_url
+) -> dict:
+    # In-memory SQLite keeps SQLAlchemy's single-connection pools
+    if url.get_backend_name() == "sqlite" and not _is_sqlite_file(url):
+        return {}
+    options = {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+    if not (_is_sqlite_file(url) and SQLITE_PROFILE == "tuned"):
+        return {
+            **options,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+        }
+    if read_only:
+        return {**options, "pool_size": SQLITE_READ_POOL_SIZE, "max_overflow": 0}
+    # SQLite allows one writer at a time. A small, capped writer pool makes
+    # excess writers queue at checkout instead of piling up in busy_timeout.
+    return {**options, "pool_size": SQLITE_WRITE_POOL_SIZE, "max_overflow": 0}
+
+
+# Create engine (the writer)
 # connect_args only needed for SQLite
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args=(
         {"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
     ),
+    **_pool_options(),
+)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **_pool_options(is_async=True)
 )
 
+if SQLITE_TUNED:
+    _apply_sqlite_pragmas(engine)
+    _apply_sqlite_pragmas(async_engine.sync_engine)
+
+# Readers use the replica when DATABASE_READ_URL is set, a separate pool on
+# tuned SQLite (WAL lets them run alongside the writer), and otherwise share
+# the writer's engine
+if DATABASE_READ_URL:
+    _read_url = make_url(DATABASE_READ_URL)
+    async_read_engine = create_async_engine(
+        _async_url(DATABASE_READ_URL),
+        **_pool_options(read_only=True, is_async=True, url=_read_url),
+    )
+    if _is_sqlite_file(_read_url) and SQLITE_PROFILE == "tuned":
+        _apply_sqlite_pragmas(async_read_engine.sync_engine, read_only=True)
+elif SQLITE_TUNED:
+    async_read_engine = create_async_engine(
+        ASYNC_DATABASE_URL, **_pool_options(read_only=True, is_async=True)
+    )
+    _apply_sqlite_pragmas(async_read_engine.sync_engine, read_only=True)
+else:
+    async_read_engine = async_engine
+
+register_pool("sync", engine.pool)
+register_pool("writer", async_engine.pool)
+if async_read_engine is not async_engine:
+    register_pool("reader", async_read_engine.pool)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False: attributes must stay loaded after commit, since
+# lazy loads are not possible once a handler leaves the session's greenlet
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -29,3 +179,23 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Sessions for read-only work (replica, or reader pool on tuned SQLite).
+# Clients pinned after a recent write read from the primary instead.
+def read_session_factory(request: Request) -> async_sessionmaker:
+    if DATABASE_READ_URL and reads_from_primary(request):
+        return AsyncSessionLocal
+    return AsyncReadSessionLocal
+
+
+# Dependency for read-only routes
+async def get_async_read_db(request: Request):
+    async with read_session_factory(request)() as db:
+        yield db
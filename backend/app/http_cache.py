@@ -0,0 +1,52 @@
+"""ETag and conditional GET helpers for read endpoints."""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Tuple
+from fastapi import Request, Response
+
+# Library data changes on every user write, so clients must always revalidate
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from version components (counters, query params)"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 response carrying the current validators"""
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": cache_control}
+    )
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def public_cache_control(max_age: int) -> str:
+    return f"public, max-age={max(int(max_age), 0)}"
+
+
+def upstream_validators(
+    cached_at: datetime, ttl: timedelta, *parts
+) -> Tuple[str, str]:
+    """ETag and Cache-Control for a response served from an upstream cache entry"""
+    etag = make_etag(*parts, cached_at.isoformat())
+    remaining = (cached_at + ttl - datetime.now()).total_seconds()
+    return etag, public_cache_control(remaining)
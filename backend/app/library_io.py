@@ -0,0 +1,210 @@
+"""
+Bulk library export and Goodreads CSV parsing.
+
+Exports are async generators over streamed query results (server-side
+cursors on PostgreSQL, lazily fetched rows on SQLite), encoded a few
+hundred rows at a time, so memory stays flat whatever the library size.
+
+- NDJSON: one {"type": "list" | "book" | "item", ...} record per line,
+  lists first, then books, then items; a full-fidelity dump.
+- CSV: one row per book in Goodreads export format, with the book's lists
+  as shelves, so it can be re-imported here or into Goodreads.
+"""
+
+import csv
+import io
+import re
+from typing import AsyncIterator, List, Optional
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import library as crud_library
+from app.models.book_list import ReadingStatus
+from app.schemas.book import isbn13
+
+# Rows fetched per round trip while streaming an export
+EXPORT_FETCH_SIZE = 1000
+
+GOODREADS_COLUMNS = [
+    "Title",
+    "Author",
+    "ISBN",
+    "ISBN13",
+    "My Rating",
+    "Binding",
+    "Number of Pages",
+    "Year Published",
+    "Original Publication Year",
+    "Date Added",
+    "Bookshelves",
+    "Exclusive Shelf",
+    "My Review",
+]
+
+SHELF_STATUS = {
+    "to-read": ReadingStatus.TO_READ,
+    "currently-reading": ReadingStatus.READING,
+    "read": ReadingStatus.FINISHED,
+}
+STATUS_SHELF = {status: shelf for shelf, status in SHELF_STATUS.items()}
+
+BINDING_FORMATS = (
+    ("kindle", "ebook"),
+    ("ebook", "ebook"),
+    ("audio", "audiobook"),
+    ("hardcover", "hardcover"),
+    ("paperback", "paperback"),
+    ("mass market", "paperback"),
+)
+
+
+async def _stream(db: AsyncSession, query):
+    result = await db.stream(query.execution_options(yield_per=EXPORT_FETCH_SIZE))
+    async for partition in result.mappings().partitions():
+        yield partition
+
+
+def _ndjson_lines(record_type: str, rows) -> bytes:
+    return b"".join(
+        orjson.dumps(
+            {"type": record_type, **row},
+            option=orjson.OPT_UTC_Z | orjson.OPT_PASSTHROUGH_SUBCLASS,
+            default=str,
+        )
+        + b"\n"
+        for row in rows
+    )
+
+
+async def export_ndjson(db: AsyncSession) -> AsyncIterator[bytes]:
+    for record_type, query in (
+        ("list", crud_library.export_lists_query()),
+        ("book", crud_library.export_books_query()),
+        ("item", crud_library.export_items_query()),
+    ):
+        async for rows in _stream(db, query):
+            yield _ndjson_lines(record_type, rows)
+
+
+def _shelf_name(list_name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", list_name.lower()).strip("-")
+
+
+def _goodreads_row(book_rows: List[dict]) -> list:
+    book = book_rows[0]
+    memberships = [row for row in book_rows if row["list_name"]]
+    status_rows = [
+        row
+        for row in memberships
+        if row["list_is_default"] and row["list_name"] != "Favorites"
+    ]
+    status = status_rows[0]["status"] if status_rows else None
+    rating = next((row["rating"] for row in memberships if row["rating"]), None)
+    review = next((row["notes"] for row in memberships if row["notes"]), None)
+    added = min(
+        (row["added_at"] for row in memberships if row["added_at"]), default=None
+    )
+    isbn = book["isbn"] or ""
+    return [
+        book["title"],
+        book["author"],
+        isbn if len(isbn) == 10 else "",
+        # Canonical form: books stored by ISBN-10 have one too
+        book["isbn13"] or (isbn if len(isbn) == 13 else ""),
+        rating or 0,
+        book["format"] or "",
+        book["page_count"] or "",
+        book["published_year"] or "",
+        book["published_year"] or "",
+        added.strftime("%Y/%m/%d") if added else "",
+        ", ".join(
+            _shelf_name(row["list_name"])
+            for row in memberships
+            if row not in status_rows
+        ),
+        STATUS_SHELF.get(status, ""),
+        review or "",
+    ]
+
+
+async def export_csv(db: AsyncSession) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(GOODREADS_COLUMNS)
+
+    # Rows arrive ordered by book; emit each book once its rows are complete
+    current: List[dict] = []
+    async for rows in _stream(db, crud_library.export_shelves_query()):
+        for row in rows:
+            if current and row["id"] != current[0]["id"]:
+                writer.writerow(_goodreads_row(current))
+                current = []
+            current.append(row)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if current:
+        writer.writerow(_goodreads_row(current))
+    yield buffer.getvalue().encode()
+
+
+def _clean_isbn(value: str) -> Optional[str]:
+    # Goodreads wraps ISBNs as ="0441013597" to stop spreadsheets mangling them
+    digits = re.sub(r"[^0-9Xx]", "", value or "")
+    return digits.upper() if len(digits) in (10, 13) else None
+
+
+def _int(value: str) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _binding_format(binding: str) -> Optional[str]:
+    binding = (binding or "").lower()
+    for marker, book_format in BINDING_FORMATS:
+        if marker in binding:
+            return book_format
+    return None
+
+
+def parse_goodreads_csv(text: str) -> List[dict]:
+    """
+    Parse a Goodreads library export into import rows, one per book,
+    deduplicated by ISBN in either form (the last row for an ISBN wins).
+    Rows without a title or author are skipped.
+    """
+    rows = {}
+    for index, record in enumerate(csv.DictReader(io.StringIO(text))):
+        title = (record.get("Title") or "").strip()
+        author = (record.get("Author") or "").strip()
+        if not title or not author:
+            continue
+
+        isbn = _clean_isbn(record.get("ISBN13")) or _clean_isbn(record.get("ISBN"))
+        shelves = [
+            shelf.strip().lower()
+            for shelf in (record.get("Bookshelves") or "").split(",")
+            if shelf.strip()
+        ]
+        exclusive = (record.get("Exclusive Shelf") or "to-read").strip().lower()
+        rating = _int(record.get("My Rating"))
+        year = _int(record.get("Original Publication Year")) or _int(
+            record.get("Year Published")
+        )
+
+        rows[isbn13(isbn) or isbn or index] = {
+            "title": title[:255],
+            "author": author[:255],
+            "isbn": isbn,
+            "page_count": _int(record.get("Number of Pages")),
+            "published_year": year,
+            "format": _binding_format(record.get("Binding")),
+            "status": SHELF_STATUS.get(exclusive, ReadingStatus.TO_READ),
+            "rating": rating if rating and 1 <= rating <= 5 else None,
+            "favorite": "favorites" in shelves,
+            "notes": (record.get("My Review") or "").strip() or None,
+        }
+    return list(rows.values())
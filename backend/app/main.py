@@ -1,30 +1,58 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import os
 
-from app.database import get_db, Base, engine
-from app.routers import books, lists, search, nyt
-from app.crud import book_list as crud_list
+from app.database import DATABASE_READ_URL
+from app.compression import CompressionMiddleware
+from app.read_routing import PRIMARY_UNTIL_HEADER, ReadYourWritesMiddleware
+from app.pool_stats import pool_status
+from app.routers import books, covers, library, lists, search, nyt, stats
+from app.startup import initialize
+from app.services.cache_warmer import CACHE_WARM_ENABLED, run_cache_warmer
+from app.services.popularity import popularity_report
+from app.services import covers as cover_service
+from app.services import cover_placeholders
+from app.services.reading_rollup import READING_ROLLUP_ENABLED, run_rollup
+from app.services.related import RELATED_ENABLED, run_related
+from app.services.enrichment import (
+    ENRICHMENT_ENABLED,
+    enrichment_report,
+    run_enrichment,
+)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# The schema is owned by Alembic (`alembic upgrade head`); importing the app
+# runs no DDL.
 
 
 # Lifespan context manager for startup/shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Initialize default lists
-    db = next(get_db())
-    try:
-        crud_list.create_default_lists(db)
-    finally:
-        db.close()
+    # Startup: Initialize default lists (lock-guarded, safe with N workers)
+    initialize()
+    # Keep popular upstream queries warm in this worker's caches
+    warmer = asyncio.create_task(run_cache_warmer()) if CACHE_WARM_ENABLED else None
+    # Fill in missing metadata on incomplete books in the background
+    enricher = asyncio.create_task(run_enrichment()) if ENRICHMENT_ENABLED else None
+    # Precompute cover placeholders for new and changed covers
+    placeholders = (
+        asyncio.create_task(cover_placeholders.run_placeholders())
+        if cover_placeholders.PLACEHOLDERS_ENABLED
+        else None
+    )
+    # Compact the reading progress log into daily rollups
+    rollup = asyncio.create_task(run_rollup()) if READING_ROLLUP_ENABLED else None
+    # Keep "readers also listed" recommendations up to date
+    related = asyncio.create_task(run_related()) if RELATED_ENABLED else None
 
     yield  # Application runs here
 
-    # Shutdown: Add cleanup code here if needed in the future
-    pass
+    # Shutdown: stop the background tasks
+    for task in (warmer, enricher, placeholders, rollup, related):
+        if task:
+            task.cancel()
+    await cover_service.shutdown()
 
 
 app = FastAPI(title="Book Tracker API", version="1.0.0", lifespan=lifespan)
@@ -43,13 +71,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[PRIMARY_UNTIL_HEADER],
 )
+app.add_middleware(CompressionMiddleware)
+# Pin clients to the primary right after a write when reads go to a replica
+if DATABASE_READ_URL:
+    app.add_middleware(ReadYourWritesMiddleware)
 
 # Include routers
 app.include_router(books.router)
 app.include_router(lists.router)
 app.include_router(search.router)
 app.include_router(nyt.router)
+app.include_router(library.router)
+app.include_router(covers.router)
+app.include_router(stats.router)
 
 
 @app.get("/")
@@ -60,3 +96,30 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/pool")
+def pool_health():
+    """Connection pool gauges and checkout wait/timeout/error telemetry"""
+    return pool_status()
+
+
+@app.get("/health/cache")
+def cache_health():
+    """Upstream cache hit ratios, warmer activity and popularity sketch size"""
+    return popularity_report()
+
+
+@app.get("/health/enrichment")
+async def enrichment_health():
+    """Metadata enrichment throughput and queue depth"""
+    return await enrichment_report()
+
+
+@app.get("/health/covers")
+def covers_health():
+    """Cover proxy disk cache usage, failed upstream images and placeholder stage"""
+    return {
+        **cover_service.cover_report(),
+        "placeholders": cover_placeholders.stats.snapshot(),
+    }
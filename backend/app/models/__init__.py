@@ -1,4 +1,24 @@
 from app.models.book import Book
+from app.models.book_isbn import BookIsbn
 from app.models.book_list import BookList, BookListItem
+from app.models.data_version import DataVersion
+from app.models.enrichment_job import EnrichmentJob
+from app.models.open_library_work import OpenLibraryWork
+from app.models.reading_event import ReadingDay, ReadingEvent
+from app.models.reading_stat import ReadingStat
+from app.models.related_book import RelatedBook, RelatedRefresh
 
-__all__ = ["Book", "BookList", "BookListItem"]
+__all__ = [
+    "Book",
+    "BookIsbn",
+    "BookList",
+    "BookListItem",
+    "DataVersion",
+    "EnrichmentJob",
+    "OpenLibraryWork",
+    "ReadingDay",
+    "ReadingEvent",
+    "ReadingStat",
+    "RelatedBook",
+    "RelatedRefresh",
+]
@@ -1,5 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text
+from typing import Optional
+from sqlalchemy import DDL, Column, Integer, String, Text, event
+from sqlalchemy.orm import validates
 from app.database import Base
+from app.schemas.book import isbn13, title_match_key
+
+
+def _canonical_isbn(context) -> Optional[str]:
+    return isbn13(context.get_current_parameters().get("isbn"))
+
+
+def _title_key(context) -> Optional[str]:
+    title = context.get_current_parameters().get("title")
+    return title_match_key(title) if title else None
 
 
 class Book(Base):
@@ -9,6 +21,12 @@ class Book(Base):
     title = Column(String(255), nullable=False, index=True)
     author = Column(String(255), nullable=False, index=True)
     isbn = Column(String(13), nullable=True, unique=True, index=True)
+    # isbn as a checksum-valid ISBN-13 (None if it isn't a valid ISBN), so
+    # ISBN-10 and ISBN-13 forms of one edition are one book. Derived on
+    # insert (ORM or Core); updates that change isbn set it themselves
+    isbn13 = Column(
+        String(13), nullable=True, unique=True, index=True, default=_canonical_isbn
+    )
     cover_url = Column(String(500), nullable=True)
     description = Column(Text, nullable=True)
     published_year = Column(Integer, nullable=True)
@@ -16,3 +34,61 @@ class Book(Base):
     genres = Column(Text)
     format = Column(String(50), nullable=True)
     edition = Column(String(100), nullable=True)
+    # Shown while the cover loads; computed from cover_placeholder_source,
+    # the cover_url they were derived from (stale once cover_url changes)
+    cover_color = Column(String(7), nullable=True)
+    cover_placeholder = Column(String(255), nullable=True)
+    cover_placeholder_source = Column(String(500), nullable=True)
+    # Open Library work the book's editions are listed under, once resolved
+    # (see app.crud.open_library_work)
+    ol_work_key = Column(String(32), nullable=True)
+    # title_match_key(title), for case-insensitive title lookups (library
+    # checks and imports). Derived on insert (ORM or Core) and whenever the
+    # ORM sets title
+    title_key = Column(String(255), nullable=True, index=True, default=_title_key)
+
+    @validates("title")
+    def _set_title_key(self, key, title):
+        self.title_key = title_match_key(title) if title else None
+        return title
+
+
+# Full-text index over title and author (public list search, see
+# app.crud.book_list.search_public_lists_by_book). On SQLite an FTS5 table
+# is kept in step with books by triggers; on PostgreSQL a GIN index covers
+# the tsvector expression the search uses. Created here for create_all and
+# by migration d0e1f2a3b4c5 for Alembic-managed databases.
+BOOK_SEARCH_VECTOR = "to_tsvector('simple', books.title || ' ' || books.author)"
+
+SQLITE_BOOK_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE books_fts USING fts5(title, author, content='books', "
+    "content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER books_fts_ai AFTER INSERT ON books BEGIN "
+    "INSERT INTO books_fts(rowid, title, author) "
+    "VALUES (new.id, new.title, new.author); END",
+    "CREATE TRIGGER books_fts_ad AFTER DELETE ON books BEGIN "
+    "INSERT INTO books_fts(books_fts, rowid, title, author) "
+    "VALUES ('delete', old.id, old.title, old.author); END",
+    "CREATE TRIGGER books_fts_au AFTER UPDATE OF title, author ON books BEGIN "
+    "INSERT INTO books_fts(books_fts, rowid, title, author) "
+    "VALUES ('delete', old.id, old.title, old.author); "
+    "INSERT INTO books_fts(rowid, title, author) "
+    "VALUES (new.id, new.title, new.author); END",
+]
+
+for statement in SQLITE_BOOK_SEARCH_DDL:
+    event.listen(
+        Book.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Book.__table__,
+    "after_create",
+    DDL(
+        f"CREATE INDEX ix_books_search ON books USING gin ({BOOK_SEARCH_VECTOR})"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Book.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS books_fts").execute_if(dialect="sqlite"),
+)
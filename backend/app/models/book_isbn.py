@@ -0,0 +1,20 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+from app.database import Base
+
+
+class BookIsbn(Base):
+    """
+    Another ISBN-13 that identifies a book: a former ISBN, or another
+    edition's ISBN the source listed for it. Lookups by ISBN check
+    books.isbn13 first, then these (see app.crud.book.get_books_by_isbn).
+    """
+
+    __tablename__ = "book_isbns"
+
+    isbn13 = Column(String(13), primary_key=True)
+    book_id = Column(
+        Integer,
+        ForeignKey("books.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
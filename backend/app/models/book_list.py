@@ -5,6 +5,7 @@ from sqlalchemy import (
     Text,
     DateTime,
     ForeignKey,
+    Index,
     Enum as SQLEnum,
 )
 from sqlalchemy.orm import relationship
@@ -29,6 +30,8 @@ class BookList(Base):
     description = Column(Text, nullable=True)
     is_default = Column(Integer, default=0)  # 0=user created, 1=default list
     is_public = Column(Integer, default=0)  # 0=private, 1=public
+    # Maintained by the write paths (see app.crud.item_count)
+    item_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -37,6 +40,17 @@ class BookList(Base):
         "BookListItem", back_populates="book_list", cascade="all, delete-orphan"
     )
 
+    # Default list names are unique, so concurrent seeding cannot duplicate them
+    __table_args__ = (
+        Index(
+            "uq_book_lists_default_name",
+            name,
+            unique=True,
+            sqlite_where=is_default == 1,
+            postgresql_where=is_default == 1,
+        ),
+    )
+
 
 class BookListItem(Base):
     __tablename__ = "book_list_items"
@@ -45,6 +59,7 @@ class BookListItem(Base):
     book_list_id = Column(
         Integer, ForeignKey("book_lists.id", ondelete="CASCADE"), nullable=False
     )
+    # Indexed by ix_book_list_items_book_list below
     book_id = Column(
         Integer, ForeignKey("books.id", ondelete="CASCADE"), nullable=False
     )
@@ -62,3 +77,11 @@ class BookListItem(Base):
     # Relationships
     book_list = relationship("BookList", back_populates="items")
     book = relationship("Book")
+
+    __table_args__ = (
+        # A list's items, without a table lookup per item
+        Index("ix_book_list_items_list_book", book_list_id, book_id),
+        # Lists holding given books (public list search, membership checks);
+        # covers lookups by book_id alone too
+        Index("ix_book_list_items_book_list", book_id, book_list_id),
+    )
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+
+class DataVersion(Base):
+    """Monotonic version counters bumped on every write (used for ETags)"""
+
+    __tablename__ = "data_versions"
+
+    key = Column(String(50), primary_key=True)  # "global" or "list:<id>"
+    version = Column(Integer, nullable=False, default=0)
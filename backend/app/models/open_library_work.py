@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class OpenLibraryWork(Base):
+    """
+    The Open Library work a title/author resolved to, so loading its
+    editions skips the search (see app.crud.open_library_work)
+    """
+
+    __tablename__ = "open_library_works"
+
+    # Lowercased, whitespace-collapsed title and author
+    title = Column(String(255), primary_key=True)
+    author = Column(String(255), primary_key=True)
+    work_key = Column(String(32), nullable=False)  # e.g. "/works/OL45804W"
+    resolved_at = Column(DateTime(timezone=True), server_default=func.now())
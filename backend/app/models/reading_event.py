@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ReadingEvent(Base):
+    """
+    One reading progress update, appended on every current_page change and
+    never modified. The rollup (see app.crud.progress) compacts finished
+    days into ReadingDay rows and deletes the events.
+    """
+
+    __tablename__ = "reading_events"
+
+    id = Column(Integer, primary_key=True)
+    book_id = Column(
+        Integer, ForeignKey("books.id", ondelete="CASCADE"), nullable=False
+    )
+    page = Column(Integer, nullable=False)
+    # Pages gained since the previous update (0 for resets and corrections)
+    pages_read = Column(Integer, nullable=False, default=0)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (Index("ix_reading_events_book_created", book_id, created_at),)
+
+
+class ReadingDay(Base):
+    """Daily reading progress per book, rolled up from ReadingEvent"""
+
+    __tablename__ = "reading_days"
+
+    book_id = Column(
+        Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    pages_read = Column(Integer, nullable=False, default=0)
+    end_page = Column(Integer, nullable=False)
+    updates = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Library-wide charts range over days across all books; covering
+        # pages_read lets them read the index alone
+        Index("ix_reading_days_day", day, pages_read),
+        # On SQLite, store rows in primary key order instead of keeping a
+        # rowid table plus a separate (book_id, day) index
+        {"sqlite_with_rowid": False},
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+
+class ReadingStat(Base):
+    """
+    One reading-statistics counter, maintained incrementally by the write
+    paths (see app.crud.stats). kind is "total", "year", "month", "rating",
+    "genre" or "author"; key is e.g. "finished", "2025", "2025-03", "4".
+    """
+
+    __tablename__ = "reading_stats"
+
+    kind = Column(String(20), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    books = Column(Integer, nullable=False, default=0)
+    pages = Column(Integer, nullable=False, default=0)
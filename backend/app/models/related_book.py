@@ -0,0 +1,42 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class RelatedBook(Base):
+    """
+    One precomputed "readers also listed" recommendation: related_id is
+    among book_id's top matches by public-list co-occurrence (see
+    app.crud.related)
+    """
+
+    __tablename__ = "related_books"
+
+    book_id = Column(
+        Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    related_id = Column(
+        Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Co-occurrence normalized by both books' popularity (higher is closer)
+    score = Column(Float, nullable=False)
+    # Public lists holding both books
+    lists = Column(Integer, nullable=False)
+
+    # Deleting a book cascades through related_id too; don't scan for it
+    # Clustered on (book_id, related_id): a book's rows sit together
+    __table_args__ = (
+        Index("ix_related_books_related_id", related_id),
+        {"sqlite_with_rowid": False},
+    )
+
+
+class RelatedRefresh(Base):
+    """Books whose recommendations are stale since a public list changed"""
+
+    __tablename__ = "related_refresh"
+
+    book_id = Column(
+        Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    queued_at = Column(DateTime(timezone=True), server_default=func.now())
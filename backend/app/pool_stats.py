@@ -0,0 +1,123 @@
+"""
+Connection pool telemetry.
+
+Engines are built with TimedQueuePool / TimedAsyncQueuePool, which time
+every checkout (queue wait + pre-ping + any new connect) and count
+checkout timeouts and connect errors per named pool.
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last is +Inf
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.timeouts = 0
+        self.connect_errors = 0
+
+    def observe_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def observe_error(self, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.connect_errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            bounds: List[str] = [str(b) for b in WAIT_BUCKETS_MS] + ["+Inf"]
+            return {
+                "checkouts": self.checkouts,
+                "wait_ms_avg": (
+                    round(self.wait_ms_total / self.checkouts, 3)
+                    if self.checkouts
+                    else 0.0
+                ),
+                "wait_ms_max": round(self.wait_ms_max, 3),
+                "wait_ms_histogram": dict(zip(bounds, self.wait_buckets)),
+                "timeouts": self.timeouts,
+                "connect_errors": self.connect_errors,
+            }
+
+
+# Stats per pool name ("writer", "reader", ...)
+_stats: Dict[str, PoolStats] = {}
+_pools: Dict[str, QueuePool] = {}
+
+
+class _TimedPoolMixin:
+    stats_name = "default"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            _stats_for(self.stats_name).observe_error(timed_out=True)
+            raise
+        except Exception:
+            _stats_for(self.stats_name).observe_error(timed_out=False)
+            raise
+        _stats_for(self.stats_name).observe_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats_name = self.stats_name
+        _pools[self.stats_name] = pool
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _stats_for(name: str) -> PoolStats:
+    if name not in _stats:
+        _stats[name] = PoolStats()
+    return _stats[name]
+
+
+def register_pool(name: str, pool) -> None:
+    """Name an engine's pool so its stats show up in pool_status()"""
+    if isinstance(pool, _TimedPoolMixin):
+        pool.stats_name = name
+        _pools[name] = pool
+        _stats_for(name)
+
+
+def pool_status() -> Dict[str, dict]:
+    """Live pool gauges plus checkout telemetry for every registered pool"""
+    status = {}
+    for name, pool in _pools.items():
+        status[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            **_stats_for(name).snapshot(),
+        }
+    return status
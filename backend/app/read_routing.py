@@ -0,0 +1,64 @@
+"""
+Read-your-writes stickiness for the read replica.
+
+After a successful write, the response pins the client to the primary for
+READ_YOUR_WRITES_SECONDS: browsers on the same site get a short-lived
+cookie; cross-origin clients get an X-Read-Primary-Until header and send
+X-Read-Primary: 1 back until that time passes. Any method but GET, HEAD and
+OPTIONS counts as a write, unless the route depends on `read_only`.
+"""
+
+import os
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+PRIMARY_COOKIE = "read_primary"
+PRIMARY_HEADER = "X-Read-Primary"
+PRIMARY_UNTIL_HEADER = "X-Read-Primary-Until"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def read_only(request: Request) -> None:
+    """Route dependency: this POST (etc.) only reads, so don't pin the client"""
+    request.state.read_only = True
+
+
+def reads_from_primary(request: Request) -> bool:
+    """True if the client wrote recently and must not read from the replica"""
+    if request.cookies.get(PRIMARY_COOKIE):
+        return True
+    return request.headers.get(PRIMARY_HEADER, "").lower() in ("1", "true")
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp, seconds: int = READ_YOUR_WRITES_SECONDS) -> None:
+        self.app = app
+        self.seconds = seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < 400
+                # Set by the read_only dependency, which has run by now
+                and not scope.get("state", {}).get("read_only")
+            ):
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{PRIMARY_COOKIE}=1; Max-Age={self.seconds}; Path=/; "
+                    "HttpOnly; SameSite=Lax",
+                )
+                headers[PRIMARY_UNTIL_HEADER] = str(int(time.time()) + self.seconds)
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
@@ -1,37 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
 from typing import List, Optional
-from app.models.book_list import BookList, BookListItem
-from app.models.book import Book as BookModel
 
-from app.database import get_db
-from app.schemas.book import Book, BookCreate, BookUpdate
-from app.crud import book as crud_book
-from app.crud import book_list as crud_book_list
+from app.database import get_async_db, get_async_read_db
+from app.read_routing import read_only
+from app.schemas.book import Book, BookCreate, BookUpdate, BookCheckBatch
+from app.crud import book_async as crud_book
+from app.crud import book_list_async as crud_book_list
+from app.crud import progress as crud_progress
+from app.crud import progress_async as crud_progress_async
+from app.crud import related as crud_related
+from app.crud import related_async as crud_related_async
+from app.serialization import FastJSONResponse, book_to_dict
 
 router = APIRouter(prefix="/books", tags=["books"])
 
 
 @router.get("/", response_model=List[Book])
-def get_books(
+async def get_books(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Get all books with pagination"""
-    books = crud_book.get_books(db, skip=skip, limit=limit)
+    books = await crud_book.get_books(db, skip=skip, limit=limit)
     return books
 
 
 @router.get("/search", response_model=List[Book])
-def search_books(
+async def search_books(
     q: str = Query(..., min_length=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Search books by title or author"""
-    books = crud_book.search_books(db, query=q, skip=skip, limit=limit)
+    books = await crud_book.search_books(db, query=q, skip=skip, limit=limit)
     return books
 
 
@@ -40,113 +45,146 @@ async def check_book_exists(
     isbn: Optional[str] = Query(None),
     title: Optional[str] = Query(None),
     author: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     Check if a book exists in the user's library
     Returns the book and which lists it's in with status info
+    (matched by ISBN, else exact title and author, as /check/batch does)
     """
-    book = None
-
-    # Try to find by ISBN first (most accurate)
-    if isbn:
-        book = crud_book.get_book_by_isbn(db, isbn=isbn)
-
-    # If not found and we have title/author, try that
-    if not book and title and author:
-        books = (
-            db.query(BookModel)
-            .filter(
-                BookModel.title.ilike(f"%{title}%"),
-                BookModel.author.ilike(f"%{author}%"),
-            )
-            .all()
-        )
-        if books:
-            book = books[0]
+    book = await crud_book.find_book(db, isbn=isbn, title=title, author=author)
 
     if not book:
         return {"exists": False, "book": None, "lists": []}
 
     # Get which lists this book is in with status
-    book_list_items = (
-        db.query(BookListItem).filter(BookListItem.book_id == book.id).all()
-    )
-
-    list_ids = [item.book_list_id for item in book_list_items]
-    lists_data = []
-    
-    if list_ids:
-        lists = db.query(BookList).filter(BookList.id.in_(list_ids)).all()
-        # Create a map of list_id to list name
-        list_map = {l.id: l.name for l in lists}
-        
-        # Build response with list name, status, and item_id
-        for item in book_list_items:
-            lists_data.append({
-                "id": item.book_list_id,
-                "name": list_map.get(item.book_list_id, "Unknown"),
-                "status": item.status.value,  # to_read, reading, finished
-                "item_id": item.id,  # Need this for updating
-                "rating": item.rating,
-                "is_favorite": item.is_favorite,
-            })
+    memberships = await crud_book.get_list_memberships(db, [book.id])
 
     return {
         "exists": True,
         "book": book,
-        "lists": lists_data,
+        "lists": memberships.get(book.id, []),
     }
 
 
+@router.post("/check/batch", dependencies=[Depends(read_only)])
+async def check_books_exist_batch(
+    batch: BookCheckBatch, db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Check a page of search results against the user's library in one call.
+    Returns one {exists, book, lists} entry per requested book, in order.
+    """
+    return {"results": await crud_book.check_books_in_library(db, batch.books)}
+
+
 @router.get("/{book_id}", response_model=Book)
-def get_book(book_id: int, db: Session = Depends(get_db)):
+async def get_book(book_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get a specific book by ID"""
-    book = crud_book.get_book(db, book_id=book_id)
+    book = await crud_book.get_book(db, book_id=book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
     return book
 
 
 @router.post("/", response_model=Book, status_code=201)
-def create_book(book: BookCreate, db: Session = Depends(get_db)):
+async def create_book(book: BookCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new book"""
     # Check if ISBN already exists
     if book.isbn:
-        existing = crud_book.get_book_by_isbn(db, isbn=book.isbn)
+        existing = await crud_book.get_book_by_isbn(db, isbn=book.isbn)
         if existing:
             raise HTTPException(
                 status_code=400, detail="Book with this ISBN already exists"
             )
 
-    return crud_book.create_book(db, book=book)
+    return await crud_book.create_book(db, book=book)
 
 
 @router.patch("/{book_id}", response_model=Book)
-def update_book(book_id: int, book_update: BookUpdate, db: Session = Depends(get_db)):
+async def update_book(
+    book_id: int, book_update: BookUpdate, db: AsyncSession = Depends(get_async_db)
+):
     """Update a book's details including genres"""
-    updated_book = crud_book.update_book(db, book_id, book_update)
+    # Another book may hold the ISBN (in either form, or as an alternate)
+    if book_update.isbn:
+        existing = await crud_book.get_book_by_isbn(db, isbn=book_update.isbn)
+        if existing and existing.id != book_id:
+            raise HTTPException(
+                status_code=400, detail="Book with this ISBN already exists"
+            )
+
+    updated_book = await crud_book.update_book(db, book_id, book_update)
     if not updated_book:
         raise HTTPException(status_code=404, detail="Book not found")
     return updated_book
 
 
 @router.delete("/{book_id}", status_code=204)
-def delete_book(book_id: int, db: Session = Depends(get_db)):
+async def delete_book(book_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a book"""
-    success = crud_book.delete_book(db, book_id=book_id)
+    success = await crud_book.delete_book(db, book_id=book_id)
     if not success:
         raise HTTPException(status_code=404, detail="Book not found")
     return None
 
 
 @router.post("/{book_id}/reset-progress")
-def reset_book_progress(book_id: int, db: Session = Depends(get_db)):
+async def reset_book_progress(
+    book_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Reset reading progress (current_page) for a book across all lists"""
     # Verify book exists
-    book = crud_book.get_book(db, book_id=book_id)
+    book = await crud_book.get_book(db, book_id=book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
 
-    count = crud_book_list.reset_book_progress(db, book_id=book_id)
-    return {"message": "Progress reset", "updated_items": count}
\ No newline at end of file
+    count = await crud_book_list.reset_book_progress(db, book_id=book_id)
+    return {"message": "Progress reset", "updated_items": count}
+
+
+@router.get("/{book_id}/progress")
+async def get_book_progress(
+    book_id: int,
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Daily pages read for a book (default: the last 90 days), with its
+    current page, recent pace (pages/day) and estimated days to finish
+    """
+    start, end = crud_progress.default_range(start, end)
+    if start > end:
+        raise HTTPException(status_code=422, detail="start must not be after end")
+    progress = await crud_progress_async.get_book_progress(db, book_id, start, end)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return FastJSONResponse(progress)
+
+
+@router.get("/{book_id}/related")
+async def get_related_books(
+    book_id: int,
+    limit: int = Query(
+        crud_related.RELATED_TOP_K, ge=1, le=crud_related.RELATED_TOP_K
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    "Readers also listed": books that share public lists with this one,
+    closest first, with a similarity score and the number of shared lists
+    """
+    related = await crud_related_async.get_related(db, book_id, limit)
+    if related is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return FastJSONResponse(
+        [
+            {
+                **book_to_dict(entry["book"]),
+                "score": entry["score"],
+                "lists": entry["lists"],
+            }
+            for entry in related
+        ]
+    )
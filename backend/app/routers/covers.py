@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from html import escape
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_read_db
+from app.crud import book_async as crud_book
+from app.http_cache import etag_matches, make_etag, not_modified, public_cache_control
+from app.services import covers
+
+router = APIRouter(prefix="/covers", tags=["covers"])
+
+# Covers rarely change once set, and clients put a version of the book's
+# cover_url in the URL (`v`), so a changed cover is a new URL; revalidation
+# with the ETag is a cheap 304
+COVER_CACHE_CONTROL = public_cache_control(7 * 24 * 3600) + ", stale-while-revalidate=86400"
+# Placeholders stand in for a missing or failed cover, so retry soon
+PLACEHOLDER_CACHE_CONTROL = public_cache_control(300)
+
+
+def _placeholder(title: str, width: int) -> bytes:
+    label = escape(title if len(title) <= 24 else title[:23] + "…")
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{width * 3 // 2}" viewBox="0 0 200 300">'
+        f'<rect width="200" height="300" fill="#e7e5e4"/>'
+        f'<text x="100" y="150" text-anchor="middle" dominant-baseline="middle" '
+        f'font-family="sans-serif" font-size="14" fill="#57534e">{label}</text>'
+        f"</svg>"
+    ).encode()
+
+
+@router.get("/{book_id}")
+async def get_cover(
+    book_id: int,
+    request: Request,
+    size: str = Query("medium", pattern="^(small|medium|large|original)$"),
+    v: Optional[str] = Query(
+        None, description="Cover version (unused here; changes the URL)"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    A book's cover, resized and cached on disk. Falls back to an SVG
+    placeholder when the book has no cover or the upstream host fails.
+    """
+    book = await crud_book.get_book(db, book_id)
+    if not book:
+        raise HTTPException(status_code=404, detail="Book not found")
+
+    if book.cover_url:
+        try:
+            data, content_type = await covers.get_cover(book.cover_url, size)
+        except Exception as e:
+            print(f"Cover fetch failed for book {book_id}: {e}")
+        else:
+            etag = make_etag("cover", size, covers.content_hash(data))
+            if etag_matches(request, etag):
+                return not_modified(etag, COVER_CACHE_CONTROL)
+            return Response(
+                content=data,
+                media_type=content_type,
+                headers={"ETag": etag, "Cache-Control": COVER_CACHE_CONTROL},
+            )
+
+    width = covers.COVER_SIZES.get(size, covers.COVER_SIZES["large"])
+    data = _placeholder(book.title, width)
+    etag = make_etag("placeholder", size, book.title)
+    if etag_matches(request, etag):
+        return not_modified(etag, PLACEHOLDER_CACHE_CONTROL)
+    return Response(
+        content=data,
+        media_type="image/svg+xml",
+        headers={"ETag": etag, "Cache-Control": PLACEHOLDER_CACHE_CONTROL},
+    )
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+import os
+import time
+
+from app.database import get_db, read_session_factory
+from app.crud import library as crud_library
+from app.library_io import export_csv, export_ndjson, parse_goodreads_csv
+
+router = APIRouter(prefix="/library", tags=["library"])
+
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(50 * 1024 * 1024)))
+
+EXPORT_FORMATS = {
+    "ndjson": (export_ndjson, "application/x-ndjson"),
+    "csv": (export_csv, "text/csv; charset=utf-8"),
+}
+
+
+@router.get("/export")
+async def export_library(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+):
+    """
+    Stream the whole library: NDJSON (lists, books and items) or a
+    Goodreads-format CSV (one row per book, lists as shelves)
+    """
+    export, media_type = EXPORT_FORMATS[format]
+    # Chosen now, like get_async_read_db: an export right after an import
+    # reads from the primary
+    session_factory = read_session_factory(request)
+
+    # The session lives inside the generator: it must stay open for the
+    # whole response, not just the handler
+    async def body():
+        async with session_factory() as db:
+            async for chunk in export(db):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="library.{format}"'
+        },
+    )
+
+
+@router.post("/import")
+async def import_library(request: Request, db: Session = Depends(get_db)):
+    """
+    Bulk-import a Goodreads library export (CSV request body).
+    Books are deduplicated by ISBN (then title + author) and placed on the
+    default list for their shelf: to-read, currently-reading or read.
+    """
+    body = await request.body()
+    if not body:
+        raise HTTPException(status_code=400, detail="Request body must be a CSV file")
+    if len(body) > IMPORT_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="CSV file is too large")
+
+    started = time.perf_counter()
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    rows = await run_in_threadpool(parse_goodreads_csv, text)
+    if not rows:
+        raise HTTPException(status_code=400, detail="No importable rows found")
+
+    # Thousands of rows of synchronous work: in the threadpool, on a sync
+    # session, so the event loop keeps serving other requests meanwhile
+    result = await run_in_threadpool(crud_library.import_books, db, rows)
+    return {**result, "seconds": round(time.perf_counter() - started, 2)}
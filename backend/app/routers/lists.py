@@ -1,10 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy.orm import joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app.database import get_db
-from app.models.book_list import BookListItem, ReadingStatus
+from app.database import get_async_db, get_async_read_db
+from app.models.book_list import ReadingStatus
 from app.schemas.book_list import (
     BookList,
     BookListCreate,
@@ -13,66 +12,96 @@ from app.schemas.book_list import (
     BookListItemCreate,
     BookListItemUpdate,
 )
-from app.crud import book_list as crud_list
+from app.crud import book_list_async as crud_list
+from app.crud import data_version as crud_version
+from app.serialization import (
+    FastJSONResponse,
+    book_list_to_dict,
+    book_lists_to_dicts,
+    dump_json,
+)
+from app.http_cache import (
+    PRIVATE_CACHE_CONTROL,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
 
 router = APIRouter(prefix="/lists", tags=["lists"])
 
 
 @router.get("/public", response_model=List[BookList])
-def get_public_lists(
+async def get_public_lists(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Get all public lists with their books"""
-    return crud_list.get_public_lists(db, skip=skip, limit=limit)
+    version = await crud_list.get_versions(db, [crud_version.GLOBAL_KEY])
+    etag = make_etag("public", version[crud_version.GLOBAL_KEY], skip, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_CACHE_CONTROL)
+
+    lists = await crud_list.get_public_lists(db, skip=skip, limit=limit)
+    return FastJSONResponse(
+        book_lists_to_dicts(lists),
+        headers={"ETag": etag, "Cache-Control": PRIVATE_CACHE_CONTROL},
+    )
 
 
 @router.get("/", response_model=List[BookListSummary])
-def get_lists(
+async def get_lists(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Get all lists with item counts (default lists first)"""
-    lists = crud_list.get_book_lists_summary(db, skip=skip, limit=limit)
-    return lists
+    version = await crud_list.get_versions(db, [crud_version.GLOBAL_KEY])
+    etag = make_etag("summary", version[crud_version.GLOBAL_KEY], skip, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_CACHE_CONTROL)
+
+    lists = await crud_list.get_book_lists_summary(db, skip=skip, limit=limit)
+    return Response(
+        dump_json(List[BookListSummary], lists),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": PRIVATE_CACHE_CONTROL},
+    )
 
 
 @router.get("/currently-reading")
-def get_currently_reading_books(
+async def get_currently_reading_books(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Get all books currently being read"""
-    items = (
-        db.query(BookListItem)
-        .options(joinedload(BookListItem.book))
-        .filter(BookListItem.status == ReadingStatus.READING)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    items = await crud_list.get_currently_reading_items(db, skip=skip, limit=limit)
     return items
 
 
 @router.post("/", response_model=BookList, status_code=201)
-def create_list(book_list: BookListCreate, db: Session = Depends(get_db)):
+async def create_list(
+    book_list: BookListCreate, db: AsyncSession = Depends(get_async_db)
+):
     """Create a new list"""
-    return crud_list.create_book_list(db, book_list=book_list)
+    return await crud_list.create_book_list(db, book_list=book_list)
 
 
 # MOVE THIS BEFORE /{list_id} routes
 @router.post("/{list_id}/books/{book_id}/move-status")
-def move_book_status(
+async def move_book_status(
     list_id: int,
     book_id: int,
     new_status: ReadingStatus = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Move a book to the appropriate default list based on status change"""
-    result = crud_list.move_book_to_status_list(db, book_id, list_id, new_status)
+    result = await crud_list.move_book_to_status_list(
+        db, book_id, list_id, new_status
+    )
     if not result:
         raise HTTPException(
             status_code=404, detail="Book not found or target list missing"
@@ -81,7 +110,7 @@ def move_book_status(
 
 
 @router.get("/{list_id}/random")
-def get_random_book(
+async def get_random_book(
     list_id: int,
     status: Optional[ReadingStatus] = Query(
         None, description="Filter by reading status"
@@ -89,14 +118,14 @@ def get_random_book(
     max_pages: Optional[int] = Query(None, ge=1, description="Maximum page count"),
     min_pages: Optional[int] = Query(None, ge=1, description="Minimum page count"),
     genre: Optional[str] = Query(None, description="Filter by genre"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Get a random book from the list with optional filters"""
-    book_list = crud_list.get_book_list(db, list_id=list_id)
+    book_list = await crud_list.get_book_list(db, list_id=list_id)
     if not book_list:
         raise HTTPException(status_code=404, detail="List not found")
 
-    random_item = crud_list.get_random_book_from_list(
+    random_item = await crud_list.get_random_book_from_list(
         db,
         list_id,
         status=status,
@@ -112,41 +141,60 @@ def get_random_book(
 
 
 @router.get("/{list_id}", response_model=BookList)
-def get_list(
+async def get_list(
     list_id: int,
+    request: Request,
     sort_order: str = Query("desc", pattern="^(asc|desc|award_year_desc|award_year_asc|rank_asc|rank_desc)$"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Get a specific list with all its books"""
-    book_list = crud_list.get_book_list(db, list_id=list_id, sort_order=sort_order)
+    # Existence first: a deleted list's old ETag must not answer 304
+    version = await crud_list.get_list_version(db, list_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="List not found")
+    etag = make_etag(crud_version.list_key(list_id), version, sort_order)
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_CACHE_CONTROL)
+
+    book_list = await crud_list.get_book_list(
+        db, list_id=list_id, sort_order=sort_order
+    )
     if not book_list:
         raise HTTPException(status_code=404, detail="List not found")
-    return book_list
+
+    return FastJSONResponse(
+        book_list_to_dict(book_list),
+        headers={"ETag": etag, "Cache-Control": PRIVATE_CACHE_CONTROL},
+    )
 
 
 @router.patch("/{list_id}", response_model=BookList)
-def update_list(
-    list_id: int, list_update: BookListUpdate, db: Session = Depends(get_db)
+async def update_list(
+    list_id: int,
+    list_update: BookListUpdate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update a list"""
     # Guard: default lists cannot be made public
     if list_update.is_public == 1:
-        existing = crud_list.get_book_list(db, list_id)
+        existing = await crud_list.get_book_list(db, list_id)
         if existing and existing.is_default == 1:
             raise HTTPException(
                 status_code=400, detail="Default lists cannot be made public"
             )
 
-    book_list = crud_list.update_book_list(db, list_id=list_id, list_update=list_update)
+    book_list = await crud_list.update_book_list(
+        db, list_id=list_id, list_update=list_update
+    )
     if not book_list:
         raise HTTPException(status_code=404, detail="List not found")
     return book_list
 
 
 @router.delete("/{list_id}", status_code=204)
-def delete_list(list_id: int, db: Session = Depends(get_db)):
+async def delete_list(list_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a list (cannot delete default lists)"""
-    success = crud_list.delete_book_list(db, list_id=list_id)
+    success = await crud_list.delete_book_list(db, list_id=list_id)
     if not success:
         raise HTTPException(
             status_code=404, detail="List not found or cannot delete default list"
@@ -155,25 +203,27 @@ def delete_list(list_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/{list_id}/books", status_code=201)
-def add_book_to_list(
-    list_id: int, item: BookListItemCreate, db: Session = Depends(get_db)
+async def add_book_to_list(
+    list_id: int,
+    item: BookListItemCreate,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Add a book to a list"""
-    result = crud_list.add_book_to_list(db, list_id=list_id, item=item)
+    result = await crud_list.add_book_to_list(db, list_id=list_id, item=item)
     if not result:
         raise HTTPException(status_code=404, detail="List not found")
     return result
 
 
 @router.patch("/{list_id}/books/{book_id}")
-def update_book_in_list(
+async def update_book_in_list(
     list_id: int,
     book_id: int,
     item_update: BookListItemUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update a book's status, rating, or notes in a list"""
-    result = crud_list.update_book_list_item(
+    result = await crud_list.update_book_list_item(
         db, list_id=list_id, book_id=book_id, item_update=item_update
     )
     if not result:
@@ -182,20 +232,13 @@ def update_book_in_list(
 
 
 @router.delete("/{list_id}/books/{item_id}", status_code=204)
-def remove_book_from_list(list_id: int, item_id: int, db: Session = Depends(get_db)):
+async def remove_book_from_list(
+    list_id: int, item_id: int, db: AsyncSession = Depends(get_async_db)
+):
     """Remove a book from a list"""
-    # Get the item
-    item = (
-        db.query(BookListItem)
-        .filter(BookListItem.id == item_id, BookListItem.book_list_id == list_id)
-        .first()
+    success = await crud_list.remove_book_from_list(
+        db, list_id=list_id, item_id=item_id
     )
-
-    if not item:
+    if not success:
         raise HTTPException(status_code=404, detail="Book not found in this list")
-
-    # Delete the item
-    db.delete(item)
-    db.commit()
-
     return None
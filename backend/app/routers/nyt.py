@@ -1,17 +1,33 @@
-from fastapi import APIRouter, Query
-from app.services.nyt_books import get_bestsellers, get_bestseller_lists
+from fastapi import APIRouter, Query, Request, Response
+from app.http_cache import (
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+    upstream_validators,
+)
+from app.services import popularity
+
+# Upstream service modules (and httpx) are imported inside the handlers so
+# they stay off the startup path
 
 router = APIRouter(prefix="/nyt", tags=["nyt-books"])
 
 
 @router.get("/bestsellers")
 async def get_nyt_bestsellers(
+    request: Request,
+    response: Response,
     list_name: str = Query(
         "combined-print-and-e-book-fiction", description="NYT bestseller list name"
-    )
+    ),
+    full: bool = Query(
+        False, description="The whole list rather than the overview's top books"
+    ),
 ):
     """
     Get current NYT bestsellers.
+    By default the list's top books, from the overview NYT serves for all
+    lists at once; full=true fetches the whole list.
 
     Popular list names:
     - combined-print-and-e-book-fiction
@@ -21,12 +37,38 @@ async def get_nyt_bestsellers(
     - young-adult-hardcover
     - childrens-middle-grade-hardcover
     """
-    books = await get_bestsellers(list_name)
+    from app.services.nyt_books import (
+        CACHE_DURATION,
+        get_bestsellers,
+        get_bestsellers_cached_at,
+    )
+
+    cached_at = get_bestsellers_cached_at(list_name, full)
+    if cached_at:
+        etag, cache_control = upstream_validators(
+            cached_at, CACHE_DURATION, "nyt", list_name, full
+        )
+        if etag_matches(request, etag):
+            # Still a cache hit as far as popularity tracking is concerned
+            if not full:
+                popularity.record("bestsellers", list_name, hit=True)
+            return not_modified(etag, cache_control)
+
+    books = await get_bestsellers(list_name, full=full)
+
+    cached_at = get_bestsellers_cached_at(list_name, full)
+    if cached_at:
+        set_cache_headers(
+            response,
+            *upstream_validators(cached_at, CACHE_DURATION, "nyt", list_name, full),
+        )
     return {"list_name": list_name, "results": books, "count": len(books)}
 
 
 @router.get("/lists")
 async def get_available_lists():
     """Get all available NYT bestseller list names"""
+    from app.services.nyt_books import get_bestseller_lists
+
     lists = await get_bestseller_lists()
     return {"results": lists, "count": len(lists)}
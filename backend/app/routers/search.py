@@ -1,12 +1,21 @@
-from fastapi import APIRouter, Query, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Query, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from app.database import get_db
-from app.services.google_books import search_google_books
-from app.schemas.book import Book, BookCreate
-from app.crud import book as crud_book
-from app.crud import book_list as crud_list
-from app.services.open_library import search_open_library_editions
+from app.database import get_async_db, get_async_read_db
+from app.schemas.book import Book, BookCreate, BookCheckQuery
+from app.crud import book_async as crud_book
+from app.crud import book_list_async as crud_list
+from app.http_cache import (
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+    upstream_validators,
+)
+from app.services import popularity
+
+# Upstream service modules (and httpx) are imported inside the handlers so
+# they stay off the startup path
 
 router = APIRouter(prefix="/search", tags=["search"])
 
@@ -15,6 +24,10 @@ router = APIRouter(prefix="/search", tags=["search"])
 async def search_external_books(
     q: str = Query(..., min_length=1, description="Search query"),
     max_results: int = Query(20, ge=1, le=40),
+    include_library: bool = Query(
+        False, description="Annotate each result with its library membership"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """
     Search for books using Google Books API
@@ -23,70 +36,91 @@ async def search_external_books(
     if not q.strip():
         raise HTTPException(status_code=400, detail="Search query cannot be empty")
 
+    from app.services.google_books import search_google_books
+
     books = await search_google_books(q, max_results)
+
+    if include_library and books:
+        # Copy results so the cached entries are not mutated
+        checks = await crud_book.check_books_in_library(
+            db, [BookCheckQuery(**book) for book in books]
+        )
+        books = [{**book, "library": check} for book, check in zip(books, checks)]
+
     print("book results from backend", books)
     return {"query": q, "results": books, "count": len(books)}
 
 
 @router.post("/external/add", response_model=Book, status_code=201)
-async def add_external_book_to_db(book_data: BookCreate, db: Session = Depends(get_db)):
+async def add_external_book_to_db(
+    book_data: BookCreate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Add a book from external search results to the database
     Checks for duplicates by ISBN first, updates if exists
     """
-    if book_data.isbn:
-        existing = crud_book.get_book_by_isbn(db, isbn=book_data.isbn)
-        if existing:
-            # Update existing book with new data
-            existing.title = book_data.title
-            existing.author = book_data.author
-            existing.cover_url = book_data.cover_url
-            existing.description = book_data.description
-            existing.published_year = book_data.published_year
-            existing.page_count = book_data.page_count
-            existing.format = book_data.format
-            existing.edition = book_data.edition
-
-            # Handle genres - convert list to comma-separated string
-            if book_data.genres:
-                existing.genres = ",".join(
-                    book_data.genres
-                )  # ← This converts list to string
-            else:
-                existing.genres = None
-
-            db.commit()
-            db.refresh(existing)
-            return existing
-
-    # Create new book
-    return crud_book.create_book(db, book=book_data)
+    return await crud_book.upsert_external_book(db, book=book_data)
 
 
 @router.get("/lists")
-def search_public_lists(
+async def search_public_lists(
     q: str = Query(..., min_length=1, description="Search query"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    """Search public lists by book title or author"""
+    """
+    Search public lists by book title or author. One result per list, with
+    its best matching books; `total` counts matching lists for paging.
+    """
     if not q.strip():
         raise HTTPException(status_code=400, detail="Search query cannot be empty")
 
-    results = crud_list.search_public_lists_by_book(db, q.strip(), skip=skip, limit=limit)
-    return {"query": q, "results": results, "count": len(results)}
+    results, total = await crud_list.search_public_lists_by_book(
+        db, q.strip(), skip=skip, limit=limit
+    )
+    return {"query": q, "results": results, "count": len(results), "total": total}
 
 
 @router.get("/editions")
 async def get_book_editions(
+    request: Request,
+    response: Response,
     title: str = Query(..., description="Book title"),
     author: str = Query(..., description="Book author"),
+    isbn: Optional[str] = Query(
+        None, description="Any edition's ISBN (finds the work without a search)"
+    ),
 ):
     """
     Get all available editions of a book from Open Library
     """
-    editions = await search_open_library_editions(title, author)
+    from app.services.open_library import (
+        CACHE_DURATION as EDITIONS_CACHE_DURATION,
+        get_editions_cached_at,
+        search_open_library_editions,
+    )
+
+    cached_at = get_editions_cached_at(title, author)
+    if cached_at:
+        etag, cache_control = upstream_validators(
+            cached_at, EDITIONS_CACHE_DURATION, "editions", title, author
+        )
+        if etag_matches(request, etag):
+            # Still a cache hit as far as popularity tracking is concerned
+            popularity.record("editions", (title, author), hit=True)
+            return not_modified(etag, cache_control)
+
+    editions = await search_open_library_editions(title, author, isbn=isbn)
+
+    cached_at = get_editions_cached_at(title, author)
+    if cached_at:
+        set_cache_headers(
+            response,
+            *upstream_validators(
+                cached_at, EDITIONS_CACHE_DURATION, "editions", title, author
+            ),
+        )
     return {
         "title": title,
         "author": author,
@@ -0,0 +1,61 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.database import get_async_read_db
+from app.crud import data_version as crud_version
+from app.crud import book_list_async as crud_list
+from app.crud import progress as crud_progress
+from app.crud import progress_async as crud_progress_async
+from app.crud import stats_async as crud_stats
+from app.http_cache import (
+    PRIVATE_CACHE_CONTROL,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
+from app.serialization import FastJSONResponse
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("")
+async def get_stats(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Reading statistics: books finished per year and month, pages read,
+    rating histogram, top genres and authors, and monthly reading streaks
+    """
+    version = await crud_list.get_versions(db, [crud_version.GLOBAL_KEY])
+    etag = make_etag("stats", version[crud_version.GLOBAL_KEY])
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_CACHE_CONTROL)
+
+    stats = await crud_stats.get_stats(db)
+    return FastJSONResponse(
+        stats, headers={"ETag": etag, "Cache-Control": PRIVATE_CACHE_CONTROL}
+    )
+
+
+@router.get("/daily")
+async def get_daily_pages(
+    request: Request,
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Pages read and books read per day across the library (default: 90 days)"""
+    start, end = crud_progress.default_range(start, end)
+    if start > end:
+        raise HTTPException(status_code=422, detail="start must not be after end")
+    # Progress updates bump the global version; the rollup changes no totals
+    version = await crud_list.get_versions(db, [crud_version.GLOBAL_KEY])
+    etag = make_etag("daily", version[crud_version.GLOBAL_KEY], start, end)
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_CACHE_CONTROL)
+
+    days = await crud_progress_async.get_daily_pages(db, start, end)
+    return FastJSONResponse(
+        {"start": start, "end": end, "days": days},
+        headers={"ETag": etag, "Cache-Control": PRIVATE_CACHE_CONTROL},
+    )
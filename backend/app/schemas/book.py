@@ -2,6 +2,82 @@ from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 import re
 
+# Other editions' ISBNs kept per book (Open Library lists every edition)
+MAX_ALTERNATE_ISBNS = 20
+
+
+def split_genres(v) -> List[str]:
+    """Parse genres from comma-separated string or list, sanitizing each entry"""
+    if isinstance(v, str) and v:
+        items = [g.strip() for g in v.split(",") if g.strip()]
+    elif v is None:
+        return []
+    else:
+        # Flatten any items that contain commas (e.g. "Fiction, American" -> "Fiction", "American")
+        items = []
+        for g in v:
+            if isinstance(g, str) and "," in g:
+                items.extend(part.strip() for part in g.split(",") if part.strip())
+            elif isinstance(g, str) and g.strip():
+                items.append(g.strip())
+    # Strip characters not allowed by the validator (keep alphanumeric, spaces, hyphens, apostrophes, ampersands)
+    cleaned = [re.sub(r"[^a-zA-Z0-9\s\-'&]", "", g).strip() for g in items]
+    return [g for g in cleaned if g]
+
+
+def _isbn13_check_digit(body: str) -> str:
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(body))
+    return str(-total % 10)
+
+
+def isbn13(v: Optional[str]) -> Optional[str]:
+    """
+    The canonical ISBN-13 form of an ISBN-10 or ISBN-13 (hyphens and spaces
+    ignored), or None if it isn't a valid one (bad length or check digit).
+    ISBN-10s get the 978 prefix and a new check digit.
+    """
+    digits = re.sub(r"[\s-]", "", v or "").upper()
+    if re.fullmatch(r"97[89]\d{10}", digits):
+        return digits if _isbn13_check_digit(digits[:12]) == digits[12] else None
+    if not re.fullmatch(r"\d{9}[\dX]", digits):
+        return None
+    values = [10 if d == "X" else int(d) for d in digits]
+    if sum((10 - i) * value for i, value in enumerate(values)) % 11:
+        return None
+    body = "978" + digits[:9]
+    return body + _isbn13_check_digit(body)
+
+
+def title_match_key(title: str) -> str:
+    """
+    A title (or author) as compared by the library checks: Unicode
+    case-folded with whitespace collapsed, so "Émile" matches "ÉMILE".
+    Done in Python because SQLite's lower() only folds ASCII.
+    """
+    return " ".join(title.casefold().split())[:255]
+
+
+def check_isbns(v):
+    """Keep the first MAX_ALTERNATE_ISBNS alternate ISBNs"""
+    return v[:MAX_ALTERNATE_ISBNS] if v else v
+
+
+def check_genres(v):
+    """Validate genre list"""
+    if not v:
+        return v
+
+    # Max 10 genres
+    if len(v) > 10:
+        v = v[:10]
+
+    # Validate each genre
+    for genre in v:
+        if len(genre) > 50:
+            raise ValueError(f"Genre '{genre}' is too long (max 50 characters)")
+
+    return v
+
 
 # Base schema with common fields
 class BookBase(BaseModel):
@@ -20,44 +96,26 @@ class BookBase(BaseModel):
     @classmethod
     def parse_genres(cls, v):
         """Parse genres from comma-separated string or list, sanitizing each entry"""
-        if isinstance(v, str) and v:
-            items = [g.strip() for g in v.split(",") if g.strip()]
-        elif v is None:
-            return []
-        else:
-            # Flatten any items that contain commas (e.g. "Fiction, American" -> "Fiction", "American")
-            items = []
-            for g in v:
-                if isinstance(g, str) and "," in g:
-                    items.extend(part.strip() for part in g.split(",") if part.strip())
-                elif isinstance(g, str) and g.strip():
-                    items.append(g.strip())
-        # Strip characters not allowed by the validator (keep alphanumeric, spaces, hyphens, apostrophes, ampersands)
-        cleaned = [re.sub(r"[^a-zA-Z0-9\s\-'&]", "", g).strip() for g in items]
-        return [g for g in cleaned if g]
+        return split_genres(v)
 
     @field_validator("genres")
     @classmethod
     def validate_genres(cls, v):
         """Validate genre list"""
-        if not v:
-            return v
-
-        # Max 10 genres
-        if len(v) > 10:
-            v = v[:10]
-
-        # Validate each genre
-        for genre in v:
-            if len(genre) > 50:
-                raise ValueError(f"Genre '{genre}' is too long (max 50 characters)")
-
-        return v
+        return check_genres(v)
 
 
 # For creating a book (no ID yet)
 class BookCreate(BookBase):
-    pass
+    # Other ISBNs the source listed for the book (e.g. NYT's other
+    # editions); lookups by any of them find it
+    alternate_isbns: Optional[List[str]] = None
+
+    @field_validator("alternate_isbns")
+    @classmethod
+    def validate_alternate_isbns(cls, v):
+        """Keep the first MAX_ALTERNATE_ISBNS alternate ISBNs"""
+        return check_isbns(v)
 
 
 # For updating a book (all fields optional)
@@ -77,40 +135,31 @@ class BookUpdate(BaseModel):
     @classmethod
     def parse_genres(cls, v):
         """Parse genres from comma-separated string or list, sanitizing each entry"""
-        if isinstance(v, str) and v:
-            items = [g.strip() for g in v.split(",") if g.strip()]
-        elif v is None:
-            return []
-        else:
-            items = []
-            for g in v:
-                if isinstance(g, str) and "," in g:
-                    items.extend(part.strip() for part in g.split(",") if part.strip())
-                elif isinstance(g, str) and g.strip():
-                    items.append(g.strip())
-        cleaned = [re.sub(r"[^a-zA-Z0-9\s\-'&]", "", g).strip() for g in items]
-        return [g for g in cleaned if g]
+        return split_genres(v)
 
     @field_validator("genres")
     @classmethod
     def validate_genres(cls, v):
         """Validate genre list"""
-        if not v:
-            return v
-
-        if len(v) > 10:
-            v = v[:10]
-
-        for genre in v:
-            if len(genre) > 50:
-                raise ValueError(f"Genre '{genre}' is too long (max 50 characters)")
-
-        return v
+        return check_genres(v)
 
 
 # For returning a book (includes ID and DB fields)
 class Book(BookBase):
     id: int
+    cover_color: Optional[str] = None
+    cover_placeholder: Optional[str] = None
 
     class Config:
         from_attributes = True  # Allows Pydantic to work with SQLAlchemy models
+
+
+# For batch library-membership lookups (one entry per search result)
+class BookCheckQuery(BaseModel):
+    isbn: Optional[str] = None
+    title: Optional[str] = None
+    author: Optional[str] = None
+
+
+class BookCheckBatch(BaseModel):
+    books: List[BookCheckQuery] = Field(..., max_length=100)
@@ -94,7 +94,8 @@ class PublicListSearchResult(BaseModel):
     list_name: str
     list_description: Optional[str] = None
     item_count: int
-    matching_book: Book
+    match_count: int
+    matching_books: List[Book]
 
     class Config:
         from_attributes = True
@@ -0,0 +1,93 @@
+"""
+High-throughput response path for large payloads.
+
+Large list endpoints skip FastAPI's response_model validation and
+jsonable_encoder pass: rows are turned straight into dicts and encoded
+with orjson. Smaller payloads that still need schema validation use a
+cached TypeAdapter, which validates and dumps JSON in pydantic-core.
+"""
+
+from functools import lru_cache
+from typing import Any, List
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.models.book import Book
+from app.models.book_list import BookList, BookListItem
+from app.schemas.book import check_genres, split_genres
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson (datetimes, enums and UUIDs native)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+@lru_cache(maxsize=None)
+def get_adapter(tp) -> TypeAdapter:
+    """Build each TypeAdapter once; constructing one compiles a core schema"""
+    return TypeAdapter(tp)
+
+
+def dump_json(tp, obj) -> bytes:
+    """Validate ORM objects against a schema type and dump straight to JSON bytes"""
+    adapter = get_adapter(tp)
+    return adapter.dump_json(adapter.validate_python(obj, from_attributes=True))
+
+
+def book_to_dict(book: Book) -> dict:
+    """Same shape as schemas.book.Book"""
+    return {
+        "title": book.title,
+        "author": book.author,
+        "isbn": book.isbn,
+        "cover_url": book.cover_url,
+        "description": book.description,
+        "published_year": book.published_year,
+        "page_count": book.page_count,
+        "genres": check_genres(split_genres(book.genres)),
+        "format": book.format,
+        "edition": book.edition,
+        "id": book.id,
+        "cover_color": book.cover_color,
+        "cover_placeholder": book.cover_placeholder,
+    }
+
+
+def item_to_dict(item: BookListItem) -> dict:
+    """Same shape as schemas.book_list.BookListItem"""
+    return {
+        "book_id": item.book_id,
+        "notes": item.notes,
+        "status": item.status,
+        "rating": item.rating,
+        "is_favorite": item.is_favorite,
+        "current_page": item.current_page,
+        "award_year": item.award_year,
+        "rank": item.rank,
+        "id": item.id,
+        "book_list_id": item.book_list_id,
+        "added_at": item.added_at,
+        "book": book_to_dict(item.book),
+    }
+
+
+def book_list_to_dict(book_list: BookList) -> dict:
+    """Same shape as schemas.book_list.BookList"""
+    return {
+        "name": book_list.name,
+        "description": book_list.description,
+        "id": book_list.id,
+        "is_default": book_list.is_default,
+        "is_public": book_list.is_public,
+        "created_at": book_list.created_at,
+        "updated_at": book_list.updated_at,
+        "items": [item_to_dict(item) for item in book_list.items],
+    }
+
+
+def book_lists_to_dicts(book_lists: List[BookList]) -> List[dict]:
+    return [book_list_to_dict(book_list) for book_list in book_lists]
@@ -0,0 +1,132 @@
+"""
+Background cache warmer driven by query popularity.
+
+Every CACHE_WARM_INTERVAL seconds, re-fetches the most popular searches
+(and the editions of their top results) and the most popular bestseller
+lists whose cache entries are missing or within CACHE_WARM_MARGIN of
+expiring, so popular queries stop paying upstream latency at each TTL.
+A refresh that leaves nothing cached (an upstream error, or no results,
+which the services don't cache) is retried with exponential backoff rather
+than on every tick, so a failing query doesn't burn API quota.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Set, Tuple
+
+from app.services import popularity
+
+CACHE_WARM_ENABLED = os.getenv("CACHE_WARM_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+CACHE_WARM_INTERVAL = int(os.getenv("CACHE_WARM_INTERVAL", "60"))
+CACHE_WARM_MARGIN = timedelta(seconds=int(os.getenv("CACHE_WARM_MARGIN", "300")))
+CACHE_WARM_TOP_K = int(os.getenv("CACHE_WARM_TOP_K", "20"))
+# Editions are warmed for this many top results of each popular search
+CACHE_WARM_EDITIONS_PER_QUERY = int(os.getenv("CACHE_WARM_EDITIONS_PER_QUERY", "3"))
+# Halve popularity counts this often so yesterday's spikes fade out
+POPULARITY_DECAY_INTERVAL = timedelta(hours=1)
+# Longest wait before retrying a refresh that cached nothing
+CACHE_WARM_MAX_BACKOFF = timedelta(hours=1)
+
+# Entry -> (refreshes in a row that cached nothing, when to try again)
+_backoff: Dict[Hashable, Tuple[int, datetime]] = {}
+
+
+def _needs_refresh(cached_at, ttl: timedelta) -> bool:
+    return cached_at is None or datetime.now() - cached_at > ttl - CACHE_WARM_MARGIN
+
+
+def _due(key: Hashable, cached_at, ttl: timedelta) -> bool:
+    """Needs a refresh and isn't backing off after failed ones"""
+    if not _needs_refresh(cached_at, ttl):
+        return False
+    backoff = _backoff.get(key)
+    return backoff is None or datetime.now() >= backoff[1]
+
+
+def _refreshed(key: Hashable, before, after) -> None:
+    """Back off an entry the refresh didn't re-cache; reset it otherwise"""
+    if after is not None and after != before:
+        _backoff.pop(key, None)
+        return
+    failures = _backoff.get(key, (0, None))[0] + 1
+    wait = timedelta(seconds=CACHE_WARM_INTERVAL * 2 ** min(failures, 16))
+    _backoff[key] = (failures, datetime.now() + min(wait, CACHE_WARM_MAX_BACKOFF))
+
+
+async def warm_once() -> int:
+    """Refresh popular entries that are missing or about to expire"""
+    # Imported here so httpx stays off the startup path
+    from app.services import google_books, nyt_books, open_library
+
+    refreshed = 0
+    # Entries still popular; backoff for the rest is dropped
+    popular: Set[Hashable] = set()
+
+    for query, max_results in popularity.top_queries("search", CACHE_WARM_TOP_K):
+        key = ("search", query, max_results)
+        popular.add(key)
+        cached_at = google_books.get_search_cached_at(query, max_results)
+        if _due(key, cached_at, google_books.CACHE_DURATION):
+            books = await google_books.search_google_books(
+                query, max_results, refresh=True
+            )
+            _refreshed(
+                key, cached_at, google_books.get_search_cached_at(query, max_results)
+            )
+            popularity.stats_for("search").warmed += 1
+            refreshed += 1
+        else:
+            books = google_books.get_cached_search(query, max_results) or []
+
+        for book in books[:CACHE_WARM_EDITIONS_PER_QUERY]:
+            title, author = book.get("title"), book.get("author")
+            if not title or not author:
+                continue
+            key = ("editions", title, author)
+            popular.add(key)
+            cached_at = open_library.get_editions_cached_at(title, author)
+            if _due(key, cached_at, open_library.CACHE_DURATION):
+                await open_library.search_open_library_editions(
+                    title, author, refresh=True
+                )
+                _refreshed(
+                    key, cached_at, open_library.get_editions_cached_at(title, author)
+                )
+                popularity.stats_for("editions").warmed += 1
+                refreshed += 1
+
+    for list_name in popularity.top_queries("bestsellers", CACHE_WARM_TOP_K):
+        key = ("bestsellers", list_name)
+        popular.add(key)
+        cached_at = nyt_books.get_bestsellers_cached_at(list_name)
+        if _due(key, cached_at, nyt_books.CACHE_DURATION):
+            await nyt_books.get_bestsellers(list_name, refresh=True)
+            _refreshed(key, cached_at, nyt_books.get_bestsellers_cached_at(list_name))
+            popularity.stats_for("bestsellers").warmed += 1
+            refreshed += 1
+
+    for key in _backoff.keys() - popular:
+        del _backoff[key]
+    return refreshed
+
+
+async def run_cache_warmer() -> None:
+    """Warm popular cache entries forever; cancelled on shutdown"""
+    last_decay = datetime.now()
+    while True:
+        await asyncio.sleep(CACHE_WARM_INTERVAL)
+        try:
+            refreshed = await warm_once()
+            if refreshed:
+                print(f"Cache warmer refreshed {refreshed} entries")
+        except Exception as e:
+            print(f"Cache warmer error: {e}")
+
+        if datetime.now() - last_decay > POPULARITY_DECAY_INTERVAL:
+            popularity.decay_all()
+            last_decay = datetime.now()
@@ -0,0 +1,123 @@
+"""
+Batch stage that computes cover placeholders for book grids.
+
+Every PLACEHOLDER_INTERVAL seconds, books whose cover_url is new or changed
+since their placeholder was computed are processed in batches. Each cover
+is fetched through the cover proxy cache, and its dominant color and a tiny
+WebP placeholder are computed in the cover process pool. The results are
+stored on the books in one bulk update per batch. A cover that can't be
+fetched is recorded with no placeholder and is retried only once its
+cover_url changes.
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional, Tuple
+
+from app.crud import cover_placeholder as crud_placeholder
+from app.database import AsyncSessionLocal
+from app.services import covers
+
+PLACEHOLDERS_ENABLED = os.getenv("PLACEHOLDERS_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+PLACEHOLDER_INTERVAL = int(os.getenv("PLACEHOLDER_INTERVAL", "60"))
+PLACEHOLDER_BATCH_SIZE = int(os.getenv("PLACEHOLDER_BATCH_SIZE", "100"))
+# Covers fetched at once; decoding is bounded by the pool's worker count
+PLACEHOLDER_CONCURRENCY = int(os.getenv("PLACEHOLDER_CONCURRENCY", "8"))
+
+
+class PlaceholderStats:
+    def __init__(self) -> None:
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "covers_per_second": (
+                round(self.processed / self.busy_seconds, 2)
+                if self.busy_seconds
+                else None
+            ),
+        }
+
+
+stats = PlaceholderStats()
+
+
+async def _compute(url: str) -> Optional[Tuple[str, str]]:
+    try:
+        data, _ = await covers.get_cover(url, "original")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            covers.get_pool(), covers.cover_placeholder, data
+        )
+    except Exception as e:
+        print(f"Placeholder failed for {url}: {e}")
+        return None
+
+
+async def process_batch(after_id: int = 0, limit: int = PLACEHOLDER_BATCH_SIZE) -> int:
+    """
+    Compute placeholders for the next batch of books after `after_id`.
+    Returns the last book id processed (0 when nothing was pending).
+    """
+    async with AsyncSessionLocal() as db:
+        pending = await db.run_sync(
+            crud_placeholder.pending_placeholders, after_id, limit
+        )
+    if not pending:
+        return 0
+
+    started = time.monotonic()
+    semaphore = asyncio.Semaphore(PLACEHOLDER_CONCURRENCY)
+
+    async def compute(url: str):
+        async with semaphore:
+            return await _compute(url)
+
+    results = await asyncio.gather(*(compute(url) for _, url in pending))
+    rows = [
+        {
+            "id": book_id,
+            "cover_color": result[0] if result else None,
+            "cover_placeholder": result[1] if result else None,
+            "cover_placeholder_source": url,
+        }
+        for (book_id, url), result in zip(pending, results)
+    ]
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(crud_placeholder.save_placeholders, rows)
+
+    stats.processed += len(rows)
+    stats.failed += sum(result is None for result in results)
+    stats.busy_seconds += time.monotonic() - started
+    return pending[-1][0]
+
+
+async def process_all() -> int:
+    """Drain every pending cover; returns how many books were processed"""
+    processed_before = stats.processed
+    after_id = 0
+    while True:
+        after_id = await process_batch(after_id)
+        if not after_id:
+            return stats.processed - processed_before
+
+
+async def run_placeholders() -> None:
+    """Compute placeholders for new covers forever; cancelled on shutdown"""
+    while True:
+        try:
+            processed = await process_all()
+            if processed:
+                print(f"Computed placeholders for {processed} covers")
+        except Exception as e:
+            print(f"Placeholder stage error: {e}")
+        await asyncio.sleep(PLACEHOLDER_INTERVAL)
@@ -0,0 +1,350 @@
+"""
+Cover image proxy with an on-disk LRU cache and resized variants.
+
+Originals are fetched once from the upstream host (Google Books, Open
+Library), then each size variant is generated in a process pool, so image
+decoding never blocks the event loop. Originals and variants are both
+stored under COVER_CACHE_DIR. The least recently served files are evicted
+once the directory grows past COVER_CACHE_MAX_BYTES. Concurrent requests
+for the same image share one fetch or resize. A failed fetch is not
+retried for COVER_FAILURE_TTL, so a slow or broken host can't stall every
+page load.
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+COVER_CACHE_DIR = Path(
+    os.getenv("COVER_CACHE_DIR", Path(__file__).parent.parent.parent / ".cover_cache")
+)
+COVER_CACHE_MAX_BYTES = int(os.getenv("COVER_CACHE_MAX_BYTES", str(512 * 1024**2)))
+COVER_RESIZE_WORKERS = int(os.getenv("COVER_RESIZE_WORKERS", "2"))
+COVER_FETCH_TIMEOUT = float(os.getenv("COVER_FETCH_TIMEOUT", "5"))
+COVER_FAILURE_TTL = timedelta(seconds=int(os.getenv("COVER_FAILURE_TTL", "300")))
+# Upstream hosts (and their subdomains) the proxy may fetch from; "*" allows any
+COVER_ALLOWED_HOSTS = [
+    host.strip().lower()
+    for host in os.getenv(
+        "COVER_ALLOWED_HOSTS",
+        "books.google.com,books.googleusercontent.com,"
+        "covers.openlibrary.org,archive.org",
+    ).split(",")
+    if host.strip()
+]
+MAX_ORIGINAL_BYTES = 5 * 1024**2
+MAX_REDIRECTS = 3
+
+# Variant name -> width in pixels (covers are roughly 2:3)
+COVER_SIZES = {"small": 160, "medium": 320, "large": 640}
+VARIANT_QUALITY = 82
+# Placeholder widths to try, largest first, until the data URI fits the column
+PLACEHOLDER_WIDTHS = (12, 8, 4)
+MAX_PLACEHOLDER_LENGTH = 255
+
+IMAGE_TYPES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG", "image/png"),
+    (b"GIF8", "image/gif"),
+    (b"RIFF", "image/webp"),
+)
+
+
+class CoverFetchError(Exception):
+    pass
+
+
+def _sniff_type(data: bytes) -> Optional[str]:
+    for magic, content_type in IMAGE_TYPES:
+        if data.startswith(magic):
+            return content_type
+    return None
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def resize_cover(data: bytes, width: int) -> bytes:
+    """Downscale an image to `width` (never upscale) and re-encode as JPEG"""
+    # Runs in the process pool; Pillow is only ever imported there
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        # Let the JPEG decoder downscale by a power of two while decoding
+        image.draft("RGB", (width, width * 2))
+        image = image.convert("RGB")
+        if image.width > width:
+            height = max(round(image.height * width / image.width), 1)
+            image = image.resize((width, height), Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=VARIANT_QUALITY, optimize=True, progressive=True)
+        return out.getvalue()
+
+
+def cover_placeholder(data: bytes) -> Tuple[str, str]:
+    """
+    Dominant color ("#rrggbb") and a tiny blurred WebP data URI for a cover,
+    small enough to inline in list payloads (~160 chars)
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft("RGB", (64, 96))
+        image = image.convert("RGB")
+        sample = image.resize((32, 48), Image.BOX)
+
+    # Most common of a few median-cut colors, so a thin border or a title
+    # block doesn't average into mud
+    quantized = sample.quantize(colors=5, method=Image.Quantize.MEDIANCUT)
+    palette = quantized.getpalette()
+    _, index = max(quantized.getcolors())
+    color = "#{:02x}{:02x}{:02x}".format(*palette[index * 3 : index * 3 + 3])
+
+    for width in PLACEHOLDER_WIDTHS:
+        tiny = sample.resize((width, width * 3 // 2), Image.BOX)
+        out = io.BytesIO()
+        tiny.save(out, "WEBP", quality=40)
+        uri = "data:image/webp;base64," + base64.b64encode(out.getvalue()).decode()
+        if len(uri) <= MAX_PLACEHOLDER_LENGTH:
+            break
+    return color, uri
+
+
+class DiskLRU:
+    """Files in one directory, evicted least recently used first by mtime"""
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None
+
+    def _path(self, name: str) -> Path:
+        return self.root / name[:2] / name
+
+    def _scan(self):
+        return [entry for entry in self.root.glob("*/*") if entry.is_file()]
+
+    def size(self) -> int:
+        if self._size is None:
+            self._size = sum(entry.stat().st_size for entry in self._scan())
+        return self._size
+
+    def get(self, name: str) -> Optional[bytes]:
+        path = self._path(name)
+        try:
+            data = path.read_bytes()
+            # Bump mtime so eviction sees this file as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, name: str, data: bytes) -> None:
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so other workers never read a partial file
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._size = self.size() + len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete the oldest files until the cache is back under 90% of max"""
+        entries = []
+        for entry in self._scan():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+
+cache = DiskLRU(COVER_CACHE_DIR, COVER_CACHE_MAX_BYTES)
+_pool: Optional[ProcessPoolExecutor] = None
+# One HTTP client per event loop: building a client (and its SSL context)
+# costs far more than fetching a small image over a pooled connection
+_client = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_inflight: Dict[str, asyncio.Future] = {}
+_failures: Dict[str, datetime] = {}
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=COVER_RESIZE_WORKERS)
+    return _pool
+
+
+def _get_client():
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        # Imported here so httpx stays off the startup path
+        import httpx
+
+        _client = httpx.AsyncClient(timeout=COVER_FETCH_TIMEOUT)
+        _client_loop = loop
+    return _client
+
+
+async def shutdown() -> None:
+    """Stop the resize workers and close the HTTP client (called on app shutdown)"""
+    global _pool, _client
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+
+
+def _host_allowed(url: str) -> bool:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return False
+    if "*" in COVER_ALLOWED_HOSTS:
+        return True
+    host = parts.hostname.lower()
+    return any(host == h or host.endswith(f".{h}") for h in COVER_ALLOWED_HOSTS)
+
+
+async def _fetch(url: str) -> bytes:
+    client = _get_client()
+    # Follow redirects by hand so every hop is checked against the allowlist
+    for _ in range(MAX_REDIRECTS + 1):
+        if not _host_allowed(url):
+            raise CoverFetchError(f"host not allowed: {urlsplit(url).hostname}")
+        async with client.stream("GET", url) as response:
+            if response.is_redirect:
+                url = urljoin(url, response.headers["location"])
+                continue
+            response.raise_for_status()
+            # Refuse a declared oversize body up front, and stop reading an
+            # undeclared one as soon as it passes the limit
+            length = response.headers.get("content-length", "")
+            if length.isdigit() and int(length) > MAX_ORIGINAL_BYTES:
+                raise CoverFetchError("image too large")
+            data = bytearray()
+            async for chunk in response.aiter_bytes():
+                data += chunk
+                if len(data) > MAX_ORIGINAL_BYTES:
+                    raise CoverFetchError("image too large")
+        if not _sniff_type(data):
+            raise CoverFetchError("not an image")
+        return bytes(data)
+    raise CoverFetchError("too many redirects")
+
+
+async def _once(key: str, produce: Callable[[], Awaitable[bytes]]) -> bytes:
+    """Run `produce` once per key, however many requests are waiting on it"""
+    if key in _inflight:
+        return await asyncio.shield(_inflight[key])
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        data = await produce()
+    except Exception as e:
+        future.set_exception(e)
+        # Waiters retrieve the exception; don't warn when there are none
+        future.exception()
+        raise
+    else:
+        future.set_result(data)
+        return data
+    finally:
+        if not future.done():
+            future.cancel()
+        del _inflight[key]
+
+
+def _record_failure(url: str) -> None:
+    now = datetime.now()
+    if len(_failures) > 1000:
+        for stale in [u for u, at in _failures.items() if now - at > COVER_FAILURE_TTL]:
+            del _failures[stale]
+    _failures[url] = now
+
+
+async def _original(url: str, name: str) -> bytes:
+    data = await asyncio.to_thread(cache.get, name)
+    if data is not None:
+        return data
+
+    failed_at = _failures.get(url)
+    if failed_at and datetime.now() - failed_at < COVER_FAILURE_TTL:
+        raise CoverFetchError("recently failed")
+
+    async def fetch() -> bytes:
+        try:
+            data = await _fetch(url)
+        except Exception:
+            _record_failure(url)
+            raise
+        _failures.pop(url, None)
+        await asyncio.to_thread(cache.put, name, data)
+        return data
+
+    return await _once(name, fetch)
+
+
+async def get_cover(url: str, size: str) -> Tuple[bytes, str]:
+    """
+    Cover image bytes and content type for a cover URL at one of COVER_SIZES
+    (or "original"). Raises on upstream failure; callers serve a placeholder.
+    """
+    key = hashlib.sha256(url.encode()).hexdigest()
+    original_name = f"{key}-original"
+
+    if size == "original":
+        data = await _original(url, original_name)
+        return data, _sniff_type(data)
+
+    name = f"{key}-{size}.jpg"
+    data = await asyncio.to_thread(cache.get, name)
+    if data is not None:
+        return data, "image/jpeg"
+
+    async def generate() -> bytes:
+        original = await _original(url, original_name)
+        loop = asyncio.get_running_loop()
+        variant = await loop.run_in_executor(
+            get_pool(), resize_cover, original, COVER_SIZES[size]
+        )
+        await asyncio.to_thread(cache.put, name, variant)
+        return variant
+
+    return await _once(name, generate), "image/jpeg"
+
+
+def cover_report() -> dict:
+    return {
+        "cache_dir": str(COVER_CACHE_DIR),
+        "cache_bytes": cache.size() if COVER_CACHE_DIR.exists() else 0,
+        "cache_max_bytes": COVER_CACHE_MAX_BYTES,
+        "recent_failures": sum(
+            datetime.now() - failed_at < COVER_FAILURE_TTL
+            for failed_at in _failures.values()
+        ),
+    }
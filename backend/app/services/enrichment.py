@@ -0,0 +1,212 @@
+"""
+Background metadata enrichment for incomplete books.
+
+Books missing a cover, page count, genres or publication year (NYT imports,
+sparse Open Library editions) are queued in the enrichment_jobs table. Every
+ENRICHMENT_INTERVAL seconds each worker queues newly incomplete books,
+claims a batch of due jobs, looks them up on Google Books (falling back to
+Open Library editions) with at most ENRICHMENT_CONCURRENCY requests in
+flight, and writes whatever was found back in one transaction. Lookups go
+through the shared upstream caches but are not counted as user traffic.
+Lookups that find nothing are retried with backoff before giving up.
+"""
+
+import asyncio
+import os
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from app.crud import enrichment as crud_enrichment
+from app.database import AsyncSessionLocal
+from app.schemas.book import isbn13
+
+ENRICHMENT_ENABLED = os.getenv("ENRICHMENT_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+ENRICHMENT_INTERVAL = int(os.getenv("ENRICHMENT_INTERVAL", "30"))
+ENRICHMENT_BATCH_SIZE = int(os.getenv("ENRICHMENT_BATCH_SIZE", "50"))
+ENRICHMENT_CONCURRENCY = int(os.getenv("ENRICHMENT_CONCURRENCY", "4"))
+# Running jobs older than this belong to a worker that died
+ENRICHMENT_LOCK_TIMEOUT = timedelta(minutes=10)
+# Results requested per lookup; the best match is almost always first
+LOOKUP_RESULTS = 5
+
+
+class EnrichmentStats:
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.batches = 0
+        self.processed = 0
+        self.enriched = 0
+        self.fields_filled = 0
+        self.retried = 0
+        self.busy_seconds = 0.0
+        self.last_batch: Optional[dict] = None
+
+    def snapshot(self) -> dict:
+        return {
+            "batches": self.batches,
+            "processed": self.processed,
+            "enriched": self.enriched,
+            "fields_filled": self.fields_filled,
+            "retried": self.retried,
+            "books_per_second": (
+                round(self.processed / self.busy_seconds, 2)
+                if self.busy_seconds
+                else None
+            ),
+            "uptime_seconds": round(time.monotonic() - self.started),
+            "last_batch": self.last_batch,
+        }
+
+
+stats = EnrichmentStats()
+
+
+def _matches(book: dict, candidate: dict) -> bool:
+    from app.services.google_books import _normalize_title
+
+    return (
+        _normalize_title(candidate.get("title") or "")
+        == _normalize_title(book["title"])
+        and book["author"].lower() in (candidate.get("author") or "").lower()
+    )
+
+
+async def _search(query: str) -> List[dict]:
+    from app.services import google_books
+
+    cached = google_books.get_cached_search(query, LOOKUP_RESULTS)
+    if cached is not None:
+        return cached
+    return await google_books.search_google_books(
+        query, LOOKUP_RESULTS, refresh=True
+    )
+
+
+async def _editions(title: str, author: str, isbn: Optional[str]) -> List[dict]:
+    from app.services import open_library
+
+    cached = open_library.get_cached_editions(title, author)
+    if cached is not None:
+        return cached
+    return await open_library.search_open_library_editions(
+        title, author, refresh=True, isbn=isbn
+    )
+
+
+def _missing_fields(book: dict, found: dict) -> List[str]:
+    return [
+        field
+        for field in crud_enrichment.INCOMPLETE_FIELDS
+        if not book.get(field) and not found.get(field)
+    ]
+
+
+async def lookup(book: dict) -> dict:
+    """Find metadata for a book; returns only the fields it lacks"""
+    found: Dict[str, object] = {}
+
+    def take(candidate: dict) -> None:
+        for field in crud_enrichment.ENRICHABLE_FIELDS:
+            if not book.get(field) and not found.get(field) and candidate.get(field):
+                found[field] = candidate[field]
+
+    if book["isbn"]:
+        for candidate in await _search(f"isbn:{book['isbn']}"):
+            take(candidate)
+            break
+    if _missing_fields(book, found):
+        query = f"intitle:{book['title']} inauthor:{book['author']}"
+        for candidate in await _search(query):
+            if _matches(book, candidate):
+                take(candidate)
+                break
+    if _missing_fields(book, found):
+        editions = await _editions(book["title"], book["author"], book["isbn"])
+        # Prefer the book's own edition, then any with the missing data
+        editions = sorted(
+            editions, key=lambda e: isbn13(e.get("isbn")) != isbn13(book["isbn"])
+        )
+        for edition in editions:
+            take(edition)
+            if not _missing_fields(book, found):
+                break
+    return found
+
+
+async def enrich_batch(limit: int = ENRICHMENT_BATCH_SIZE) -> int:
+    """Claim and enrich one batch of due jobs; returns how many were claimed"""
+    async with AsyncSessionLocal() as db:
+        books = await db.run_sync(crud_enrichment.claim_jobs, limit)
+    if not books:
+        return 0
+
+    started = time.monotonic()
+    semaphore = asyncio.Semaphore(ENRICHMENT_CONCURRENCY)
+
+    async def resolve(book: dict):
+        async with semaphore:
+            try:
+                return book["id"], await lookup(book), None
+            except Exception as e:
+                return book["id"], None, f"{type(e).__name__}: {e}"
+
+    results: Dict[int, dict] = {}
+    errors: Dict[int, str] = {}
+    for book_id, found, error in await asyncio.gather(*map(resolve, books)):
+        if error:
+            errors[book_id] = error
+        elif not found:
+            # Usually an upstream outage or rate limit (the services swallow
+            # HTTP errors and return nothing), so retry with backoff
+            errors[book_id] = "no upstream match"
+        else:
+            results[book_id] = found
+
+    async with AsyncSessionLocal() as db:
+        filled = await db.run_sync(crud_enrichment.complete_jobs, results, errors)
+
+    elapsed = time.monotonic() - started
+    stats.batches += 1
+    stats.processed += len(books)
+    stats.enriched += len(results)
+    stats.fields_filled += filled
+    stats.retried += len(errors)
+    stats.busy_seconds += elapsed
+    stats.last_batch = {
+        "size": len(books),
+        "enriched": len(results),
+        "fields_filled": filled,
+        "seconds": round(elapsed, 3),
+    }
+    return len(books)
+
+
+async def run_enrichment() -> None:
+    """Queue and enrich incomplete books forever; cancelled on shutdown"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.run_sync(
+                    crud_enrichment.release_stale_jobs, ENRICHMENT_LOCK_TIMEOUT
+                )
+                queued = await db.run_sync(crud_enrichment.enqueue_incomplete)
+            if queued:
+                print(f"Enrichment queued {queued} incomplete books")
+            # Drain due jobs batch by batch, then wait for the next sweep
+            while await enrich_batch():
+                pass
+        except Exception as e:
+            print(f"Enrichment error: {e}")
+        await asyncio.sleep(ENRICHMENT_INTERVAL)
+
+
+async def enrichment_report() -> dict:
+    """Throughput counters plus queue depth by status"""
+    async with AsyncSessionLocal() as db:
+        queue = await db.run_sync(crud_enrichment.queue_depth)
+    return {"enabled": ENRICHMENT_ENABLED, "queue": queue, **stats.snapshot()}
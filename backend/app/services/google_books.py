@@ -3,10 +3,8 @@ import httpx
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from app.services import popularity
 
 GOOGLE_BOOKS_API = "https://www.googleapis.com/books/v1/volumes"
 
@@ -32,6 +30,26 @@ def _set_cache(key: str, data: List[dict]):
         print(f"Cached {len(data)} results for: {key}")
 
 
+def _search_cache_key(query: str, max_results: int) -> str:
+    return f"search:{query}:{max_results}"
+
+
+def get_search_cached_at(query: str, max_results: int) -> Optional[datetime]:
+    """When a search was cached (None if not cached or expired)"""
+    entry = _cache.get(_search_cache_key(query, max_results))
+    if entry and datetime.now() - entry[1] < CACHE_DURATION:
+        return entry[1]
+    return None
+
+
+def get_cached_search(query: str, max_results: int) -> Optional[List[dict]]:
+    """Cached results for a search without counting it as a request"""
+    entry = _cache.get(_search_cache_key(query, max_results))
+    if entry and datetime.now() - entry[1] < CACHE_DURATION:
+        return entry[0]
+    return None
+
+
 def _calculate_book_quality_score(book: dict) -> int:
     """Calculate quality score for a book based on available information"""
     score = 0
@@ -303,18 +321,24 @@ def _merge_with_popularity(
     return [book for _, _, _, book in scored_books]
 
 
-async def search_google_books(query: str, max_results: int = 20) -> List[dict]:
+async def search_google_books(
+    query: str, max_results: int = 20, refresh: bool = False
+) -> List[dict]:
     """
     Search Google Books API + Open Library popularity data, then merge results.
     Runs three requests in parallel: Google general, Google inauthor, and
     Open Library sorted by edition count. Uses edition count as a popularity
     signal to rank results so well-known books appear first.
+    refresh=True (used by the cache warmer) skips the cache lookup and
+    popularity tracking, and re-fetches.
     """
     # Check cache first
-    cache_key = f"search:{query}:{max_results}"
-    cached = _get_from_cache(cache_key)
-    if cached is not None:
-        return cached
+    cache_key = _search_cache_key(query, max_results)
+    if not refresh:
+        cached = _get_from_cache(cache_key)
+        popularity.record("search", (query, max_results), hit=cached is not None)
+        if cached is not None:
+            return cached
 
     api_key = os.getenv("GOOGLE_BOOKS_API_KEY")
     if not api_key:
@@ -1,13 +1,10 @@
+import asyncio
 import httpx
 import os
-from typing import List, Optional
-from dotenv import load_dotenv
-from pathlib import Path
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
-# Load .env from backend directory
-env_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(env_path)
+from app.services import popularity
 
 NYT_API_KEY = os.getenv("NYT_API_KEY")
 NYT_BOOKS_API = "https://api.nytimes.com/svc/books/v3"
@@ -15,6 +12,11 @@ NYT_BOOKS_API = "https://api.nytimes.com/svc/books/v3"
 # Simple in-memory cache
 _cache = {}
 CACHE_DURATION = timedelta(hours=1)  # Cache for 1 hour
+# The last overview fetch, {list name: books}, under one timestamp: while
+# it's fresh it holds every current list, and any other name is not one
+_OVERVIEW_CACHE_KEY = "nyt_overview"
+# The overview fetch in progress, shared by every list waiting on it
+_overview_inflight: Optional[asyncio.Future] = None
 
 
 def _get_from_cache(key: str) -> Optional[List[dict]]:
@@ -37,6 +39,34 @@ def _set_cache(key: str, data: List[dict]):
     print(f"Cache SET for: {key}")
 
 
+def _bestsellers_cache_key(list_name: str) -> str:
+    return f"nyt_bestsellers_{list_name}"
+
+
+def _cached_overview() -> Optional[Dict[str, List[dict]]]:
+    """The fresh overview, without logging a cache lookup"""
+    entry = _cache.get(_OVERVIEW_CACHE_KEY)
+    if entry and datetime.now() - entry[1] < CACHE_DURATION:
+        return entry[0]
+    return None
+
+
+def get_bestsellers_cached_at(list_name: str, full: bool = False) -> Optional[datetime]:
+    """
+    When a list's bestsellers were cached (None if not cached, expired or,
+    for the overview, not a current list)
+    """
+    if full:
+        entry = _cache.get(_bestsellers_cache_key(list_name))
+    else:
+        entry = _cache.get(_OVERVIEW_CACHE_KEY)
+        if entry and list_name not in entry[0]:
+            return None
+    if entry and datetime.now() - entry[1] < CACHE_DURATION:
+        return entry[1]
+    return None
+
+
 async def get_bestseller_lists() -> List[dict]:
     """Get available bestseller list names"""
     cache_key = "nyt_lists"
@@ -68,19 +98,67 @@ async def get_bestseller_lists() -> List[dict]:
             return []
 
 
-async def get_bestsellers(
-    list_name: str = "combined-print-and-e-book-fiction",
-) -> List[dict]:
-    """
-    Get current bestsellers from a specific list.
-    Results are cached for 1 hour.
-    """
-    cache_key = f"nyt_bestsellers_{list_name}"
+async def _ingest_overview() -> bool:
+    """Fetch every current list in one call and cache them; False on error"""
+    url = f"{NYT_BOOKS_API}/lists/overview.json"
+    params = {"api-key": NYT_API_KEY}
 
-    # Check cache first
-    cached = _get_from_cache(cache_key)
-    if cached is not None:
-        return cached
+    async with httpx.AsyncClient() as client:
+        try:
+            response = await client.get(url, params=params, timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            print(f"Error fetching NYT bestsellers overview: {e}")
+            return False
+
+    lists = {}
+    for entry in data.get("results", {}).get("lists", []):
+        books = []
+        for book_data in entry.get("books", []):
+            book = transform_nyt_book(book_data)
+            if book:
+                books.append(book)
+        lists[entry["list_name_encoded"]] = books
+    _set_cache(_OVERVIEW_CACHE_KEY, lists)
+    return True
+
+
+async def _load_overview() -> bool:
+    """Run _ingest_overview once, however many lists are waiting on it"""
+    global _overview_inflight
+    if _overview_inflight is not None:
+        return await asyncio.shield(_overview_inflight)
+    future = asyncio.get_running_loop().create_future()
+    _overview_inflight = future
+    try:
+        loaded = await _ingest_overview()
+    except Exception as e:
+        future.set_exception(e)
+        # Waiters retrieve the exception; don't warn when there are none
+        future.exception()
+        raise
+    else:
+        future.set_result(loaded)
+        return loaded
+    finally:
+        if not future.done():
+            future.cancel()
+        _overview_inflight = None
+
+
+async def _get_full_list(list_name: str, refresh: bool) -> List[dict]:
+    """A whole list from lists/current, cached per list"""
+    cache_key = _bestsellers_cache_key(list_name)
+    if not refresh:
+        cached = _get_from_cache(cache_key)
+        if cached is not None:
+            return cached
+
+    overview = _cached_overview()
+    if overview is not None and list_name not in overview:
+        # Not a current list; no need to ask
+        return []
 
     url = f"{NYT_BOOKS_API}/lists/current/{list_name}.json"
     params = {"api-key": NYT_API_KEY}
@@ -90,21 +168,49 @@ async def get_bestsellers(
             response = await client.get(url, params=params, timeout=10.0)
             response.raise_for_status()
             data = response.json()
-
-            books = []
-            for book_data in data.get("results", {}).get("books", []):
-                book = transform_nyt_book(book_data)
-                if book:
-                    books.append(book)
-
-            # Store in cache
-            _set_cache(cache_key, books)
-
-            return books
         except httpx.HTTPError as e:
             print(f"Error fetching NYT bestsellers: {e}")
             return []
 
+    books = []
+    for book_data in data.get("results", {}).get("books", []):
+        book = transform_nyt_book(book_data)
+        if book:
+            books.append(book)
+    _set_cache(cache_key, books)
+    return books
+
+
+async def get_bestsellers(
+    list_name: str = "combined-print-and-e-book-fiction",
+    refresh: bool = False,
+    full: bool = False,
+) -> List[dict]:
+    """
+    Get current bestsellers from a specific list.
+    By default from NYT's overview, which carries every current list (its
+    top books) in one fetch, cached as a whole: any list name is then
+    answered without another upstream call, and names that aren't current
+    lists get [] without taking cache space.
+    full=True gets the whole list from lists/current instead, cached per
+    list. Results are cached for 1 hour.
+    (refresh=True skips the cache lookup and popularity tracking; only
+    overview lookups are tracked)
+    """
+    if full:
+        return await _get_full_list(list_name, refresh)
+
+    # Check cache first
+    if not refresh:
+        overview = _get_from_cache(_OVERVIEW_CACHE_KEY)
+        popularity.record("bestsellers", list_name, hit=overview is not None)
+        if overview is not None:
+            return overview.get(list_name, [])
+
+    if not await _load_overview():
+        return []
+    return _cache[_OVERVIEW_CACHE_KEY][0].get(list_name, [])
+
 
 def transform_nyt_book(book_data: dict) -> Optional[dict]:
     """Transform NYT book data to our format"""
@@ -116,6 +222,12 @@ def transform_nyt_book(book_data: dict) -> Optional[dict]:
             "title": book_data.get("title", "Unknown Title"),
             "author": book_data.get("author", "Unknown Author"),
             "isbn": isbn,
+            # The other editions NYT counts toward this entry
+            "alternate_isbns": [
+                entry.get("isbn13") or entry.get("isbn10")
+                for entry in book_data.get("isbns", [])
+                if entry.get("isbn13") or entry.get("isbn10")
+            ],
             "cover_url": cover_url,
             "description": book_data.get("description"),
             "published_year": None,
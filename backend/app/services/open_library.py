@@ -1,9 +1,21 @@
+import asyncio
 import httpx
-from typing import List, Optional
+import os
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
-OPEN_LIBRARY_API = "https://openlibrary.org"
+from app.crud import open_library_work as crud_work
+from app.database import AsyncSessionLocal
+from app.schemas.book import isbn13
+from app.services import popularity
+
+OPEN_LIBRARY_API = os.getenv("OPEN_LIBRARY_API", "https://openlibrary.org")
 OPEN_LIBRARY_SEARCH = f"{OPEN_LIBRARY_API}/search.json"
+# editions.json pages (Open Library's default size), fetched this many at a
+# time; works with more pages than MAX_EDITION_PAGES list only those
+EDITIONS_PAGE_SIZE = 50
+EDITIONS_CONCURRENCY = int(os.getenv("OPEN_LIBRARY_CONCURRENCY", "4"))
+MAX_EDITION_PAGES = 40
 # Simple in-memory cache
 _cache = {}
 CACHE_DURATION = timedelta(hours=6)
@@ -58,56 +70,145 @@ def _determine_format(edition: dict) -> str:
     return "unknown"
 
 
-async def search_open_library_editions(title: str, author: str) -> List[dict]:
-    """
-    Search Open Library for all editions of a book
-    Returns a list of editions with format information
-    """
-    cache_key = f"ol_editions:{title}:{author}"
-    cached = _get_from_cache(cache_key)
-    if cached is not None:
-        return cached
+def _editions_cache_key(title: str, author: str) -> str:
+    return f"ol_editions:{title}:{author}"
 
-    # First, search for the work
-    params = {"title": title, "author": author, "limit": 1}
 
-    async with httpx.AsyncClient() as client:
-        try:
-            # Search for the work
-            search_response = await client.get(
-                OPEN_LIBRARY_SEARCH, params=params, timeout=10.0
-            )
-            search_response.raise_for_status()
-            search_data = search_response.json()
+def _work_editions_cache_key(work_key: str) -> str:
+    return f"ol_work_editions:{work_key}"
 
-            if not search_data.get("docs"):
-                return []
 
-            # Get the work key
-            work_key = search_data["docs"][0].get("key")
-            if not work_key:
-                return []
+def get_editions_cached_at(title: str, author: str) -> Optional[datetime]:
+    """When a book's editions were cached (None if not cached or expired)"""
+    entry = _cache.get(_editions_cache_key(title, author))
+    if entry and datetime.now() - entry[1] < CACHE_DURATION:
+        return entry[1]
+    return None
+
+
+def get_cached_editions(title: str, author: str) -> Optional[List[dict]]:
+    """Cached editions for a book without counting it as a request"""
+    entry = _cache.get(_editions_cache_key(title, author))
+    if entry and datetime.now() - entry[1] < CACHE_DURATION:
+        return entry[0]
+    return None
 
-            # Fetch all editions for this work
-            editions_url = f"{OPEN_LIBRARY_API}{work_key}/editions.json"
-            editions_response = await client.get(editions_url, timeout=10.0)
-            editions_response.raise_for_status()
-            editions_data = editions_response.json()
 
-            # Transform editions to our format
-            editions = []
-            seen_formats = set()  # Track unique format + page count combinations
+async def _resolve_work_key(
+    client: httpx.AsyncClient, title: str, author: str, isbn: Optional[str]
+) -> Optional[str]:
+    """
+    Find a book's work key: through its edition when it has an ISBN Open
+    Library knows, else the top title/author search match
+    """
+    canonical = isbn13(isbn)
+    if canonical:
+        # Redirects to the edition (/books/OL...M.json), which names its work
+        response = await client.get(
+            f"{OPEN_LIBRARY_API}/isbn/{canonical}.json", timeout=10.0
+        )
+        if response.status_code != 404:
+            response.raise_for_status()
+            works = response.json().get("works") or []
+            if works and works[0].get("key"):
+                return works[0]["key"]
+
+    # Only the key is needed, not the rest of the search document
+    params = {"title": title, "author": author, "limit": 1, "fields": "key"}
+    response = await client.get(OPEN_LIBRARY_SEARCH, params=params, timeout=10.0)
+    response.raise_for_status()
+    docs = response.json().get("docs")
+    return docs[0].get("key") if docs else None
+
+
+async def _fetch_editions(
+    client: httpx.AsyncClient, work_key: str, title: str, author: str
+) -> List[dict]:
+    """
+    All of a work's editions, one per format + page count. The first page
+    gives the total; the rest are fetched EDITIONS_CONCURRENCY at a time
+    and deduplicated as they arrive, keeping the earliest-listed edition of
+    each format + page count (what walking the pages in order would keep)
+    """
+    url = f"{OPEN_LIBRARY_API}{work_key}/editions.json"
+    semaphore = asyncio.Semaphore(EDITIONS_CONCURRENCY)
+
+    async def fetch_page(page: int) -> Tuple[int, dict]:
+        async with semaphore:
+            offset = page * EDITIONS_PAGE_SIZE
+            response = await client.get(
+                url,
+                params={"limit": EDITIONS_PAGE_SIZE, "offset": offset},
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            return page, response.json()
+
+    # format + page count -> ((page, position in page), edition)
+    kept: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+    def add(page: int, data: dict) -> None:
+        for position, entry in enumerate(data.get("entries", [])):
+            edition = transform_open_library_edition(entry, title, author)
+            if edition:
+                format_key = f"{edition['format']}_{edition.get('page_count', 0)}"
+                seen = kept.get(format_key)
+                if seen is None or (page, position) < seen[0]:
+                    kept[format_key] = ((page, position), edition)
+
+    _, first = await fetch_page(0)
+    add(0, first)
+    pages = min(-(-first.get("size", 0) // EDITIONS_PAGE_SIZE), MAX_EDITION_PAGES)
+    tasks = [asyncio.create_task(fetch_page(page)) for page in range(1, pages)]
+    try:
+        for task in asyncio.as_completed(tasks):
+            add(*await task)
+    finally:
+        # One failed page fails the fetch; don't leave the rest running
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return [edition for _, edition in sorted(kept.values(), key=lambda kv: kv[0])]
+
+
+async def search_open_library_editions(
+    title: str, author: str, refresh: bool = False, isbn: Optional[str] = None
+) -> List[dict]:
+    """
+    Search Open Library for all editions of a book
+    Returns a list of editions with format information
+    (refresh=True skips the cache lookup and popularity tracking)
+    The work key is resolved once (by ISBN when given) and then read from
+    the database, so a cache miss goes straight to the work's editions
+    pages; the complete list is also cached per work
+    """
+    cache_key = _editions_cache_key(title, author)
+    if not refresh:
+        cached = _get_from_cache(cache_key)
+        popularity.record("editions", (title, author), hit=cached is not None)
+        if cached is not None:
+            return cached
 
-            for entry in editions_data.get("entries", []):
-                edition = transform_open_library_edition(entry, title, author)
-                if edition:
-                    # Create unique key to avoid duplicates
-                    format_key = f"{edition['format']}_{edition.get('page_count', 0)}"
+    async with AsyncSessionLocal() as db:
+        work_key = await db.run_sync(crud_work.get_work_key, title, author, isbn)
 
-                    # Only add if we haven't seen this format/page count combo
-                    if format_key not in seen_formats:
-                        editions.append(edition)
-                        seen_formats.add(format_key)
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        try:
+            if not work_key:
+                work_key = await _resolve_work_key(client, title, author, isbn)
+                if not work_key:
+                    return []
+                async with AsyncSessionLocal() as db:
+                    await db.run_sync(
+                        crud_work.save_work_key, title, author, work_key, isbn
+                    )
+
+            # Other titles/authors resolving to this work share its editions
+            work_cache_key = _work_editions_cache_key(work_key)
+            editions = None if refresh else _get_from_cache(work_cache_key)
+            if editions is None:
+                editions = await _fetch_editions(client, work_key, title, author)
+                _set_cache(work_cache_key, editions)
 
             # Cache results
             _set_cache(cache_key, editions)
@@ -169,6 +270,8 @@ def transform_open_library_edition(
             "title": entry.get("title", original_title),
             "author": original_author,
             "isbn": isbn,
+            # The edition's other ISBNs (e.g. both forms, or a reissue)
+            "alternate_isbns": isbn_13 + isbn_10,
             "cover_url": cover_url,
             "description": None,  # Open Library editions don't have descriptions
             "published_year": published_year,
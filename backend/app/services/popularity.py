@@ -0,0 +1,122 @@
+"""
+Query popularity tracking for the upstream caches.
+
+Each cache ("search", "editions", "bestsellers") gets a Space-Saving
+heavy-hitters sketch: at most `capacity` counters, so memory stays bounded
+however many distinct queries arrive, and any query seen more than
+1/capacity of the time is guaranteed to be tracked. The cache warmer reads
+the top entries; hit/miss counters give each cache's hit ratio.
+"""
+
+import os
+import sys
+from typing import Dict, Hashable, List, Tuple
+
+SKETCH_CAPACITY = int(os.getenv("POPULARITY_SKETCH_CAPACITY", "200"))
+
+
+class SpaceSaving:
+    """Space-Saving top-k sketch (Metwally et al.)"""
+
+    def __init__(self, capacity: int = SKETCH_CAPACITY) -> None:
+        self.capacity = capacity
+        # key -> [count, error]; count overestimates by at most error
+        self._counters: Dict[Hashable, List[int]] = {}
+
+    def offer(self, key: Hashable) -> None:
+        counter = self._counters.get(key)
+        if counter is not None:
+            counter[0] += 1
+            return
+        if len(self._counters) < self.capacity:
+            self._counters[key] = [1, 0]
+            return
+        # Replace the smallest counter; the newcomer inherits its count as
+        # error. A linear scan is fine at a few hundred counters.
+        victim = min(self._counters, key=lambda k: self._counters[k][0])
+        floor = self._counters.pop(victim)[0]
+        self._counters[key] = [floor + 1, floor]
+
+    def top(self, n: int) -> List[Tuple[Hashable, int, int]]:
+        """The n most frequent keys as (key, count, error), most frequent first"""
+        ranked = sorted(self._counters.items(), key=lambda item: -item[1][0])
+        return [(key, count, error) for key, (count, error) in ranked[:n]]
+
+    def decay(self) -> None:
+        """Halve all counts so old popularity fades; drops emptied counters"""
+        for key in list(self._counters):
+            counter = self._counters[key]
+            counter[0] //= 2
+            counter[1] //= 2
+            if counter[0] == 0:
+                del self._counters[key]
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the sketch (dict, keys and counters)"""
+        size = sys.getsizeof(self._counters)
+        for key, counter in self._counters.items():
+            size += sys.getsizeof(counter) + sum(sys.getsizeof(c) for c in counter)
+            if isinstance(key, tuple):
+                size += sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+            else:
+                size += sys.getsizeof(key)
+        return size
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+class CacheStats:
+    def __init__(self) -> None:
+        self.sketch = SpaceSaving()
+        self.hits = 0
+        self.misses = 0
+        self.warmed = 0
+
+    def snapshot(self, top: int = 10) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / requests, 4) if requests else None,
+            "warmed": self.warmed,
+            "tracked_queries": len(self.sketch),
+            "sketch_capacity": self.sketch.capacity,
+            "sketch_memory_bytes": self.sketch.memory_bytes(),
+            "top": [
+                {"query": list(key) if isinstance(key, tuple) else key, "count": count}
+                for key, count, _ in self.sketch.top(top)
+            ],
+        }
+
+
+_stats: Dict[str, CacheStats] = {}
+
+
+def stats_for(cache: str) -> CacheStats:
+    if cache not in _stats:
+        _stats[cache] = CacheStats()
+    return _stats[cache]
+
+
+def record(cache: str, key: Hashable, hit: bool) -> None:
+    """Count one request for `key` against `cache`"""
+    stats = stats_for(cache)
+    stats.sketch.offer(key)
+    if hit:
+        stats.hits += 1
+    else:
+        stats.misses += 1
+
+
+def top_queries(cache: str, n: int) -> List[Hashable]:
+    return [key for key, _, _ in stats_for(cache).sketch.top(n)]
+
+
+def decay_all() -> None:
+    for stats in _stats.values():
+        stats.sketch.decay()
+
+
+def popularity_report(top: int = 10) -> Dict[str, dict]:
+    return {cache: stats.snapshot(top) for cache, stats in _stats.items()}
@@ -0,0 +1,35 @@
+"""
+Periodic compaction of the reading progress log.
+
+Every READING_ROLLUP_INTERVAL seconds, events from days that have ended
+(UTC) are folded into the reading_days table and deleted (see
+app.crud.progress.rollup). Every worker runs the loop; the rollup takes
+a lock per batch, so only one of them compacts at a time and the others
+skip that round.
+"""
+
+import asyncio
+import os
+
+from app.crud import progress_async as crud_progress
+from app.database import AsyncSessionLocal
+
+READING_ROLLUP_ENABLED = os.getenv("READING_ROLLUP_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+READING_ROLLUP_INTERVAL = int(os.getenv("READING_ROLLUP_INTERVAL", "3600"))
+
+
+async def run_rollup() -> None:
+    """Compact finished days forever; cancelled on shutdown"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                compacted = await crud_progress.rollup(db)
+            if compacted:
+                print(f"Rolled up {compacted} reading events")
+        except Exception as e:
+            print(f"Reading rollup error: {e}")
+        await asyncio.sleep(READING_ROLLUP_INTERVAL)
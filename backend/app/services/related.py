@@ -0,0 +1,125 @@
+"""
+Background upkeep of the "readers also listed" table.
+
+Every RELATED_INTERVAL seconds, books queued by public list writes get
+their recommendations recomputed (see app.crud.related.refresh). On an
+empty table, e.g. right after the migration, the whole table is built
+first. A full rebuild also runs every RELATED_REBUILD_INTERVAL seconds to
+pick up popularity drift the incremental refresh leaves behind. Scoring is
+CPU-bound Python, so it runs in a thread with its own session rather than
+on the event loop. Every worker runs the loop, but each round only does
+the work on the worker holding a lock (a PostgreSQL advisory lock, or a
+file lock beside a SQLite database); the others skip it.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from app.crud import related as crud_related
+from app.database import SessionLocal, engine
+
+RELATED_ENABLED = os.getenv("RELATED_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+RELATED_INTERVAL = int(os.getenv("RELATED_INTERVAL", "60"))
+RELATED_REBUILD_INTERVAL = int(os.getenv("RELATED_REBUILD_INTERVAL", "86400"))
+# Arbitrary application-wide key for pg_try_advisory_lock
+RELATED_LOCK_KEY = 7_214_003_119
+
+
+@contextmanager
+def _postgres_lock():
+    # Session-level, on a connection of its own: the work commits many times
+    with engine.connect() as connection:
+        held = connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": RELATED_LOCK_KEY}
+        ).scalar()
+        connection.commit()
+        try:
+            yield held
+        finally:
+            if held:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": RELATED_LOCK_KEY}
+                )
+                connection.commit()
+
+
+@contextmanager
+def _file_lock(database: str):
+    import fcntl
+
+    with open(f"{database}.related.lock", "a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            held = False
+        else:
+            held = True
+        try:
+            yield held
+        finally:
+            if held:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _single_worker():
+    """Yields whether this worker may update the table now (never waits)"""
+    database = engine.url.database
+    if engine.dialect.name == "postgresql":
+        with _postgres_lock() as held:
+            yield held
+    elif database in (None, "", ":memory:") or os.name == "nt":
+        # One process, or no flock (Windows): nothing to share with
+        yield True
+    else:
+        with _file_lock(database) as held:
+            yield held
+
+
+def update_related(full: bool) -> bool:
+    """
+    Rebuild if asked (or the table is empty), else drain the refresh queue.
+    False if another worker is updating the table.
+    """
+    with _single_worker() as held:
+        if held:
+            _update_related(full)
+        return held
+
+
+def _update_related(full: bool) -> None:
+    db = SessionLocal()
+    try:
+        if full or crud_related.needs_rebuild(db):
+            summary = crud_related.rebuild(db)
+            print(f"Rebuilt related books: {summary}")
+            return
+        # One transaction per batch
+        refreshed = crud_related.refresh(db)
+        while refreshed:
+            print(f"Refreshed related books for {refreshed} books")
+            refreshed = crud_related.refresh(db)
+    finally:
+        db.close()
+
+
+async def run_related() -> None:
+    """Keep recommendations fresh forever; cancelled on shutdown"""
+    rebuilt_at = time.monotonic()
+    while True:
+        try:
+            full = time.monotonic() - rebuilt_at > RELATED_REBUILD_INTERVAL
+            await asyncio.to_thread(update_related, full)
+            if full:
+                rebuilt_at = time.monotonic()
+        except Exception as e:
+            print(f"Related books error: {e}")
+        await asyncio.sleep(RELATED_INTERVAL)
@@ -0,0 +1,73 @@
+"""
+One-time startup initialization that is safe with many workers.
+
+Every worker runs the lifespan hook, so seeding is serialized with a
+PostgreSQL advisory lock or, on SQLite, an exclusive lock file next to the
+database. The first worker seeds; the rest wait briefly, then find
+everything in place with a single read.
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.crud import book_list as crud_list
+from app.crud import stats as crud_stats
+from app.database import SQLALCHEMY_DATABASE_URL, SessionLocal
+
+# Arbitrary application-wide key for pg_advisory_xact_lock
+STARTUP_LOCK_KEY = 7_214_003_117
+
+_database = make_url(SQLALCHEMY_DATABASE_URL).database
+
+
+@contextmanager
+def _lock_file():
+    """Exclusive flock on <database>.init.lock (no-op where unsupported)"""
+    try:
+        import fcntl
+    except ImportError:
+        # Windows: rely on the unique index + ON CONFLICT seeding alone
+        yield
+        return
+
+    with open(f"{_database}.init.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _seed(db, lock=lambda: None) -> None:
+    lock()
+    crud_list.create_default_lists(db)
+    # create_default_lists commits, which ends a transaction-scoped lock
+    lock()
+    # First start after the reading_stats table was added: fill it once
+    if crud_stats.needs_bootstrap(db):
+        crud_stats.rebuild(db)
+    db.commit()
+
+
+def initialize() -> None:
+    """Seed the default lists (and reading stats) once, whatever the number of workers"""
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            # Each lock is held until the transaction after it commits
+            _seed(
+                db,
+                lambda: db.execute(
+                    text("SELECT pg_advisory_xact_lock(:key)"),
+                    {"key": STARTUP_LOCK_KEY},
+                ),
+            )
+        elif _database not in (None, "", ":memory:"):
+            with _lock_file():
+                _seed(db)
+        else:
+            _seed(db)
+    finally:
+        db.close()
@@ -0,0 +1,142 @@
+"""Load test: sync (thread pool) vs async (AsyncSession) request handlers.
+
+Serves the same crud calls two ways from one uvicorn process:
+    /sync/lists/{id}   def handler + SessionLocal (AnyIO thread pool)
+    /async/lists/{id}  async def handler + AsyncSession (aiosqlite/asyncpg)
+then fires concurrent GETs at each and reports throughput and latency.
+
+Usage:
+    cd backend && python benchmarks/bench_async_db.py [--requests 1000] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+import httpx  # noqa: E402
+
+PORT = 8765
+
+
+def _serve():
+    import uvicorn
+    from fastapi import Depends, FastAPI
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+
+    from app.crud import book_list as crud_list
+    from app.crud import book_list_async as crud_list_async
+    from app.database import get_async_db, get_db
+    from app.serialization import FastJSONResponse, book_list_to_dict
+
+    app = FastAPI()
+
+    @app.get("/sync/lists/{list_id}")
+    def sync_list(list_id: int, db: Session = Depends(get_db)):
+        return FastJSONResponse(book_list_to_dict(crud_list.get_book_list(db, list_id)))
+
+    @app.get("/async/lists/{list_id}")
+    async def async_list(list_id: int, db: AsyncSession = Depends(get_async_db)):
+        book_list = await crud_list_async.get_book_list(db, list_id)
+        return FastJSONResponse(book_list_to_dict(book_list))
+
+    uvicorn.run(app, port=PORT, log_level="warning")
+
+
+def seed(n_items: int) -> int:
+    from app.database import Base, SessionLocal, engine
+    from app.models.book import Book
+    from app.models.book_list import BookList, BookListItem
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    book_list = BookList(name="Load test", is_default=0)
+    db.add(book_list)
+    db.flush()
+    for i in range(n_items):
+        book = Book(title=f"Book {i}", author=f"Author {i}", description="x" * 400)
+        db.add(book)
+        db.flush()
+        db.add(BookListItem(book_list_id=book_list.id, book_id=book.id))
+    db.commit()
+    list_id = book_list.id
+    db.close()
+    return list_id
+
+
+async def load(path: str, total: int, concurrency: int):
+    latencies = []
+    errors = 0
+    queue = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        for _ in queue:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=60
+    ) as client:
+        await client.get(path)  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"  {path:<22} {len(latencies) / elapsed:8.1f} req/s   "
+        f"p50 {statistics.median(latencies):7.1f} ms   p95 {p95:7.1f} ms   "
+        f"errors {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--items", type=int, default=25)
+    args = parser.parse_args()
+
+    list_id = seed(args.items)
+    server = multiprocessing.Process(target=_serve, daemon=True)
+    server.start()
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/docs")
+            break
+        except httpx.TransportError:
+            time.sleep(0.1)
+
+    print(
+        f"{args.requests} GETs of a {args.items}-item list, "
+        f"concurrency {args.concurrency}:"
+    )
+    try:
+        for kind in ("sync", "async"):
+            asyncio.run(
+                load(f"/{kind}/lists/{list_id}", args.requests, args.concurrency)
+            )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Cover proxy benchmark against a local image-serving stub.
+
+Starts a stub upstream on 127.0.0.1 that serves generated 800x1200 JPEG
+covers after --latency ms (and 500s for /broken), points --books books at
+it, then measures GET /covers/{id} cold (fetch + resize), warm (disk hit),
+revalidated (304), a burst of concurrent requests for one uncached cover
+(should cost one upstream fetch), and the placeholder fallback.
+
+Usage:
+    cd backend && python benchmarks/bench_covers.py [--books 50] [--latency 200]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+upstream_hits = 0
+
+
+def make_cover() -> bytes:
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (800, 1200), (40, 70, 120))
+    draw = ImageDraw.Draw(image)
+    for y in range(0, 1200, 40):
+        draw.rectangle((0, y, 800, y + 20), fill=(200, 160, 60))
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=92)
+    return out.getvalue()
+
+
+def start_stub(latency: float) -> str:
+    cover = make_cover()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            global upstream_hits
+            upstream_hits += 1
+            time.sleep(latency)
+            if self.path.startswith("/broken"):
+                self.send_response(500)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(cover)))
+            self.end_headers()
+            self.wfile.write(cover)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"stub upstream: {len(cover) / 1024:.0f} KB covers, {latency * 1000:.0f} ms latency")
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def timed(client, path, **kwargs):
+    started = time.perf_counter()
+    response = client.get(path, **kwargs)
+    return (time.perf_counter() - started) * 1000, response
+
+
+def report(label, samples):
+    print(
+        f"  {label:<28} p50 {statistics.median(samples):7.1f} ms  "
+        f"max {max(samples):7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=50)
+    parser.add_argument("--latency", type=int, default=200, help="stub latency (ms)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ["COVER_CACHE_DIR"] = f"{workdir}/covers"
+    os.environ["COVER_ALLOWED_HOSTS"] = "127.0.0.1"
+    os.environ.setdefault("CACHE_WARM_ENABLED", "false")
+    os.environ.setdefault("ENRICHMENT_ENABLED", "false")
+    sys.path.insert(0, BACKEND_DIR)
+    from fastapi.testclient import TestClient
+
+    from app.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    upstream = start_stub(args.latency / 1000)
+
+    with TestClient(app) as client:
+        ids = []
+        for i in range(args.books + 1):
+            book = client.post(
+                "/books/",
+                json={
+                    "title": f"Cover Book {i}",
+                    "author": "Bench",
+                    "cover_url": f"{upstream}/covers/{i}.jpg",
+                },
+            ).json()
+            ids.append(book["id"])
+        burst_id = ids.pop()
+        broken = client.post(
+            "/books/",
+            json={"title": "Broken", "author": "Bench", "cover_url": f"{upstream}/broken"},
+        ).json()["id"]
+
+        cold, warm, revalidated, sizes = [], [], [], {}
+        for book_id in ids:
+            ms, response = timed(client, f"/covers/{book_id}", params={"size": "small"})
+            cold.append(ms)
+            sizes["small"] = len(response.content)
+        for book_id in ids:
+            ms, response = timed(client, f"/covers/{book_id}", params={"size": "small"})
+            warm.append(ms)
+            etag = response.headers["etag"]
+            ms, response = timed(
+                client,
+                f"/covers/{book_id}",
+                params={"size": "small"},
+                headers={"If-None-Match": etag},
+            )
+            assert response.status_code == 304
+            revalidated.append(ms)
+        for size in ("medium", "large", "original"):
+            sizes[size] = len(
+                client.get(f"/covers/{ids[0]}", params={"size": size}).content
+            )
+
+        report("cold (fetch + resize)", cold)
+        report("warm (disk cache)", warm)
+        report("revalidated (304)", revalidated)
+        print(
+            "  bytes: "
+            + ", ".join(f"{size} {count / 1024:.1f} KB" for size, count in sizes.items())
+        )
+
+        hits_before = upstream_hits
+        with ThreadPoolExecutor(20) as pool:
+            statuses = list(
+                pool.map(
+                    lambda _: client.get(f"/covers/{burst_id}").status_code, range(20)
+                )
+            )
+        print(
+            f"  20 concurrent cold requests: statuses {sorted(set(statuses))}, "
+            f"{upstream_hits - hits_before} upstream fetch(es)"
+        )
+
+        for label in ("placeholder (upstream 500)", "placeholder (failure cached)"):
+            ms, response = timed(client, f"/covers/{broken}")
+            print(
+                f"  {label:<28} {ms:7.1f} ms  {response.headers['content-type']}, "
+                f"{response.headers['cache-control']}"
+            )
+        print(f"  {client.get('/health/covers').json()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Duplicate book detection and merge benchmark.
+
+Generates libraries of --books books at 1/4, 1/2 and full size, a tenth
+of them duplicates of another book in one of the forms the job targets
+(ISBN-10 of an ISBN-13 book, NULL ISBN, "The"/subtitle/author-order
+variants, inserted as rows from before the canonical isbn13 column), each
+book on a list or two. Times the dry run and the merge
+at each size, so the growth with table size shows, and checks that
+every planted duplicate was found.
+
+Usage:
+    cd backend && python benchmarks/bench_dedupe.py [--books 200000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOAD_BATCH_SIZE = 50000
+DUPLICATE_SHARE = 0.1
+
+
+def isbn10(index: int) -> str:
+    body = f"{index:09d}"
+    check = sum((10 - i) * int(d) for i, d in enumerate(body)) % 11
+    return body + ("X" if check == 1 else str((11 - check) % 11))
+
+
+def variant(book: dict, rng: random.Random) -> dict:
+    from app.schemas.book import isbn13
+
+    kind = rng.randrange(4)
+    # Rows from before the canonical isbn13 column (which now refuses them)
+    duplicate = dict(book, isbn=None, isbn13=None)
+    if kind == 0 and book["isbn"]:
+        # The same edition under its ISBN-10 (the original holds the 13)
+        duplicate["isbn"] = book["alternate"]
+    elif kind == 1:
+        duplicate["title"] = "The " + book["title"]
+    elif kind == 2:
+        duplicate["title"] = book["title"] + ": A Novel"
+    else:
+        first, last = book["author"].split(" ")
+        duplicate["author"] = f"{last}, {first}"
+    assert duplicate["isbn"] is None or isbn13(duplicate["isbn"]) == book["isbn"]
+    return duplicate
+
+
+def run(size: int, seed: int) -> None:
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    # Fresh engine per size: drop the app modules bound to the last database
+    for name in [name for name in sys.modules if name.startswith("app")]:
+        del sys.modules[name]
+    from sqlalchemy import func, insert
+
+    from app.crud import dedupe as crud_dedupe
+    from app.crud.book_list import create_default_lists
+    from app.database import Base, SessionLocal, engine
+    from app.models.book import Book
+    from app.models.book_list import BookList, BookListItem
+    from app.schemas.book import isbn13
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(5000)]
+    originals = []
+    for i in range(int(size * (1 - DUPLICATE_SHARE))):
+        alternate = isbn10(i) if i % 2 else None
+        originals.append(
+            {
+                "title": " ".join(rng.choices(words, k=3)).title(),
+                "author": f"First{rng.randrange(2000)} Last{rng.randrange(2000)}",
+                "isbn": isbn13(alternate),
+                "isbn13": isbn13(alternate),
+                "alternate": alternate,
+            }
+        )
+    duplicates = [
+        variant(book, rng)
+        for book in rng.sample(originals, size - len(originals))
+    ]
+    rows = [
+        {key: book[key] for key in ("title", "author", "isbn", "isbn13")}
+        for book in originals + duplicates
+    ]
+    rng.shuffle(rows)
+
+    db = SessionLocal()
+    create_default_lists(db)
+    for start in range(0, len(rows), LOAD_BATCH_SIZE):
+        # Core insert: the ORM would replace isbn13=None with its default
+        db.execute(insert(Book.__table__), rows[start : start + LOAD_BATCH_SIZE])
+    lists = [list_id for (list_id,) in db.query(BookList.id)]
+    items = [
+        {"book_list_id": list_id, "book_id": book_id}
+        for book_id in range(1, size + 1)
+        for list_id in rng.sample(lists, rng.randint(1, 2))
+    ]
+    for start in range(0, len(items), LOAD_BATCH_SIZE):
+        db.execute(insert(BookListItem), items[start : start + LOAD_BATCH_SIZE])
+    db.execute(
+        BookList.__table__.update().values(
+            item_count=BookListItem.__table__.select()
+            .with_only_columns(func.count())
+            .where(BookListItem.book_list_id == BookList.id)
+            .scalar_subquery()
+        )
+    )
+    db.commit()
+
+    started = time.perf_counter()
+    report = crud_dedupe.find_duplicates(db)
+    found = sum(len(group["merge"]) for group in report["groups"])
+    dry_run = time.perf_counter() - started
+    started = time.perf_counter()
+    merged = crud_dedupe.merge_duplicates(db, report["groups"])["merged"]
+    merge = time.perf_counter() - started
+    remaining = db.query(func.count(Book.id)).scalar()
+    print(
+        f"  {size:>9,} books: dry run {dry_run:6.2f}s "
+        f"({report['candidates']:,} candidates, {found:,}/{len(duplicates):,} "
+        f"planted duplicates found), merge {merge:6.2f}s "
+        f"({merged:,} merged, {remaining:,} books left)"
+    )
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=200000)
+    args = parser.parse_args()
+
+    for flag in (
+        "CACHE_WARM_ENABLED",
+        "ENRICHMENT_ENABLED",
+        "PLACEHOLDERS_ENABLED",
+        "READING_ROLLUP_ENABLED",
+        "RELATED_ENABLED",
+    ):
+        os.environ.setdefault(flag, "false")
+    sys.path.insert(0, BACKEND_DIR)
+    for divisor in (4, 2, 1):
+        run(args.books // divisor, seed=divisor)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Open Library editions fetch benchmark against a local stub.
+
+Serves editions.json for works with --editions editions each from a
+local HTTP server that answers every request after --latency ms, like a
+distant upstream. With each work's key already stored, times a cold fetch
+of its complete edition list at a few concurrency limits, checks that
+every limit returns the same list, and times a second title resolving to
+the already-cached work.
+
+Usage:
+    cd backend && python benchmarks/bench_editions.py [--editions 50 500 2000] [--latency 150]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORMATS = ["Hardcover", "Paperback", "Mass Market Paperback", "Audio CD", "ebook"]
+
+
+def stub_handler(latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        requests = 0
+
+        def do_GET(self):
+            Handler.requests += 1
+            time.sleep(latency)
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            # /works/OL<editions>W/editions.json
+            size = int(url.path.split("/")[2][2:-1])
+            offset, limit = int(query.get("offset", 0)), int(query["limit"])
+            body = {
+                "size": size,
+                "entries": [
+                    {
+                        "title": f"Edition {i}",
+                        "physical_format": FORMATS[i % len(FORMATS)],
+                        # Some format + page count repeats, as reprints do
+                        "number_of_pages": 200 + (i * 7) % 300,
+                        "isbn_13": [f"978{i:010d}"],
+                    }
+                    for i in range(offset, min(offset + limit, size))
+                ],
+            }
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+async def run(sizes, limits):
+    from app.crud import open_library_work as crud_work
+    from app.database import SessionLocal, async_engine
+    from app.services import open_library
+
+    for size in sizes:
+        title, author = f"Work {size}", "Stub Author"
+        db = SessionLocal()
+        for spelling in (title, title.upper()):
+            crud_work.save_work_key(db, spelling, author, f"/works/OL{size}W")
+        db.close()
+        results = {}
+        for limit in limits:
+            open_library.EDITIONS_CONCURRENCY = limit
+            open_library._cache.clear()
+            started = time.perf_counter()
+            results[limit] = await open_library.search_open_library_editions(
+                title, author, refresh=True
+            )
+            elapsed = (time.perf_counter() - started) * 1000
+            print(
+                f"  {size:>5} editions, concurrency {limit}: {elapsed:7.0f} ms "
+                f"({len(results[limit])} distinct format + page counts)"
+            )
+        assert all(editions == results[limits[0]] for editions in results.values())
+
+        # Another spelling of the book, resolved to the same work
+        started = time.perf_counter()
+        await open_library.search_open_library_editions(title.upper(), author)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"  {size:>5} editions, same work under another title: {elapsed:.1f} ms")
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--editions", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--latency", type=float, default=150, help="ms per request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), stub_handler(args.latency / 1000))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ["OPEN_LIBRARY_API"] = f"http://127.0.0.1:{server.server_port}"
+    for flag in (
+        "CACHE_WARM_ENABLED",
+        "ENRICHMENT_ENABLED",
+        "PLACEHOLDERS_ENABLED",
+        "READING_ROLLUP_ENABLED",
+        "RELATED_ENABLED",
+    ):
+        os.environ.setdefault(flag, "false")
+    sys.path.insert(0, BACKEND_DIR)
+    import app.models  # noqa: F401
+    from app.database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    print(f"Stub upstream answering after {args.latency:.0f} ms per request")
+    asyncio.run(run(args.editions, args.concurrency))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Cold-start profile of the API: import time of app.main plus startup.
+
+Runs a fresh interpreter per sample (so nothing is cached in-process) and
+reports the median time to import app.main and to finish the lifespan
+startup (default-list bootstrap), then the slowest modules from one
+`python -X importtime` run, by cumulative and by self time.
+
+Usage:
+    cd backend && python benchmarks/bench_import_time.py [--runs 5] [--top 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def startup():
+    async with app.main.lifespan(app.main.app):
+        pass
+
+asyncio.run(startup())
+started = time.perf_counter()
+print(json.dumps({"import": imported - start, "startup": started - imported}))
+"""
+
+
+def prepare_database() -> dict:
+    """Temporary SQLite database with the schema already in place"""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import app.models; from app.database import Base, engine; "
+            "Base.metadata.create_all(engine)",
+        ],
+        env=env,
+        cwd=BACKEND_DIR,
+        check=True,
+    )
+    return env
+
+
+def parse_importtime(stderr: str):
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    env = prepare_database()
+
+    samples = []
+    for _ in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD],
+            env=env,
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    import_ms = statistics.median(s["import"] for s in samples) * 1000
+    startup_ms = statistics.median(s["startup"] for s in samples) * 1000
+    print(f"median over {args.runs} cold starts:")
+    print(f"  import app.main  {import_ms:8.1f} ms")
+    print(f"  lifespan startup {startup_ms:8.1f} ms")
+
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env,
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = parse_importtime(out.stderr)
+
+    print(f"\nslowest modules by cumulative time (ms):")
+    for name, _, cumulative in sorted(rows, key=lambda r: -r[2])[: args.top]:
+        print(f"  {cumulative / 1000:8.1f}  {name}")
+
+    print(f"\nslowest modules by self time (ms):")
+    for name, self_us, _ in sorted(rows, key=lambda r: -r[1])[: args.top]:
+        print(f"  {self_us / 1000:8.1f}  {name}")
+
+    loaded = {name for name, _, _ in rows}
+    lazy = ["httpx", "app.services.google_books", "sqlalchemy.dialects.postgresql"]
+    print("\nkept off the startup path:")
+    for name in lazy:
+        print(f"  {name:<32} {'IMPORTED' if name in loaded else 'not imported'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Public list search benchmark on a generated community dataset.
+
+Builds --books books (titles drawn from a word list so some words are
+common and others rare), --lists lists (a third public) holding ~--items
+items, then times GET /search/lists for several queries. For comparison
+it also times the previous implementation (ilike '%q%' join, one row per
+matching book) inline.
+
+Usage:
+    cd backend && python benchmarks/bench_list_search.py [--books 100000] [--lists 10000] [--items 500000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOAD_BATCH_SIZE = 50000
+
+# Common words, an author, phrases; a rare word and a miss are added at run time
+QUERIES = ["shadow", "zephyr", "author 17", "the garden", "river of"]
+
+
+def words(count: int):
+    rng = random.Random(7)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = {
+        "".join(rng.choice(letters) for _ in range(rng.randint(4, 9)))
+        for _ in range(count)
+    }
+    return ["the", "of", "shadow", "river", "garden", "zephyr"] + sorted(vocabulary)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--lists", type=int, default=10000)
+    parser.add_argument("--items", type=int, default=500000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    for flag in (
+        "CACHE_WARM_ENABLED",
+        "ENRICHMENT_ENABLED",
+        "PLACEHOLDERS_ENABLED",
+        "READING_ROLLUP_ENABLED",
+    ):
+        os.environ.setdefault(flag, "false")
+    sys.path.insert(0, BACKEND_DIR)
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert
+
+    from app.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.models.book import Book
+    from app.models.book_list import BookList, BookListItem
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    vocabulary = words(3000)
+    # Zipf-like: low-index words are far more common
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    for start in range(0, args.books, LOAD_BATCH_SIZE):
+        db.execute(
+            insert(Book),
+            [
+                {
+                    "title": " ".join(
+                        rng.choices(vocabulary, weights, k=rng.randint(2, 5))
+                    ).title(),
+                    "author": f"Author {rng.randint(1, 5000)}",
+                }
+                for _ in range(start, min(start + LOAD_BATCH_SIZE, args.books))
+            ],
+        )
+    db.execute(
+        insert(BookList),
+        [
+            {"name": f"List {i}", "is_public": 1 if i % 3 == 0 else 0}
+            for i in range(args.lists)
+        ],
+    )
+    pairs = {
+        (rng.randint(1, args.lists), rng.randint(1, args.books))
+        for _ in range(args.items)
+    }
+    rows = [{"book_list_id": l, "book_id": b} for l, b in pairs]
+    for start in range(0, len(rows), LOAD_BATCH_SIZE):
+        db.execute(insert(BookListItem), rows[start : start + LOAD_BATCH_SIZE])
+    db.commit()
+    print(
+        f"{args.books:,} books, {args.lists:,} lists, {len(rows):,} items "
+        f"(loaded in {time.perf_counter() - started:.1f}s)"
+    )
+
+    def old_search(query, skip=0, limit=50):
+        term = f"%{query}%"
+        return (
+            db.query(BookList, Book)
+            .join(BookListItem, BookList.id == BookListItem.book_list_id)
+            .join(Book, BookListItem.book_id == Book.id)
+            .filter(
+                BookList.is_public == 1,
+                Book.title.ilike(term) | Book.author.ilike(term),
+            )
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def timed(fn, repeat=5):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = fn()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples), result
+
+    with TestClient(app) as client:
+        print(f"  {'query':<12} {'old (rows/page)':>26} {'new (lists/page, total)':>32}")
+        for query in QUERIES + [vocabulary[-1], "qqqzzx"]:
+            old_ms, old_rows = timed(lambda: old_search(query))
+            old_lists = len({book_list.id for book_list, _ in old_rows})
+            new_ms, response = timed(
+                lambda: client.get("/search/lists", params={"q": query}).json()
+            )
+            print(
+                f"  {query:<12} {old_ms:8.1f} ms ({len(old_rows)} rows, "
+                f"{old_lists} lists)   {new_ms:8.1f} ms "
+                f"({response['count']} lists of {response['total']})"
+            )
+        deep_ms, _ = timed(
+            lambda: client.get(
+                "/search/lists", params={"q": "shadow", "skip": 1000}
+            ).json()
+        )
+        print(f"  'shadow' page at skip=1000: {deep_ms:.1f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
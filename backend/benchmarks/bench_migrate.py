@@ -0,0 +1,154 @@
+"""Benchmark the streaming SQLite -> PostgreSQL migrator on synthetic data.
+
+Builds a synthetic library in a temporary SQLite database (--books books,
+--items list items spread over --lists lists), then migrates it with
+migrate_data.migrate() to --target (default: DATABASE_URL; without one, a
+second temporary SQLite database). The target must already have the
+schema (`alembic upgrade head`); temporary SQLite targets get it here.
+
+With --interrupt-after N the first run is aborted after N book rows and
+resumed, to show the checkpointed restart. Reports rows/s, wall time and
+peak memory.
+
+Usage:
+    cd backend && DATABASE_URL=postgresql://... \\
+        python benchmarks/bench_migrate.py [--books 2000000] [--items 2000000]
+"""
+
+import argparse
+import os
+import random
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+class Interrupted(Exception):
+    pass
+
+
+def build_source(path: str, books: int, lists: int, items: int) -> None:
+    from sqlalchemy import create_engine
+
+    import app.models  # noqa: F401  (registers the tables)
+    from app.database import Base
+
+    Base.metadata.create_all(create_engine(f"sqlite:///{path}"))
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    batch = 50_000
+    for start in range(0, books, batch):
+        conn.executemany(
+            "INSERT INTO books (id, title, author, isbn, description, "
+            "published_year, page_count, genres) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    i + 1,
+                    f"Synthetic Book {i}",
+                    f"Author {i % 5000}",
+                    f"{9780000000000 + i}",
+                    "A synthetic description\twith a tab and a\nnewline. " * 3,
+                    1900 + i % 125,
+                    100 + i % 900,
+                    "Fiction,Fantasy",
+                )
+                for i in range(start, min(start + batch, books))
+            ),
+        )
+    conn.executemany(
+        "INSERT INTO book_lists (id, name, is_default, is_public, created_at) "
+        "VALUES (?, ?, 0, ?, '2024-01-01 12:00:00')",
+        ((i + 1, f"List {i}", i % 2) for i in range(lists)),
+    )
+    for start in range(0, items, batch):
+        conn.executemany(
+            "INSERT INTO book_list_items (id, book_list_id, book_id, status, "
+            "is_favorite, current_page, added_at) "
+            "VALUES (?, ?, ?, 'TO_READ', 0, 0, '2024-01-01 12:00:00')",
+            (
+                (i + 1, random.randint(1, lists), random.randint(1, books))
+                for i in range(start, min(start + batch, items))
+            ),
+        )
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=2_000_000)
+    parser.add_argument("--lists", type=int, default=1_000)
+    parser.add_argument("--items", type=int, default=2_000_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--interrupt-after", type=int, default=0)
+    parser.add_argument("--target", default=os.getenv("DATABASE_URL"))
+    args = parser.parse_args()
+
+    from migrate_data import migrate
+
+    workdir = tempfile.mkdtemp()
+    source = os.path.join(workdir, "source.db")
+    started = time.perf_counter()
+    build_source(source, args.books, args.lists, args.items)
+    print(
+        f"built {args.books:,} books + {args.items:,} items in "
+        f"{time.perf_counter() - started:.1f}s"
+    )
+
+    target = args.target
+    if not target:
+        target = f"sqlite:///{os.path.join(workdir, 'target.db')}"
+        build_source(os.path.join(workdir, "target.db"), 0, 0, 0)
+        print("no --target/DATABASE_URL; migrating into a temporary SQLite database")
+
+    quiet = lambda *progress: None  # noqa: E731
+    total_rows = args.books + args.lists + args.items
+
+    if args.interrupt_after:
+
+        def interrupting(table_name, copied, total, rate):
+            if table_name == "books" and copied >= args.interrupt_after:
+                raise Interrupted()
+
+        started = time.perf_counter()
+        try:
+            migrate(
+                f"sqlite:///{source}",
+                target,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                progress=interrupting,
+            )
+        except Interrupted:
+            print(
+                f"interrupted after {args.interrupt_after:,} books "
+                f"({time.perf_counter() - started:.1f}s); resuming"
+            )
+
+    started = time.perf_counter()
+    ok = migrate(
+        f"sqlite:///{source}",
+        target,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        progress=quiet,
+    )
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"\nmigrated + verified {total_rows:,} rows in {elapsed:.1f}s "
+        f"({total_rows / elapsed:,.0f} rows/s), peak RSS {peak_mb:.0f} MB, "
+        f"verified: {ok}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Cover placeholder stage throughput benchmark.
+
+Serves --books distinct generated 800x1200 JPEG covers from a local stub,
+runs the placeholder stage once to fetch them into the cover cache, then
+recomputes every placeholder (cover bytes from the disk cache) in-process
+and with process pools of 1, 2 and 4 workers, reporting covers/s.
+
+Usage:
+    cd backend && python benchmarks/bench_placeholders.py [--books 400]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_covers(count: int):
+    from PIL import Image, ImageDraw
+
+    images = []
+    for i in range(count):
+        image = Image.new("RGB", (800, 1200), ((i * 37) % 256, 70, 120))
+        draw = ImageDraw.Draw(image)
+        draw.ellipse((100 + i % 200, 300, 700, 900), fill=(230, (i * 11) % 256, 60))
+        out = io.BytesIO()
+        image.save(out, "JPEG", quality=90)
+        images.append(out.getvalue())
+    return images
+
+
+def start_stub(images) -> str:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            index = int(self.path.rsplit("/", 1)[-1].split(".")[0])
+            body = images[index % len(images)]
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=400)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ["COVER_CACHE_DIR"] = f"{workdir}/covers"
+    os.environ["COVER_ALLOWED_HOSTS"] = "127.0.0.1"
+    sys.path.insert(0, BACKEND_DIR)
+    from sqlalchemy import update
+
+    from app.database import Base, SessionLocal, async_engine, engine
+    from app.models.book import Book
+    from app.services import cover_placeholders, covers
+
+    Base.metadata.create_all(bind=engine)
+    upstream = start_stub(make_covers(50))
+    db = SessionLocal()
+    db.add_all(
+        Book(
+            title=f"Cover Book {i}",
+            author="Bench",
+            cover_url=f"{upstream}/covers/{i}.jpg",
+        )
+        for i in range(args.books)
+    )
+    db.commit()
+
+    def reset():
+        db.execute(update(Book).values(cover_placeholder_source=None))
+        db.commit()
+
+    async def timed_run(label):
+        reset()
+        started = time.perf_counter()
+        processed = await cover_placeholders.process_all()
+        elapsed = time.perf_counter() - started
+        print(f"  {label:<24} {elapsed:6.2f}s  {processed / elapsed:7.1f} covers/s")
+        await covers.shutdown()
+
+    async def run():
+        print(f"{args.books} covers, {os.cpu_count()} CPUs")
+        await timed_run("cold (fetch + compute)")
+
+        # In-process baseline: same work, one core, no pool
+        urls = [url for (url,) in db.query(Book.cover_url)]
+        data = [(await covers.get_cover(url, "original"))[0] for url in urls]
+        started = time.perf_counter()
+        for cover in data:
+            covers.cover_placeholder(cover)
+        elapsed = time.perf_counter() - started
+        print(
+            f"  {'in-process (no pool)':<24} {elapsed:6.2f}s  "
+            f"{len(data) / elapsed:7.1f} covers/s"
+        )
+
+        for workers in (1, 2, 4):
+            covers.COVER_RESIZE_WORKERS = workers
+            await timed_run(f"pool, {workers} worker(s)")
+        await async_engine.dispose()
+
+    asyncio.run(run())
+    sample = db.query(Book).first()
+    print(
+        f"  e.g. {sample.cover_color} {sample.cover_placeholder} "
+        f"({len(sample.cover_placeholder)} chars)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Throughput vs connection pool size.
+
+Runs a fixed number of concurrent clients (list reads mixed with item
+updates through the async sessions) once per DB_POOL_SIZE and reports
+operations/s together with the pool telemetry from app.pool_stats:
+average/max checkout wait and checkout timeouts. Undersized pools show up
+as long checkout waits; oversized ones stop adding throughput.
+
+Point DATABASE_URL at a scratch PostgreSQL database (the benchmark creates
+its own tables and rows); without it a temporary SQLite file is used with
+SQLITE_PROFILE=default so the DB_POOL_* settings apply.
+
+Usage:
+    cd backend && DATABASE_URL=postgresql://... \\
+        python benchmarks/bench_pool_size.py [--sizes 1,2,5,10,20] [--clients 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def workload(seconds: float, clients: int, items: int) -> dict:
+    from app.crud import book_list_async as crud_list
+    from app.database import (
+        AsyncSessionLocal,
+        Base,
+        SessionLocal,
+        async_engine,
+        engine,
+    )
+    from app.models.book import Book
+    from app.models.book_list import BookList, BookListItem
+    from app.pool_stats import pool_status
+    from app.schemas.book_list import BookListItemUpdate
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    book_list = BookList(name=f"Pool bench {random.randint(0, 10**9)}", is_default=0)
+    db.add(book_list)
+    db.flush()
+    item_ids = []
+    for i in range(items):
+        book = Book(title=f"Pool Book {i}", author="Author", description="x" * 300)
+        db.add(book)
+        db.flush()
+        item = BookListItem(book_list_id=book_list.id, book_id=book.id)
+        db.add(item)
+        db.flush()
+        item_ids.append(item.id)
+    db.commit()
+    list_id = book_list.id
+    db.close()
+
+    stats = {"ops": 0, "errors": 0}
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        while time.perf_counter() < deadline:
+            try:
+                async with AsyncSessionLocal() as session:
+                    # One write per ten operations
+                    if random.random() < 0.1:
+                        update = BookListItemUpdate(current_page=random.randint(1, 500))
+                        await crud_list.update_book_list_item(
+                            session, list_id, random.choice(item_ids), update
+                        )
+                    else:
+                        await crud_list.get_book_list(session, list_id)
+                stats["ops"] += 1
+            except Exception:
+                stats["errors"] += 1
+
+    await asyncio.gather(*[client() for _ in range(clients)])
+    stats["pool"] = pool_status()["writer"]
+    await async_engine.dispose()
+    return stats
+
+
+def run_size(size: int, database_url: str) -> dict:
+    env = dict(os.environ, DB_POOL_SIZE=str(size), DATABASE_URL=database_url)
+    env.setdefault("SQLITE_PROFILE", "default")
+    env.setdefault("DB_MAX_OVERFLOW", "0")
+    # Short checkout timeout so a starved pool shows up as timeouts
+    env.setdefault("DB_POOL_TIMEOUT", "5")
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", *sys.argv[1:]],
+        env=env,
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1,2,5,10,20")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, BACKEND_DIR)
+        stats = asyncio.run(workload(args.seconds, args.clients, args.items))
+        print(json.dumps(stats))
+        return
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        database_url = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+        print("DATABASE_URL not set; using a temporary SQLite database")
+
+    print(f"{args.clients} clients for {args.seconds}s (max_overflow 0):")
+    for size in (int(s) for s in args.sizes.split(",")):
+        stats = run_size(size, database_url)
+        pool = stats["pool"]
+        print(
+            f"  pool_size {size:<3} {stats['ops'] / args.seconds:8.1f} ops/s   "
+            f"wait avg {pool['wait_ms_avg']:7.2f}ms max {pool['wait_ms_max']:8.2f}ms   "
+            f"timeouts {pool['timeouts']}   errors {stats['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
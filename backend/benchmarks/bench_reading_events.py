@@ -0,0 +1,182 @@
+"""Reading progress log storage, rollup and chart query benchmark.
+
+Creates --books books on a Currently Reading list and times progress
+updates through PATCH /lists/{id}/books/{book_id}. It then loads --days
+days of one-update-per-book-per-day history into reading_events and
+reports table sizes and chart query times (one book over a year, the
+library over 30 days and a year) before and after compacting everything
+into reading_days.
+
+Usage:
+    cd backend && python benchmarks/bench_reading_events.py [--books 2000] [--days 1095]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOAD_BATCH_SIZE = 100000
+
+
+def table_sizes(db) -> str:
+    from sqlalchemy import text
+
+    db.execute(text("VACUUM"))
+    rows = db.execute(
+        text(
+            "SELECT name, SUM(pgsize) FROM dbstat "
+            "WHERE name IN ('reading_events', 'ix_reading_events_book_created', "
+            "'reading_days', 'ix_reading_days_day') "
+            "GROUP BY name ORDER BY name"
+        )
+    )
+    return ", ".join(f"{name} {size / 1024**2:.1f} MB" for name, size in rows)
+
+
+def timed(label, fn, repeat=20):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"  {label:<34} p50 {statistics.median(samples):7.2f} ms  ({result})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=1095)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ.setdefault("CACHE_WARM_ENABLED", "false")
+    os.environ.setdefault("ENRICHMENT_ENABLED", "false")
+    os.environ.setdefault("PLACEHOLDERS_ENABLED", "false")
+    os.environ.setdefault("READING_ROLLUP_ENABLED", "false")
+    sys.path.insert(0, BACKEND_DIR)
+    from fastapi.testclient import TestClient
+    from sqlalchemy import insert
+
+    from app.crud import progress as crud_progress
+    from app.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.models.book import Book
+    from app.models.book_list import BookList, BookListItem, ReadingStatus
+    from app.models.reading_event import ReadingEvent
+
+    Base.metadata.create_all(bind=engine)
+    with TestClient(app) as client:
+        db = SessionLocal()
+        db.execute(
+            insert(Book),
+            [
+                {"title": f"Book {i}", "author": "Bench", "page_count": 400}
+                for i in range(args.books)
+            ],
+        )
+        list_id = (
+            db.query(BookList.id).filter(BookList.name == "Currently Reading").scalar()
+        )
+        book_ids = [book_id for (book_id,) in db.query(Book.id)]
+        db.execute(
+            insert(BookListItem),
+            [
+                {
+                    "book_list_id": list_id,
+                    "book_id": book_id,
+                    "status": ReadingStatus.READING,
+                }
+                for book_id in book_ids
+            ],
+        )
+        db.commit()
+
+        samples = []
+        for page, book_id in enumerate(random.choices(book_ids, k=500), start=1):
+            started = time.perf_counter()
+            client.patch(
+                f"/lists/{list_id}/books/{book_id}", json={"current_page": page}
+            )
+            samples.append((time.perf_counter() - started) * 1000)
+        print(
+            f"{args.books} books, {args.days} days of daily updates\n"
+            f"  progress update (PATCH)            p50 "
+            f"{statistics.median(samples):7.2f} ms"
+        )
+
+        db.query(ReadingEvent).delete()
+        db.commit()
+        today = date.today()
+        first = datetime.combine(today - timedelta(days=args.days), datetime.min.time())
+        started = time.perf_counter()
+        rows = []
+        pages = dict.fromkeys(book_ids, 0)
+        for day in range(args.days):
+            at = first + timedelta(days=day, hours=20)
+            for book_id in book_ids:
+                read = random.randint(0, 40)
+                pages[book_id] = (pages[book_id] + read) % 400
+                rows.append(
+                    {
+                        "book_id": book_id,
+                        "page": pages[book_id],
+                        "pages_read": read,
+                        "created_at": at,
+                    }
+                )
+            if len(rows) >= LOAD_BATCH_SIZE:
+                db.execute(insert(ReadingEvent), rows)
+                db.commit()
+                rows = []
+        if rows:
+            db.execute(insert(ReadingEvent), rows)
+            db.commit()
+        events = args.books * args.days
+        print(
+            f"  loaded {events:,} events in {time.perf_counter() - started:.1f}s"
+        )
+
+        book_id = book_ids[0]
+        year = (today - timedelta(days=364), today)
+        month = (today - timedelta(days=29), today)
+
+        def queries(label):
+            print(label)
+            timed(
+                "one book, 1 year",
+                lambda: len(crud_progress.get_book_progress(db, book_id, *year)["days"]),
+            )
+            timed(
+                "library, 30 days",
+                lambda: len(crud_progress.get_daily_pages(db, *month)),
+            )
+            timed(
+                "library, 1 year",
+                lambda: len(crud_progress.get_daily_pages(db, *year)),
+                repeat=3,
+            )
+
+        print(f"  raw log: {table_sizes(db)}")
+        queries("before rollup")
+
+        started = time.perf_counter()
+        compacted = crud_progress.rollup(db)
+        elapsed = time.perf_counter() - started
+        print(
+            f"  rollup: {compacted:,} events in {elapsed:.1f}s "
+            f"({compacted / elapsed:,.0f} events/s)"
+        )
+        print(f"  compacted: {table_sizes(db)}")
+        queries("after rollup")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Related books ("readers also listed") build and serving benchmark.
+
+Builds --books books and --lists public lists holding ~--items items, with
+skewed list sizes (a few lists longer than MAX_LIST_SIZE) and book
+popularity. Then times a full rebuild with rebuild_related.py (reporting
+its peak RSS), an incremental refresh after adding books to --changes
+lists, and GET /books/{id}/related.
+
+Usage:
+    cd backend && python benchmarks/bench_related.py [--books 200000] [--lists 50000] [--items 1000000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from itertools import accumulate
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOAD_BATCH_SIZE = 50000
+REBUILD_AND_REPORT_RSS = """
+import runpy
+try:
+    runpy.run_path("rebuild_related.py", run_name="__main__")
+finally:
+    with open("/proc/self/status") as status:
+        print(next(line for line in status if line.startswith("VmHWM")).split()[1])
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=200000)
+    parser.add_argument("--lists", type=int, default=50000)
+    parser.add_argument("--items", type=int, default=1000000)
+    parser.add_argument("--changes", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    for flag in (
+        "CACHE_WARM_ENABLED",
+        "ENRICHMENT_ENABLED",
+        "PLACEHOLDERS_ENABLED",
+        "READING_ROLLUP_ENABLED",
+        "RELATED_ENABLED",
+    ):
+        os.environ.setdefault(flag, "false")
+    sys.path.insert(0, BACKEND_DIR)
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, insert
+
+    from app.crud import related as crud_related
+    from app.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.models.book import Book
+    from app.models.book_list import BookList, BookListItem
+    from app.models.related_book import RelatedBook
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    db = SessionLocal()
+    started = time.perf_counter()
+    for start in range(0, args.books, LOAD_BATCH_SIZE):
+        db.execute(
+            insert(Book),
+            [
+                {"title": f"Book {i}", "author": f"Author {i % 5000}"}
+                for i in range(start, min(start + LOAD_BATCH_SIZE, args.books))
+            ],
+        )
+
+    # Long-tailed list sizes averaging items/lists; popular books (low ids)
+    # turn up on far more lists than the rest
+    mean_size = args.items / args.lists
+    sizes = [
+        max(1, int(rng.paretovariate(1.5) * mean_size / 3)) for _ in range(args.lists)
+    ]
+    book_ids = range(1, args.books + 1)
+    cum_weights = list(accumulate(1 / rank**0.8 for rank in book_ids))
+    pairs = set()
+    for list_id, size in enumerate(sizes, start=1):
+        for book_id in rng.choices(book_ids, cum_weights=cum_weights, k=size):
+            pairs.add((list_id, book_id))
+    counts = Counter(list_id for list_id, _ in pairs)
+    db.execute(
+        insert(BookList),
+        [
+            {"name": f"List {i}", "is_public": 1, "item_count": counts[i]}
+            for i in range(1, args.lists + 1)
+        ],
+    )
+    rows = [{"book_list_id": l, "book_id": b} for l, b in sorted(pairs)]
+    for start in range(0, len(rows), LOAD_BATCH_SIZE):
+        db.execute(insert(BookListItem), rows[start : start + LOAD_BATCH_SIZE])
+    db.commit()
+    skipped = sum(1 for count in counts.values() if count > crud_related.MAX_LIST_SIZE)
+    print(
+        f"{args.books:,} books, {args.lists:,} public lists, {len(rows):,} items, "
+        f"{skipped} lists over {crud_related.MAX_LIST_SIZE} items "
+        f"(loaded in {time.perf_counter() - started:.1f}s)"
+    )
+    del pairs, rows, counts
+
+    # In a fresh process, so its peak RSS (VmHWM, Linux) is the build's alone
+    rebuild = subprocess.run(
+        [sys.executable, "-c", REBUILD_AND_REPORT_RSS],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    summary, peak_kb = rebuild.stdout.strip().rsplit("\n", 1)
+    print(f"  {summary}, peak RSS {int(peak_kb) / 1024:.0f} MB")
+
+    with TestClient(app) as client:
+        # Incremental path: add a book to a few mid-sized lists, then refresh
+        lists = [
+            list_id
+            for (list_id,) in db.query(BookList.id)
+            .filter(BookList.item_count.between(20, 100))
+            .limit(args.changes)
+        ]
+        for list_id in lists:
+            client.post(
+                f"/lists/{list_id}/books",
+                json={"book_id": rng.randint(1, args.books)},
+            )
+        started = time.perf_counter()
+        refreshed = 0
+        while True:
+            batch = crud_related.refresh(db)
+            if not batch:
+                break
+            refreshed += batch
+        elapsed = time.perf_counter() - started
+        print(
+            f"  refresh after adding to {len(lists)} lists: {refreshed:,} books "
+            f"in {elapsed:.2f}s"
+        )
+
+        with_related = [
+            book_id
+            for (book_id,) in db.query(RelatedBook.book_id)
+            .group_by(RelatedBook.book_id)
+            .having(func.count() > 1)
+            .limit(2000)
+        ]
+        samples = []
+        for book_id in rng.sample(with_related, min(200, len(with_related))):
+            started = time.perf_counter()
+            response = client.get(f"/books/{book_id}/related")
+            samples.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200
+        samples.sort()
+        print(
+            f"  GET /books/{{id}}/related: p50 {statistics.median(samples):.1f} ms, "
+            f"p95 {samples[int(len(samples) * 0.95)]:.1f} ms"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
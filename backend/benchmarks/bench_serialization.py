@@ -0,0 +1,133 @@
+"""Benchmark list serialization and compression for a large list.
+
+Compares the default FastAPI path (pydantic from_attributes + json.dumps),
+a cached TypeAdapter dumping JSON in pydantic-core, and the direct
+row-to-dict + orjson path used by GET /lists/{id} and /lists/public,
+then reports bytes on the wire for identity, gzip and brotli.
+
+Usage:
+    cd backend && python benchmarks/bench_serialization.py [--items 2000]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+import brotli  # noqa: E402
+import orjson  # noqa: E402
+
+from app.compression import BROTLI_QUALITY, GZIP_LEVEL  # noqa: E402
+from app.crud import book_list as crud_list  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.book import Book  # noqa: E402
+from app.models.book_list import BookList, BookListItem, ReadingStatus  # noqa: E402
+from app.schemas.book_list import BookList as BookListSchema  # noqa: E402
+from app.serialization import book_list_to_dict, dump_json  # noqa: E402
+
+WORDS = "the of and a to in is was he for it with as his on be at by had".split()
+
+
+def _text(n_words: int) -> str:
+    return " ".join(random.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def seed(n_items: int) -> int:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    book_list = BookList(name="Benchmark", description="Large list", is_default=0)
+    db.add(book_list)
+    db.flush()
+    for i in range(n_items):
+        book = Book(
+            title=f"Book {i}: {_text(4)}",
+            author=f"Author {i % 300}",
+            isbn=f"978{i:010d}",
+            cover_url=f"https://covers.openlibrary.org/b/id/{i}-L.jpg",
+            description=_text(180),
+            published_year=1900 + i % 120,
+            page_count=100 + i % 700,
+            genres="Fiction,Fantasy,Adventure",
+        )
+        db.add(book)
+        db.flush()
+        db.add(
+            BookListItem(
+                book_list_id=book_list.id,
+                book_id=book.id,
+                status=random.choice(list(ReadingStatus)),
+                rating=random.choice([None, 3, 4, 5]),
+                notes=_text(20) if i % 5 == 0 else None,
+            )
+        )
+    db.commit()
+    list_id = book_list.id
+    db.close()
+    return list_id
+
+
+def timed(label: str, fn, repeat: int) -> bytes:
+    fn()  # warm up (TypeAdapter build, caches)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    per_call = (time.perf_counter() - start) / repeat * 1000
+    print(f"  {label:<34} {per_call:8.1f} ms")
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    random.seed(42)
+    list_id = seed(args.items)
+    db = SessionLocal()
+    book_list = crud_list.get_book_list(db, list_id)
+
+    print(f"Serialization of a {args.items}-item list (per call):")
+    baseline = timed(
+        "pydantic from_attributes + json",
+        lambda: json.dumps(
+            BookListSchema.model_validate(book_list).model_dump(mode="json"),
+            separators=(",", ":"),
+        ).encode(),
+        args.repeat,
+    )
+    timed(
+        "cached TypeAdapter dump_json",
+        lambda: dump_json(BookListSchema, book_list),
+        args.repeat,
+    )
+    fast = timed(
+        "row-to-dict + orjson",
+        lambda: orjson.dumps(book_list_to_dict(book_list), option=orjson.OPT_UTC_Z),
+        args.repeat,
+    )
+    assert orjson.loads(fast) == json.loads(baseline), "payloads differ"
+
+    print("\nBytes on the wire:")
+    print(f"  {'identity':<34} {len(fast):>10,}")
+    start = time.perf_counter()
+    gz = gzip.compress(fast, compresslevel=GZIP_LEVEL)
+    gz_ms = (time.perf_counter() - start) * 1000
+    print(f"  {f'gzip (level {GZIP_LEVEL})':<34} {len(gz):>10,}  ({gz_ms:.1f} ms)")
+    start = time.perf_counter()
+    br = brotli.compress(fast, quality=BROTLI_QUALITY)
+    br_ms = (time.perf_counter() - start) * 1000
+    print(f"  {f'brotli (quality {BROTLI_QUALITY})':<34} {len(br):>10,}  ({br_ms:.1f} ms)")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Concurrent read/write benchmark for the SQLite tuning profile.
+
+Runs the same mixed workload against a fresh database once with
+SQLITE_PROFILE=default (rollback journal, one shared pool) and once with
+SQLITE_PROFILE=tuned (WAL + PRAGMAs, separate reader/writer pools):
+readers fetch a list through the read session while writers update items
+through the write session. Reports operations/s and failed operations
+("database is locked").
+
+Usage:
+    cd backend && python benchmarks/bench_sqlite_profile.py [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def workload(seconds: float, readers: int, writers: int, items: int) -> dict:
+    from app.crud import book_list_async as crud_list
+    from app.database import (
+        AsyncReadSessionLocal,
+        AsyncSessionLocal,
+        Base,
+        SessionLocal,
+        async_engine,
+        async_read_engine,
+        engine,
+    )
+    from app.models.book import Book
+    from app.models.book_list import BookList, BookListItem
+    from app.schemas.book_list import BookListItemUpdate
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    book_list = BookList(name="Bench", is_default=0)
+    db.add(book_list)
+    db.flush()
+    for i in range(items):
+        book = Book(title=f"Book {i}", author="Author", description="x" * 300)
+        db.add(book)
+        db.flush()
+        db.add(BookListItem(book_list_id=book_list.id, book_id=book.id))
+    db.commit()
+    list_id = book_list.id
+    db.close()
+
+    stats = {"reads": 0, "writes": 0, "errors": 0}
+    deadline = time.perf_counter() + seconds
+
+    async def reader():
+        while time.perf_counter() < deadline:
+            try:
+                async with AsyncReadSessionLocal() as session:
+                    await crud_list.get_book_list(session, list_id)
+                stats["reads"] += 1
+            except Exception:
+                stats["errors"] += 1
+
+    async def writer():
+        while time.perf_counter() < deadline:
+            update = BookListItemUpdate(current_page=random.randint(1, 500))
+            try:
+                async with AsyncSessionLocal() as session:
+                    await crud_list.update_book_list_item(
+                        session, list_id, random.randint(1, items), update
+                    )
+                stats["writes"] += 1
+            except Exception:
+                stats["errors"] += 1
+
+    await asyncio.gather(
+        *[reader() for _ in range(readers)], *[writer() for _ in range(writers)]
+    )
+    # aiosqlite connections run on non-daemon threads; close them so we exit
+    await async_read_engine.dispose()
+    await async_engine.dispose()
+    return stats
+
+
+def run_profile(profile: str, args) -> dict:
+    env = dict(
+        os.environ,
+        SQLITE_PROFILE=profile,
+        DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bench.db",
+    )
+    # Keep lock waits short so contention shows up as errors, not stalls
+    env.setdefault("SQLITE_BUSY_TIMEOUT_MS", "1000")
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", *sys.argv[1:]],
+        env=env,
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, BACKEND_DIR)
+        stats = asyncio.run(
+            workload(args.seconds, args.readers, args.writers, args.items)
+        )
+        print(json.dumps(stats))
+        return
+
+    print(
+        f"{args.readers} readers + {args.writers} writers for {args.seconds}s "
+        f"on a {args.items}-item list:"
+    )
+    for profile in ("default", "tuned"):
+        stats = run_profile(profile, args)
+        print(
+            f"  {profile:<8} reads {stats['reads'] / args.seconds:8.1f}/s   "
+            f"writes {stats['writes'] / args.seconds:7.1f}/s   "
+            f"errors {stats['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
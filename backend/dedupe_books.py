@@ -0,0 +1,74 @@
+"""Find and merge duplicate books.
+
+Groups books by normalized title/author and by ISBN-13 (so ISBN-10 and
+ISBN-13 forms of one edition meet), scores each group's members against
+the book that will be kept, and merges those scoring at least the merge
+threshold: list items and reading history move to the kept book and the
+duplicate is deleted. With --dry-run nothing is written; the groups are
+printed with their scores, and members below the threshold are shown as
+kept apart.
+
+Usage:
+    cd backend && source venv/bin/activate
+    python dedupe_books.py [--dry-run] [--verbose]
+"""
+
+import argparse
+import sys
+import time
+
+from app.crud import dedupe as crud_dedupe
+from app.database import SessionLocal
+
+
+def describe(entry: dict) -> str:
+    score = f"{entry['score']:.2f} " if "score" in entry else ""
+    return (
+        f"{score}#{entry['id']} {entry['title'][:50]!r} by {entry['author'][:30]} "
+        f"(isbn {entry['isbn'] or '-'}, {entry['items']} items)"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only report what would be merged"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="also show groups with nothing to merge"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        report = crud_dedupe.dedupe(db, dry_run=args.dry_run)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    for group in report["groups"]:
+        if not group["merge"] and not args.verbose:
+            continue
+        print(f"  keep  {describe(group['keep'])}")
+        for entry in group["merge"]:
+            print(f"    merge {describe(entry)}")
+        for entry in group["skipped"]:
+            print(f"    apart {describe(entry)}")
+    for group in report["oversized"]:
+        print(f"  skipped a group of {group['size']} books (e.g. {group['ids']})")
+
+    duplicates = sum(len(group["merge"]) for group in report["groups"])
+    summary = (
+        f"{report['candidates']} candidates in {len(report['groups'])} groups, "
+        f"{duplicates} duplicates"
+    )
+    if args.dry_run:
+        print(f"{summary} (dry run, {elapsed:.2f}s)")
+    else:
+        print(f"{summary}; merged {report['merged']} ({elapsed:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,52 +1,306 @@
-"""One-time script to migrate data from SQLite to PostgreSQL.
+"""Migrate data from SQLite to PostgreSQL, streaming and resumable.
+
+Each table is copied in primary-key order, CHUNK_SIZE rows at a time
+(keyset pagination, on row values for composite keys, so memory stays flat
+however large the library is).
+PostgreSQL targets are written with COPY; other targets with batched
+INSERT ... ON CONFLICT DO NOTHING. Tables that do not depend on each other
+are copied in parallel.
+
+After every chunk, the last copied key, row count and a running checksum
+are committed to the target's migration_checkpoints table in the same
+transaction as the rows, so an interrupted run resumes exactly where it
+stopped. At the end, row counts and checksums are verified against the
+target, the PostgreSQL id sequences are reset and the book search index is
+rebuilt (the SQLite FTS5 tables are not copied; see app.models.book).
 
 Usage:
     cd backend && source venv/bin/activate
-    python migrate_data.py
-
-Safe to delete after migration is verified.
+    alembic upgrade head        # with DATABASE_URL pointing at PostgreSQL
+    python migrate_data.py [--source sqlite:///./books.db] [--chunk-size 10000]
+                           [--workers 4] [--restart] [--verify-only]
 """
 
+import argparse
+import hashlib
+import io
+import json
 import os
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    exc,
+    select,
+    text,
+    tuple_,
+)
 
 load_dotenv()
 
+# Reflection skips expression indexes (ix_books_title_lower); only the
+# columns matter here
+warnings.filterwarnings(
+    "ignore", "Skipped unsupported reflection", category=exc.SAWarning
+)
+
 SQLITE_URL = "sqlite:///./books.db"
-PG_URL = os.getenv("DATABASE_URL")
+CHUNK_SIZE = 10_000
+
+# Never copied: Alembic keeps its own version table on the target
+SKIPPED_TABLES = {"alembic_version", "migration_checkpoints"}
+# The SQLite full-text index (books_fts and its shadow tables) is derived
+# from books and rebuilt on the target instead
+SKIPPED_PREFIXES = ("books_fts",)
+
+CHECKSUM_MOD = 2**64
+
+checkpoints = Table(
+    "migration_checkpoints",
+    MetaData(),
+    Column("table_name", String(100), primary_key=True),
+    # JSON-encoded primary key value (a list for composite keys)
+    Column("last_key", Text),
+    Column("rows", Text),
+    Column("checksum", Text),
+)
+
+
+def _normalize(value):
+    """Render a value the same way whichever database it came from"""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+    if hasattr(value, "value"):  # Enum members
+        return value.value
+    return value
+
+
+def _row_hash(row) -> int:
+    # Keyed by column name: column order can differ between the databases
+    values = {name: _normalize(value) for name, value in row._mapping.items()}
+    digest = hashlib.md5(
+        json.dumps(values, sort_keys=True, default=str).encode()
+    ).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def _copy_value(value) -> str:
+    """Encode one value for COPY ... FROM STDIN (text format)"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        # SQLite stores naive UTC timestamps
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    if hasattr(value, "value"):
+        value = value.value
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _waves(tables):
+    """Group tables into waves; each wave only depends on earlier waves"""
+    remaining = {table.name: table for table in tables}
+    waves = []
+    while remaining:
+        wave = [
+            table
+            for table in remaining.values()
+            if not any(
+                fk.column.table.name in remaining and fk.column.table.name != table.name
+                for fk in table.foreign_keys
+            )
+        ]
+        waves.append(wave)
+        for table in wave:
+            del remaining[table.name]
+    return waves
+
+
+def _copied(name, _metadata=None) -> bool:
+    return name not in SKIPPED_TABLES and not name.startswith(SKIPPED_PREFIXES)
+
+
+def _key_columns(table):
+    keys = list(table.primary_key.columns)
+    if not keys:
+        raise RuntimeError(f"{table.name}: need a primary key")
+    return keys
+
+
+def _last_key(keys, row):
+    """A row's key: the value, or a list of values for composite keys"""
+    values = [row._mapping[key.name] for key in keys]
+    return values[0] if len(values) == 1 else values
+
+
+def _decode_key(keys, last_key):
+    """Undo the JSON encoding of a checkpointed key"""
+    values = [last_key] if len(keys) == 1 else last_key
+    decoded = []
+    for key, value in zip(keys, values):
+        if isinstance(value, str) and isinstance(key.type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif isinstance(value, str) and isinstance(key.type, Date):
+            value = date.fromisoformat(value)
+        decoded.append(value)
+    return decoded[0] if len(keys) == 1 else decoded
+
+
+def _source_chunks(conn, table, keys, after, chunk_size):
+    """Yield chunks of rows in key order, starting after `after`"""
+    while True:
+        query = select(table).order_by(*keys).limit(chunk_size)
+        if after is not None:
+            if len(keys) == 1:
+                query = query.where(keys[0] > after)
+            else:
+                # Row-value comparison: (a, b) > (x, y)
+                query = query.where(tuple_(*keys) > tuple_(*after))
+        rows = conn.execute(query).fetchall()
+        if not rows:
+            return
+        yield rows
+        after = _last_key(keys, rows[-1])
+
 
-if not PG_URL:
-    raise RuntimeError("DATABASE_URL not set in environment")
+def _write_chunk(dst, table, columns, rows):
+    if dst.dialect.name == "postgresql":
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(v) for v in row) + "\n")
+        buffer.seek(0)
+        # COPY into a per-connection staging table, then move the rows over
+        # with ON CONFLICT DO NOTHING (e.g. default lists the API already
+        # seeded). ON COMMIT DELETE ROWS empties it after every chunk.
+        staging = f"_copy_{table.name}"
+        col_names = ", ".join(f'"{c}"' for c in columns)
+        dst.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+                f"(LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+        )
+        cursor = dst.connection.cursor()
+        cursor.copy_expert(f"COPY {staging} ({col_names}) FROM STDIN", buffer)
+        dst.execute(
+            text(
+                f"INSERT INTO {table.name} ({col_names}) "
+                f"SELECT {col_names} FROM {staging} ON CONFLICT DO NOTHING"
+            )
+        )
+        return
 
-sqlite_engine = create_engine(SQLITE_URL)
-pg_engine = create_engine(PG_URL)
+    if dst.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    dst.execute(
+        insert(table).on_conflict_do_nothing(),
+        [dict(zip(columns, row)) for row in rows],
+    )
 
-# Tables to migrate in dependency order (parents before children)
-TABLES = ["books", "book_lists", "book_list_items"]
 
+def _load_checkpoint(dst, table, keys):
+    row = dst.execute(
+        select(checkpoints).where(checkpoints.c.table_name == table.name)
+    ).first()
+    if row is None:
+        return None, 0, 0
+    last_key = _decode_key(keys, json.loads(row.last_key))
+    return last_key, int(row.rows), int(row.checksum)
 
-def migrate():
-    with sqlite_engine.connect() as src, pg_engine.connect() as dst:
-        for table in TABLES:
-            rows = src.execute(text(f"SELECT * FROM {table}")).mappings().all()
-            if not rows:
-                print(f"  {table}: 0 rows (skipped)")
-                continue
 
-            cols = list(rows[0].keys())
-            placeholders = ", ".join(f":{c}" for c in cols)
-            col_names = ", ".join(f'"{c}"' for c in cols)
-            insert_sql = f'INSERT INTO {table} ({col_names}) VALUES ({placeholders}) ON CONFLICT DO NOTHING'
+def _save_checkpoint(dst, table_name, last_key, rows, checksum):
+    if isinstance(last_key, list):
+        last_key = [_normalize(value) for value in last_key]
+    values = {
+        # default=str: dates (reading_days keys) as ISO strings
+        "last_key": json.dumps(_normalize(last_key), default=str),
+        "rows": str(rows),
+        "checksum": str(checksum),
+    }
+    updated = dst.execute(
+        checkpoints.update()
+        .where(checkpoints.c.table_name == table_name)
+        .values(**values)
+    ).rowcount
+    if not updated:
+        dst.execute(checkpoints.insert().values(table_name=table_name, **values))
 
-            dst.execute(text(insert_sql), [dict(r) for r in rows])
+
+def copy_table(src_engine, dst_engine, table, dst_table, chunk_size, progress):
+    keys = _key_columns(table)
+    columns = [c.name for c in table.columns]
+
+    with src_engine.connect() as src, dst_engine.connect() as dst:
+        total = src.execute(text(f"SELECT COUNT(*) FROM {table.name}")).scalar()
+        last_key, copied, checksum = _load_checkpoint(dst, table, keys)
+        dst.commit()
+        if copied:
+            print(f"  {table.name}: resuming after {copied:,} rows")
+
+        started = time.perf_counter()
+        resumed_from = copied
+        for rows in _source_chunks(src, table, keys, last_key, chunk_size):
+            _write_chunk(dst, dst_table, columns, rows)
+            copied += len(rows)
+            checksum = (checksum + sum(_row_hash(row) for row in rows)) % CHECKSUM_MOD
+            last_key = _last_key(keys, rows[-1])
+            # Rows and checkpoint commit together, so a crash never skips
+            # or duplicates a chunk on resume
+            _save_checkpoint(dst, table.name, last_key, copied, checksum)
             dst.commit()
-            print(f"  {table}: {len(rows)} rows migrated")
 
-        # Reset PostgreSQL sequences so new inserts get correct IDs
-        for table in TABLES:
-            seq_name = f"{table}_id_seq"
-            # Check if sequence exists
+            elapsed = time.perf_counter() - started
+            rate = (copied - resumed_from) / elapsed if elapsed else 0
+            progress(table.name, copied, total, rate)
+
+    return copied, checksum
+
+
+def table_checksum(engine, table, chunk_size):
+    """Row count and order-independent checksum of a whole table"""
+    keys = _key_columns(table)
+    count, checksum = 0, 0
+    with engine.connect() as conn:
+        for rows in _source_chunks(conn, table, keys, None, chunk_size):
+            count += len(rows)
+            checksum = (checksum + sum(_row_hash(row) for row in rows)) % CHECKSUM_MOD
+    return count, checksum
+
+
+def _print_progress(table_name, copied, total, rate):
+    percent = copied / total * 100 if total else 100
+    print(f"  {table_name}: {copied:,}/{total:,} rows ({percent:.0f}%) {rate:,.0f} rows/s")
+
+
+def _reset_sequences(dst_engine, tables):
+    """Reset PostgreSQL sequences so new inserts get correct IDs"""
+    with dst_engine.connect() as dst:
+        for table in tables:
+            seq_name = f"{table.name}_id_seq"
             result = dst.execute(
                 text("SELECT 1 FROM pg_sequences WHERE sequencename = :seq"),
                 {"seq": seq_name},
@@ -54,15 +308,145 @@ def migrate():
             if result:
                 dst.execute(
                     text(
-                        f"SELECT setval('{seq_name}', COALESCE((SELECT MAX(id) FROM {table}), 1))"
+                        f"SELECT setval('{seq_name}', COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
                     )
                 )
-                dst.commit()
                 print(f"  Reset sequence {seq_name}")
+        dst.commit()
 
-    print("\nDone! Verify with: psql bookapp -c 'SELECT count(*) FROM books;'")
 
+def _rebuild_search_index(dst_engine):
+    """Rebuild the book full-text index from the copied books"""
+    with dst_engine.connect() as dst:
+        if dst_engine.dialect.name == "postgresql":
+            # Kept up by the inserts; a rebuild compacts the bulk-loaded GIN
+            dst.execute(text("REINDEX INDEX ix_books_search"))
+        elif dst.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'books_fts'")
+        ).first():
+            dst.execute(text("INSERT INTO books_fts(books_fts) VALUES ('rebuild')"))
+        else:
+            return
+        dst.commit()
+    print("  Rebuilt book search index")
+
+
+def migrate(
+    source_url=SQLITE_URL,
+    target_url=None,
+    chunk_size=CHUNK_SIZE,
+    workers=4,
+    restart=False,
+    verify_only=False,
+    progress=_print_progress,
+):
+    """Copy every table from source to target; returns True if verified"""
+    src_engine = create_engine(
+        source_url, connect_args={"check_same_thread": False}, pool_size=workers
+    )
+    dst_engine = create_engine(
+        target_url,
+        pool_size=workers,
+        # SQLite targets: wait on the write lock instead of failing
+        **({"connect_args": {"timeout": 60}} if target_url.startswith("sqlite") else {}),
+    )
+
+    src_meta = MetaData()
+    src_meta.reflect(src_engine, only=_copied)
+    dst_meta = MetaData()
+    dst_meta.reflect(dst_engine, only=_copied)
+    tables = list(src_meta.sorted_tables)
+    missing = [t.name for t in tables if t.name not in dst_meta.tables]
+    if missing:
+        raise RuntimeError(
+            f"Target is missing tables {missing}; run `alembic upgrade head` first"
+        )
+
+    checkpoints.create(dst_engine, checkfirst=True)
+    if restart:
+        with dst_engine.begin() as dst:
+            dst.execute(checkpoints.delete())
+
+    expected = {}
+    if not verify_only:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for wave in _waves(tables):
+                futures = {
+                    table.name: pool.submit(
+                        copy_table,
+                        src_engine,
+                        dst_engine,
+                        table,
+                        dst_meta.tables[table.name],
+                        chunk_size,
+                        progress,
+                    )
+                    for table in wave
+                }
+                for name, future in futures.items():
+                    expected[name] = future.result()
+                    print(f"  {name}: {expected[name][0]:,} rows copied")
+        print(f"Copied in {time.perf_counter() - started:.1f}s")
+
+    print("\nVerifying row counts and checksums...")
+    ok = True
+    for table in tables:
+        dst_table = dst_meta.tables[table.name]
+        if table.name in expected:
+            # Accumulated while copying, including rows from earlier runs
+            src_count, src_sum = expected[table.name]
+        else:
+            src_count, src_sum = table_checksum(src_engine, table, chunk_size)
+        dst_count, dst_sum = table_checksum(dst_engine, dst_table, chunk_size)
+        match = src_count == dst_count and src_sum == dst_sum
+        ok = ok and match
+        print(
+            f"  {table.name}: source {src_count:,} rows, target {dst_count:,} rows, "
+            f"checksum {'OK' if match else 'MISMATCH'}"
+        )
+
+    if not verify_only:
+        print()
+        if dst_engine.dialect.name == "postgresql":
+            _reset_sequences(dst_engine, tables)
+        _rebuild_search_index(dst_engine)
+
+    src_engine.dispose()
+    dst_engine.dispose()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=SQLITE_URL)
+    parser.add_argument("--target", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--restart", action="store_true", help="ignore checkpoints and start over"
+    )
+    parser.add_argument(
+        "--verify-only", action="store_true", help="only compare counts and checksums"
+    )
+    args = parser.parse_args()
+
+    if not args.target:
+        raise RuntimeError("DATABASE_URL not set in environment")
 
-if __name__ == "__main__":
     print("Migrating data from SQLite to PostgreSQL...\n")
-    migrate()
+    ok = migrate(
+        args.source,
+        args.target,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        restart=args.restart,
+        verify_only=args.verify_only,
+    )
+    if not ok:
+        raise SystemExit("\nVerification failed: target does not match source")
+    print("\nDone! Source and target match.")
+
+
+if __name__ == "__main__":
+    main()
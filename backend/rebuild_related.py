@@ -0,0 +1,38 @@
+"""Rebuild the related_books ("readers also listed") table.
+
+Recomputes every book's recommendations from public list co-occurrence and
+replaces the table, clearing the refresh queue. The background job does
+this on its own when the table is empty and once a day; run this after a
+bulk change or to time a build.
+
+Usage:
+    cd backend && source venv/bin/activate
+    python rebuild_related.py
+"""
+
+import sys
+import time
+
+from app.crud import related as crud_related
+from app.database import SessionLocal
+
+
+def main() -> int:
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        summary = crud_related.rebuild(db)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    print(
+        f"Rebuilt related books for {summary['books']} books from "
+        f"{summary['items']} items on {summary['lists']} public lists: "
+        f"{summary['rows']} rows ({elapsed:.2f}s)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
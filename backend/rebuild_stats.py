@@ -0,0 +1,52 @@
+"""Rebuild the reading_stats summary table and report counter drift.
+
+Recomputes every reading-statistics counter from book_list_items and
+compares it with what the write paths maintained incrementally. Any
+mismatch is printed. The table is then replaced, unless --check is given,
+in which case nothing is written and the exit status is 1 on drift.
+
+Usage:
+    cd backend && source venv/bin/activate
+    python rebuild_stats.py [--check]
+"""
+
+import argparse
+import sys
+import time
+
+from app.crud import stats as crud_stats
+from app.database import SessionLocal
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--check", action="store_true", help="only verify; exit 1 if counters drifted"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        drift = crud_stats.rebuild(db, dry_run=args.check)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    for entry in drift:
+        print(
+            f"  {entry['kind']:<7} {entry['key']:<30} "
+            f"stored books/pages {entry['stored']}, expected {entry['expected']}"
+        )
+    if not drift:
+        print(f"Counters consistent ({elapsed:.2f}s)")
+        return 0
+    if args.check:
+        print(f"{len(drift)} counters drifted ({elapsed:.2f}s)")
+        return 1
+    print(f"Rebuilt; {len(drift)} counters corrected ({elapsed:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Recount list items and repair drifted book_lists.item_count values.
+
+Counts every list's book_list_items and compares the result with the
+item_count the write paths maintained. Mismatches are printed and then
+corrected, unless --check is given, in which case nothing is written and
+the exit status is 1 on drift.
+
+Usage:
+    cd backend && source venv/bin/activate
+    python repair_item_counts.py [--check]
+"""
+
+import argparse
+import sys
+import time
+
+from app.crud.item_count import repair_item_counts
+from app.database import SessionLocal
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--check", action="store_true", help="only verify; exit 1 if counts drifted"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        drift = repair_item_counts(db, dry_run=args.check)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    for entry in drift:
+        print(
+            f"  list {entry['list_id']:<6} {entry['name'][:40]:<40} "
+            f"stored {entry['stored']}, actual {entry['actual']}"
+        )
+    if not drift:
+        print(f"Item counts consistent ({elapsed:.2f}s)")
+        return 0
+    if args.check:
+        print(f"{len(drift)} lists drifted ({elapsed:.2f}s)")
+        return 1
+    print(f"Repaired {len(drift)} lists ({elapsed:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
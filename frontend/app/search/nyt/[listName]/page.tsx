@@ -31,8 +31,8 @@ export default function NYTListPage() {
     useState<Book | null>(null);
 
   const { data, isLoading, error } = useQuery({
-    queryKey: ["nyt-bestsellers", listName],
-    queryFn: () => getNYTBestsellers(listName),
+    queryKey: ["nyt-bestsellers", listName, "full"],
+    queryFn: () => getNYTBestsellers(listName, true),
     staleTime: 1000 * 60 * 60, // Data stays fresh for 1 hour
     gcTime: 1000 * 60 * 60 * 24, // Keep in cache for 24 hours
   });
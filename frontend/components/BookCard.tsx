@@ -1,8 +1,6 @@
 "use client";
 
 import { useState } from "react";
-import { useQuery } from "@tanstack/react-query";
-import { checkBookExists } from "@/lib/api";
 import AddToListModal from "./lists/AddToListModal";
 import Link from "next/link";
 import { getBookPageUrl } from "@/lib/bookUtils";
@@ -10,24 +8,16 @@ import { useSearchParams } from "next/navigation";
 
 interface BookCardProps {
   book: any;
+  // Library membership ({ exists, book, lists }) from the results' batch check
+  bookCheck?: any;
+  onListsChange?: () => void;
 }
 
-export default function BookCard({ book }: BookCardProps) {
+export default function BookCard({ book, bookCheck, onListsChange }: BookCardProps) {
   const [showListModal, setShowListModal] = useState(false);
   const searchParams = useSearchParams();
   const searchQuery = searchParams.get("q") || undefined;
 
-  // Check if book already exists in library
-  // Check by title+author so all editions of the same book are recognized
-  const { data: bookCheck, refetch } = useQuery({
-    queryKey: ["book-check", book.title, book.author],
-    queryFn: () => checkBookExists(
-      undefined,
-      book.title,
-      book.author
-    ),
-  });
-
   const bookExists = bookCheck?.exists || false;
   const existingLists = bookCheck?.lists || [];
 
@@ -100,7 +90,7 @@ export default function BookCard({ book }: BookCardProps) {
         isOpen={showListModal}
         onClose={() => {
           setShowListModal(false);
-          refetch();
+          onListsChange?.();
         }}
         existingLists={existingLists}
       />
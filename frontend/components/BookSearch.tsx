@@ -2,7 +2,12 @@
 
 import { useState, useEffect, useMemo } from "react";
 import { useQuery } from "@tanstack/react-query";
-import { searchExternalBooks, searchPublicLists, getPublicLists } from "@/lib/api";
+import {
+  searchExternalBooks,
+  searchPublicLists,
+  getPublicLists,
+  checkBooksExistBatch,
+} from "@/lib/api";
 import { BookCardSkeleton } from "./ui/Skeleton";
 import BookCard from "./BookCard";
 import NYTBookRow from "./NYTBookRow";
@@ -57,6 +62,18 @@ export default function BookSearch() {
     enabled: searchMode === "books" && debouncedQuery.length > 0,
   });
 
+  // Library membership for the whole page of results in one request.
+  // Checked by title+author so all editions of the same book are recognized
+  const resultBooks = searchResults?.results || [];
+  const { data: bookChecks, refetch: refetchBookChecks } = useQuery({
+    queryKey: ["book-check", "batch", debouncedQuery, resultBooks.length],
+    queryFn: () =>
+      checkBooksExistBatch(
+        resultBooks.map((book: any) => ({ title: book.title, author: book.author }))
+      ),
+    enabled: searchMode === "books" && resultBooks.length > 0,
+  });
+
   const {
     data: listSearchResults,
     isLoading: listSearchLoading,
@@ -426,6 +443,8 @@ export default function BookSearch() {
               <BookCard
                 key={index}
                 book={book}
+                bookCheck={bookChecks?.[index]}
+                onListsChange={refetchBookChecks}
               />
             ))}
           </div>
@@ -485,17 +504,17 @@ export default function BookSearch() {
               {curatedListMatches.length > 0 && (
                 <h3 className="text-lg font-semibold text-pine-800 mt-4">Public User Lists</h3>
               )}
-              {listSearchResults.results.map((result: PublicListSearchResult, index: number) => (
+              {listSearchResults.results.map((result: PublicListSearchResult) => (
                 <div
-                  key={`${result.list_id}-${result.matching_book.id}-${index}`}
+                  key={result.list_id}
                   className="bg-white rounded-xl border border-primary-100 p-4 hover:shadow-card-hover transition-all cursor-pointer"
                   onClick={() => router.push(`/search/community/${result.list_id}`)}
                 >
                   <div className="flex gap-4">
-                    {result.matching_book.cover_url && (
+                    {result.matching_books[0]?.cover_url && (
                       <img
-                        src={result.matching_book.cover_url}
-                        alt={result.matching_book.title}
+                        src={result.matching_books[0].cover_url}
+                        alt={result.matching_books[0].title}
                         className="w-16 h-20 object-cover rounded-md flex-shrink-0"
                       />
                     )}
@@ -514,9 +533,16 @@ export default function BookSearch() {
                         </span>
                       </div>
                       <div className="mt-2 text-sm text-pine-500">
-                        Matching: <span className="font-medium text-pine-700">{result.matching_book.title}</span>
-                        {result.matching_book.author && (
-                          <span> by {result.matching_book.author}</span>
+                        Matching:{" "}
+                        {result.matching_books.map((book, index) => (
+                          <span key={book.id}>
+                            {index > 0 && ", "}
+                            <span className="font-medium text-pine-700">{book.title}</span>
+                            {book.author && <span> by {book.author}</span>}
+                          </span>
+                        ))}
+                        {result.match_count > result.matching_books.length && (
+                          <span> and {result.match_count - result.matching_books.length} more</span>
                         )}
                       </div>
                     </div>
@@ -1,7 +1,7 @@
 "use client";
 
 import { useQuery, useQueryClient } from "@tanstack/react-query";
-import { getList, removeBookFromList, getLists } from "@/lib/api";
+import { getList, removeBookFromList, getLists, getCoverUrl } from "@/lib/api";
 import Link from "next/link";
 import toast from "react-hot-toast";
 import StatusBadge from "../ui/StatusBadge";
@@ -18,6 +18,7 @@ import SearchInListModal from "./SearchInListModal";
 import GenreBadges from "../ui/GenreBadges";
 import EditGenresModal from "../books/EditGenresModal";
 import ReadingProgressTracker from "../ui/ReadingProgressTracker";
+import { coverPlaceholderStyle } from "@/lib/bookUtils";
 
 interface ListDetailProps {
   listId: number;
@@ -249,9 +250,10 @@ export default function ListDetail({ listId }: ListDetailProps) {
                     style={{ height: "200px" }}
                   >
                     <img
-                      src={item.book.cover_url}
+                      src={getCoverUrl(item.book.id, "medium", item.book.cover_url)}
                       alt={item.book.title}
                       className="max-h-full max-w-full object-contain rounded-book book-cover-shadow"
+                      style={coverPlaceholderStyle(item.book)}
                     />
                     {item.rank && (
                       <div className="absolute bottom-2 left-2 bg-black/60 text-white text-xs px-1.5 py-0.5 rounded">
@@ -20,6 +20,25 @@ const apiClient = axios.create({
   },
 });
 
+// Read-your-writes: after a write the API may pin us to the primary database
+// for a few seconds (X-Read-Primary-Until); echo that back on reads until then
+let readPrimaryUntil = 0;
+
+apiClient.interceptors.response.use((response) => {
+  const until = Number(response.headers['x-read-primary-until']);
+  if (until) {
+    readPrimaryUntil = until * 1000;
+  }
+  return response;
+});
+
+apiClient.interceptors.request.use((config) => {
+  if (Date.now() < readPrimaryUntil) {
+    config.headers['X-Read-Primary'] = '1';
+  }
+  return config;
+});
+
 // Search
 export const searchExternalBooks = async (query: string, maxResults: number = 20) => {
   const response = await apiClient.get('/search/external', {
@@ -137,8 +156,15 @@ export const getRandomBook = async (
   return response.data;
 };
 
-export const getNYTBestsellers = async (listName: string = "combined-print-and-e-book-fiction") => {
-  const response = await apiClient.get(`/nyt/bestsellers?list_name=${listName}`);
+// Rows show the overview's top books (one upstream fetch for every list);
+// full fetches the whole list for its own page
+export const getNYTBestsellers = async (
+  listName: string = "combined-print-and-e-book-fiction",
+  full: boolean = false
+) => {
+  const response = await apiClient.get('/nyt/bestsellers', {
+    params: { list_name: listName, ...(full ? { full: true } : {}) },
+  });
   return response.data;
 };
 
@@ -152,6 +178,13 @@ export const checkBookExists = async (isbn?: string, title?: string, author?: st
   return response.data;
 };
 
+export const checkBooksExistBatch = async (
+  books: { isbn?: string; title?: string; author?: string }[]
+) => {
+  const response = await apiClient.post('/books/check/batch', { books });
+  return response.data.results;
+};
+
 export const removeBookFromList = async (listId: number, itemId: number) => {
   const response = await apiClient.delete(`/lists/${listId}/books/${itemId}`);
   return response.data;
@@ -160,4 +193,33 @@ export const removeBookFromList = async (listId: number, itemId: number) => {
 export const resetBookProgress = async (bookId: number) => {
   const response = await apiClient.post(`/books/${bookId}/reset-progress`);
   return response.data;
-};
\ No newline at end of file
+};
+
+// Short, stable hash of a cover_url (32-bit FNV-1a, base 36)
+const coverVersion = (coverUrl: string) => {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < coverUrl.length; i++) {
+    hash = Math.imul(hash ^ coverUrl.charCodeAt(i), 0x01000193);
+  }
+  return (hash >>> 0).toString(36);
+};
+
+// Cover proxy: resized, cached covers for books in the library. Covers are
+// cached for a week, so pass the book's cover_url: the URL changes with it
+export const getCoverUrl = (
+  bookId: number,
+  size: 'small' | 'medium' | 'large' | 'original' = 'medium',
+  coverUrl?: string | null
+) =>
+  `${API_BASE_URL}/covers/${bookId}?size=${size}&v=${coverVersion(coverUrl || "")}`;
+
+// Library import / export
+export const importGoodreadsCsv = async (file: File) => {
+  const response = await apiClient.post('/library/import', file, {
+    headers: { 'Content-Type': 'text/csv' },
+  });
+  return response.data;
+};
+
+export const getLibraryExportUrl = (format: 'ndjson' | 'csv' = 'csv') =>
+  `${API_BASE_URL}/library/export?format=${format}`;
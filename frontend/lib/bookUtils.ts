@@ -1,3 +1,5 @@
+import type { CSSProperties } from "react";
+
 export function getBookPageUrl(book: any, searchQuery?: string): string {
   const params = new URLSearchParams();
 
@@ -18,4 +20,19 @@ export function getBookPageUrl(book: any, searchQuery?: string): string {
   const identifier = book.isbn || encodeURIComponent(book.title.toLowerCase().replace(/\s+/g, "-"));
 
   return `/books/preview/${identifier}?${params.toString()}`;
-}
\ No newline at end of file
+}
+
+// Inline placeholder shown behind a cover until it loads: the cover's
+// dominant color under a tiny blurred preview (both precomputed server-side)
+export function coverPlaceholderStyle(book: {
+  cover_color?: string | null;
+  cover_placeholder?: string | null;
+}): CSSProperties {
+  if (!book.cover_color && !book.cover_placeholder) return {};
+  return {
+    backgroundColor: book.cover_color || undefined,
+    backgroundImage: book.cover_placeholder ? `url(${book.cover_placeholder})` : undefined,
+    backgroundSize: "cover",
+    aspectRatio: "2 / 3",
+  };
+}
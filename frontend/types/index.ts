@@ -11,6 +11,8 @@ export interface Book {
   genres?: string[];
   format?: string | null;
   edition?: string | null;
+  cover_color?: string | null;
+  cover_placeholder?: string | null;
 }
 
 export interface BookCreate {
@@ -84,7 +86,8 @@ export interface PublicListSearchResult {
   list_name: string;
   list_description?: string | null;
   item_count: number;
-  matching_book: Book;
+  match_count: number;
+  matching_books: Book[];
 }
 
 export interface BookListItemCreate {